@@ -89,6 +89,8 @@ AUTH_USER_MODEL = "users.User"
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # brotli/gzip above COMPRESS_MIN_SIZE; outermost body-writer (utils/compression.py)
+    "utils.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -98,6 +100,9 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESS_MIN_SIZE = env.int("COMPRESS_MIN_SIZE", default=1024)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # URL / WSGI
 # ────────────────────────────────────────────────────────────────────────────────
@@ -135,6 +140,37 @@ DATABASES["default"].setdefault(
     },
 )
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Cache
+# ────────────────────────────────────────────────────────────────────────────────
+# Per-process LRU in front of a cache every process shares (utils/cache.py).
+# The shared tier is a file cache unless CACHE_URL says otherwise, e.g.
+# dbcache://rankify_cache (after `manage.py createcachetable`) or redis://...
+CACHES = {
+    "default": {
+        "BACKEND": "utils.cache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES", default=2000),
+            "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT", default=5),  # seconds
+        },
+    },
+    "shared": env.cache_url(
+        "CACHE_URL", default=f"filecache://{(BASE_DIR / 'var' / 'cache').as_posix()}?MAX_ENTRIES=20000"
+    ),
+}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Edge / CDN cache (utils/edge.py)
+# ────────────────────────────────────────────────────────────────────────────────
+EDGE_MAX_AGE = env.int("EDGE_MAX_AGE", default=60)        # browsers, seconds
+EDGE_S_MAXAGE = env.int("EDGE_S_MAXAGE", default=3600)    # edge, seconds; writes purge sooner
+# utils.edge.HTTPPurgeBackend in production; the log file works offline
+EDGE_PURGE_BACKEND = env("EDGE_PURGE_BACKEND", default="utils.edge.LogFilePurgeBackend")
+EDGE_PURGE_LOG = env("EDGE_PURGE_LOG", default=(BASE_DIR / "var" / "edge-purge.log").as_posix())
+EDGE_PURGE_URL = env("EDGE_PURGE_URL", default="")        # e.g. https://api.fastly.com/service/<id>/purge
+EDGE_PURGE_TOKEN = env("EDGE_PURGE_TOKEN", default="")
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Logging
 # ────────────────────────────────────────────────────────────────────────────────
@@ -195,6 +231,11 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 50,
+    # orjson when installed, stock JSONRenderer output (utils/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "utils.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.OrderingFilter",
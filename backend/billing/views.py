@@ -3,6 +3,7 @@ import stripe
 from datetime import datetime, timezone as dt_timezone
 
 from django.conf import settings
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse, HttpResponse
 from django.contrib.auth import get_user_model
@@ -13,6 +14,11 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from businesses.models import Business
+from businesses.facets import refresh_facets
+from businesses.featured import bump_featured
+from businesses.ranking import refresh_rank_scores
+from utils.cache import bump_versions
+from utils.edge import featured_key, listing_key, purge_keys
 
 User = get_user_model()
 
@@ -78,7 +84,20 @@ def _apply_subscription_to_user(user: User, sub):
         "stripe_subscription_id", "stripe_price_id", "stripe_customer_id"
     ])
 
-    Business.objects.filter(claimed_by_id=user.id).update(is_premium=user.premium_membership)
+    Business.objects.filter(claimed_by_id=user.id).update(
+        is_premium=user.premium_membership, updated_at=timezone.now()
+    )
+    _refresh_owned_listings(user)
+
+
+def _refresh_owned_listings(user):
+    """Premium flag changed under the user's claimed businesses: rank, facets + featured cache."""
+    owned = Business.objects.filter(claimed_by_id=user.id)
+    refresh_rank_scores(owned)
+    bump_versions(Business)
+    refresh_facets("lawyer", set(owned.values_list("category_id", flat=True)))
+    bump_featured("lawyer", set(owned.filter(status="active").values_list("category_id", flat=True)))
+    purge_keys(featured_key("lawyer"), *(listing_key("lawyer", pk) for pk in owned.values_list("pk", flat=True)))
 
 
 def _handle_checkout_completed(session):
@@ -137,7 +156,8 @@ def _handle_subscription_deleted(sub):
         "premium_membership", "premium_expires",
         "stripe_subscription_id", "stripe_price_id"
     ])
-    Business.objects.filter(claimed_by_id=user.id).update(is_premium=False)
+    Business.objects.filter(claimed_by_id=user.id).update(is_premium=False, updated_at=timezone.now())
+    _refresh_owned_listings(user)
 
 
 @api_view(["POST"])
@@ -1,4 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_search_triggers(sender, using, **kwargs):
+    from .models import Business, Doctor
+    from .search import ensure_sqlite_triggers
+
+    ensure_sqlite_triggers(using, models=(Business, Doctor))
+
 
 class BusinessesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
@@ -6,4 +15,8 @@ class BusinessesConfig(AppConfig):
 
     def ready(self):
         # registers signal handlers
-        from . import signals  # noqa
\ No newline at end of file
+        from . import signals  # noqa
+        # response-cache version tokens (utils/cache.py)
+        from utils.cache import track_versions
+        track_versions()
+        post_migrate.connect(_ensure_search_triggers, sender=self)
@@ -0,0 +1,119 @@
+# businesses/copyload.py
+"""
+COPY-based bulk insert for listings on PostgreSQL.
+
+copy_insert(model, objs) streams the rows into a temp staging table with
+COPY (text format) and moves them over with
+
+    INSERT INTO <table> (...) SELECT ... FROM <staging>
+    ON CONFLICT DO NOTHING RETURNING id, <unique field>
+
+so conflicting rows are skipped like bulk_create(ignore_conflicts=True),
+but without building huge parameterized INSERTs, and the new ids come back
+in the same round trip. On other databases (SQLite) it falls back to
+bulk_create and looks the inserted rows up by their unique field
+(skipping ones that were already there).
+
+The staging table lives for one transaction (ON COMMIT DROP); copy_insert
+opens one, or a savepoint inside the caller's.
+"""
+import io
+import json
+import uuid
+from itertools import islice
+
+from django.db import connection, models, transaction
+
+COPY_BATCH_SIZE = 10000
+ORM_BATCH_SIZE = 5000
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_fields(model):
+    return [f for f in model._meta.concrete_fields if not f.primary_key]
+
+
+def _copy_value(field, obj) -> str:
+    """One column of a COPY text-format row."""
+    value = field.pre_save(obj, add=True)
+    if value is None:
+        return r"\N"
+    if isinstance(field, models.JSONField):
+        value = json.dumps(value, cls=field.encoder)
+    else:
+        value = field.get_db_prep_save(value, connection)
+        if value is None:
+            return r"\N"
+        if isinstance(value, bool):
+            value = "t" if value else "f"
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _copy_rows(cursor, sql: str, data: str) -> None:
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    raw = cursor.cursor
+    if is_psycopg3:
+        with raw.copy(sql) as copy:
+            copy.write(data)
+    else:
+        raw.copy_expert(sql, io.StringIO(data))
+
+
+def _batches(objs, size: int):
+    it = iter(objs)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def copy_insert(model, objs, *, unique_field: str = "slug", batch_size: int = COPY_BATCH_SIZE):
+    """
+    Insert `objs` (unsaved instances, any iterable), skipping rows that hit a
+    unique constraint. Returns [(id, unique_field value), ...] for the rows
+    actually inserted.
+    """
+    if connection.vendor != "postgresql":
+        return orm_insert(model, objs, unique_field=unique_field)
+
+    qn = connection.ops.quote_name
+    fields = _copy_fields(model)
+    cols = ", ".join(qn(f.column) for f in fields)
+    table = qn(model._meta.db_table)
+    stage = qn(f"stage_{model._meta.db_table}_{uuid.uuid4().hex[:8]}")
+    key = qn(model._meta.get_field(unique_field).column)
+
+    inserted = []
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(
+            f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+            f"SELECT {cols} FROM {table} WITH NO DATA"
+        )
+        for batch in _batches(objs, batch_size):
+            data = "".join(
+                "\t".join(_copy_value(f, obj) for f in fields) + "\n" for obj in batch
+            )
+            _copy_rows(cur, f"COPY {stage} ({cols}) FROM STDIN", data)
+            cur.execute(
+                f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} "
+                f"ON CONFLICT DO NOTHING RETURNING id, {key}"
+            )
+            inserted.extend(cur.fetchall())
+            cur.execute(f"TRUNCATE {stage}")
+        cur.execute(f"DROP TABLE {stage}")
+    return inserted
+
+
+def orm_insert(model, objs, *, unique_field: str = "slug", batch_size: int = ORM_BATCH_SIZE):
+    """The bulk_create path (non-PostgreSQL fallback, and the benchmark baseline)."""
+    inserted = []
+    for batch in _batches(objs, batch_size):
+        keys = [getattr(o, unique_field) for o in batch]
+        lookup = {f"{unique_field}__in": keys}
+        existing = set(model.objects.filter(**lookup).values_list(unique_field, flat=True))
+        model.objects.bulk_create(batch, ignore_conflicts=True)
+        inserted.extend(
+            (pk, key) for pk, key in model.objects.filter(**lookup).values_list("id", unique_field)
+            if key not in existing
+        )
+    return inserted
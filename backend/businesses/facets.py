@@ -0,0 +1,186 @@
+# businesses/facets.py
+"""
+Facet counts for the Search and Category pages (GET /api/facets/).
+
+FacetRollup / TopicRollup hold listing counts per category and status,
+split by state, city, premium flag and rating bucket (FacetRollup) and by
+practice area / specialty (TopicRollup). They are rebuilt per category by
+refresh_facets() wherever listings change: the listing signals, review and
+premium updates, imports, bulk_create and bulk category moves. A full
+rebuild is `manage.py rebuild_facets`; migration 0021 runs one so the
+rollups start out populated.
+
+Requests filtered only by type, category and status are answered from
+the rollups (a few indexed rows per category). Any other filter, a ?q=
+search in particular, falls back to one grouped query per vertical over
+the filtered listings (facet_counts).
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, IntegerField
+from django.db.models.functions import Cast, Floor
+
+from .models import Business, Doctor, FacetRollup, TopicRollup
+
+FACET_MODELS = {"lawyer": Business, "doctor": Doctor}
+
+# Column whose values form the topic facet of each vertical
+TOPIC_FIELDS = {"lawyer": "practice_areas", "doctor": "specialty"}
+TOPIC_FACETS = {"lawyer": "practice_area", "doctor": "specialty"}
+
+DEFAULT_FACET_LIMIT = 20
+MAX_FACET_LIMIT = 200
+
+
+def _topics(kind: str, value) -> set[str]:
+    """Practice areas are a comma list; a specialty is one value."""
+    if not value:
+        return set()
+    parts = value.split(",") if kind == "lawyer" else [value]
+    return {p.strip() for p in parts if p.strip()}
+
+
+def rating_bucket(value) -> int:
+    """Whole stars, 0..5: the rating dimension of FacetRollup."""
+    return min(max(int(value or 0), 0), 5)
+
+
+def _grouped(kind: str, qs, *extra):
+    """
+    One GROUP BY over `qs` on every facet dimension; yields
+    (state, city, is_premium, rating_bucket, topic value, *extra, count).
+    """
+    topic = TOPIC_FIELDS[kind]
+    rows = (
+        qs.order_by()
+        .annotate(rating_bucket=Cast(Floor("average_rating"), IntegerField()))
+        .values("state", "city", "is_premium", "rating_bucket", topic, *extra)
+        .annotate(c=Count("id"))
+    )
+    for row in rows:
+        yield (
+            (row["state"] or "").strip().upper(), (row["city"] or "").strip(),
+            bool(row["is_premium"]), rating_bucket(row["rating_bucket"]),
+            row[topic], *(row[f] for f in extra), row["c"],
+        )
+
+
+def _rollup_models(kind: str, apps):
+    """(listing, FacetRollup, TopicRollup) from `apps` (a migration's historical models)."""
+    if apps is None:
+        return FACET_MODELS[kind], FacetRollup, TopicRollup
+    return (
+        apps.get_model("businesses", FACET_MODELS[kind].__name__),
+        apps.get_model("businesses", "FacetRollup"),
+        apps.get_model("businesses", "TopicRollup"),
+    )
+
+
+def refresh_facets(kind: str, category_ids, *, apps=None) -> None:
+    """Rebuild the rollup rows of `kind` for these categories (None = uncategorized)."""
+    ids = set(category_ids)
+    if not ids:
+        return
+    model, facet_model, topic_model = _rollup_models(kind, apps)
+    for cid in ids:
+        scope = {"category_id": cid} if cid else {"category__isnull": True}
+        facets, topics = Counter(), Counter()
+        for state, city, premium, bucket, topic, status, c in _grouped(
+            kind, model.objects.filter(**scope), "status"
+        ):
+            facets[(state, city, status, premium, bucket)] += c
+            for t in _topics(kind, topic):
+                topics[(status, t[:255])] += c
+
+        with transaction.atomic():
+            facet_model.objects.filter(kind=kind, **scope).delete()
+            topic_model.objects.filter(kind=kind, **scope).delete()
+            facet_model.objects.bulk_create([
+                facet_model(kind=kind, category_id=cid, state=state, city=city, status=status,
+                            is_premium=premium, rating_bucket=bucket, count=c)
+                for (state, city, status, premium, bucket), c in facets.items()
+            ], batch_size=1000)
+            topic_model.objects.bulk_create([
+                topic_model(kind=kind, category_id=cid, status=status, topic=t, count=c)
+                for (status, t), c in topics.items()
+            ], batch_size=1000)
+
+
+def rebuild_facets(kind: str, *, apps=None) -> int:
+    """Rebuild every category of `kind`; returns the number of categories."""
+    model, facet_model, _ = _rollup_models(kind, apps)
+    ids = set(model.objects.order_by().values_list("category_id", flat=True).distinct())
+    # categories that no longer hold listings of this kind
+    ids |= set(facet_model.objects.filter(kind=kind).values_list("category_id", flat=True).distinct())
+    refresh_facets(kind, ids, apps=apps)
+    return len(ids)
+
+
+# -------------------- Reads --------------------
+class _Tally:
+    def __init__(self):
+        self.total = 0
+        self.state, self.city, self.premium, self.rating = Counter(), Counter(), Counter(), Counter()
+        self.topics = {facet: Counter() for facet in TOPIC_FACETS.values()}
+
+    def add(self, state, city, premium, bucket, c):
+        self.total += c
+        if state:
+            self.state[state] += c
+        if city:
+            self.city[(city, state)] += c
+        self.premium[premium] += c
+        self.rating[bucket] += c
+
+    def as_dict(self, source: str, limit: int) -> dict:
+        def top(counter):
+            return sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+
+        return {
+            "source": source,
+            "total": self.total,
+            "facets": {
+                "state": [{"value": v, "count": c} for v, c in top(self.state)],
+                "city": [{"value": city, "state": state, "count": c}
+                         for (city, state), c in top(self.city)],
+                **{facet: [{"value": v, "count": c} for v, c in top(counter)]
+                   for facet, counter in self.topics.items()},
+                "is_premium": [{"value": v, "count": self.premium[v]} for v in (True, False)],
+                "rating": [{"value": b, "count": self.rating[b]} for b in range(5, -1, -1)],
+            },
+        }
+
+
+def rollup_counts(kinds, category_ids, status: str, limit: int) -> dict:
+    """
+    Facets from the rollup tables. category_ids None = every category;
+    status "" = every status.
+    """
+    tally = _Tally()
+    for kind in kinds:
+        scope = {"kind": kind}
+        if category_ids is not None:
+            scope["category_id__in"] = category_ids
+        if status:
+            scope["status"] = status
+        for row in FacetRollup.objects.filter(**scope).values(
+            "state", "city", "is_premium", "rating_bucket", "count"
+        ):
+            tally.add(row["state"], row["city"], row["is_premium"], row["rating_bucket"], row["count"])
+        topics = tally.topics[TOPIC_FACETS[kind]]
+        for row in TopicRollup.objects.filter(**scope).values("topic", "count"):
+            topics[row["topic"]] += row["count"]
+    return tally.as_dict("rollup", limit)
+
+
+def facet_counts(querysets: dict, limit: int) -> dict:
+    """Facets of already-filtered querysets ({kind: qs}): one grouped query each."""
+    tally = _Tally()
+    for kind, qs in querysets.items():
+        topics = tally.topics[TOPIC_FACETS[kind]]
+        for state, city, premium, bucket, topic, c in _grouped(kind, qs):
+            tally.add(state, city, premium, bucket, c)
+            for t in _topics(kind, topic):
+                topics[t] += c
+    return tally.as_dict("query", limit)
@@ -0,0 +1,95 @@
+# businesses/featured.py
+"""
+Cache for the /featured/ endpoints.
+
+Entries are keyed by vertical and category scope: no category filter,
+one category (?category_id= / ?category_full_slug=) or a category subtree
+(?category_path= naming an existing category). Other filter combinations
+are not cached.
+
+Every scope has a version token. A change to an active listing in
+category "A/B" replaces the tokens of "*", "A" and "A/B" (bump_featured),
+so exactly the lists that could contain it are recomputed on next read.
+Tokens are replaced once the transaction commits, so a read racing the
+write cannot cache pre-commit data under the new token.
+TTL bounds staleness where the cache backend is per-process.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from categories.tree import category_tree
+
+FEATURED_LIMIT = 8
+CACHE_TTL = 300  # seconds
+
+# Query params the frontend sends to featured; anything else bypasses the cache
+_CACHEABLE_PARAMS = {"limit", "category_id", "category_full_slug", "category_path"}
+
+
+def _version_key(kind: str, scope: str) -> str:
+    return f"featured:ver:{kind}:{scope}"
+
+
+def _scope(params) -> tuple[str, str] | None:
+    """
+    (mode, path) for a cacheable request: ("all", "*"), ("exact", path) for
+    one category, ("tree", path) for ?category_path= (startswith); None if
+    the request must bypass the cache.
+    """
+    if set(params) - _CACHEABLE_PARAMS:
+        return None
+    tree = category_tree()
+    scopes = set()
+    if params.get("category_id"):
+        try:
+            scopes.add(("exact", tree.paths.get(int(params["category_id"]))))
+        except (TypeError, ValueError):
+            return None
+    if params.get("category_full_slug"):
+        path = params["category_full_slug"].strip()
+        scopes.add(("exact", path if path in tree.exact else None))
+    if params.get("category_path"):
+        path = params["category_path"].strip()
+        # startswith must select exactly path's subtree ("Law" would also match "Lawyers2")
+        stray = any(
+            p.startswith(path) and p != path and not p.startswith(f"{path}/")
+            for p in tree.exact
+        )
+        scopes.add(("tree", None if stray or path not in tree.exact else path))
+    if len(scopes) > 1 or any(path is None for _, path in scopes):
+        return None
+    return scopes.pop() if scopes else ("all", "*")
+
+
+def _scopes_of(category_path: str) -> list[str]:
+    parts = category_path.split("/") if category_path else []
+    return ["*"] + ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def bump_featured(kind: str, category_ids) -> None:
+    """Invalidate every featured list of `kind` that may include a listing in these categories."""
+    paths = category_tree().paths
+    scopes = set()
+    for cid in category_ids:
+        scopes.update(_scopes_of(paths.get(cid, "")) if cid else ["*"])
+    if scopes:
+        transaction.on_commit(
+            lambda: cache.set_many({_version_key(kind, s): uuid.uuid4().hex for s in scopes}, None)
+        )
+
+
+def cached_featured(kind: str, params, compute):
+    """compute() -> serialized list, memoized per (kind, scope, version)."""
+    scope = _scope(params)
+    if scope is None:
+        return compute()
+    mode, path = scope
+    version = cache.get_or_set(_version_key(kind, path), uuid.uuid4().hex, None)
+    key = f"featured:{kind}:{mode}:{path}:{version}"
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        cache.set(key, data, CACHE_TTL)
+    return data
@@ -0,0 +1,126 @@
+# businesses/fieldsets.py
+"""
+Sparse fieldsets for the listing endpoints.
+
+    ?fields=card                 named preset (serializer FIELDSETS)
+    ?fields=id,name,city         explicit list
+    ?fields=card,description     preset plus extra fields
+    ?omit=description,honors     everything (or ?fields=) minus these
+
+The chosen fields trim the serializer output (SparseFieldsetSerializer)
+and the queryset's .only() column list (SparseFieldsetViewMixin), so a
+card grid neither loads nor renders the long profile TextFields. Without
+either parameter every field is returned, as before.
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import SerializerMethodField
+
+# Columns always loaded: ordering, keyset cursors and the default sort
+ALWAYS_LOADED = (
+    "id", "slug", "status", "is_premium", "average_rating", "total_reviews",
+    "rank_score", "created_at", "updated_at",
+)
+
+
+class SparseFieldsetSerializer:
+    """
+    Serializer mixin: fields=<iterable> keeps only those fields. Subclasses
+    declare FIELDSETS ({preset: [field, ...]}) and, for SerializerMethodFields
+    and other computed fields, FIELD_COLUMNS ({field: (model column, ...)}).
+    """
+    FIELDSETS: dict = {}
+    FIELD_COLUMNS: dict = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            keep = set(fields)
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    @classmethod
+    def resolve_fields(cls, fields_param: str | None, omit_param: str | None):
+        """Field names for ?fields= / ?omit=, or None for all. Raises ValidationError."""
+        fields_param, omit_param = (fields_param or "").strip(), (omit_param or "").strip()
+        if not fields_param and not omit_param:
+            return None
+        available = list(cls.Meta.fields)
+
+        def names(param, raw):
+            out, unknown = [], []
+            for part in (p.strip() for p in raw.split(",")):
+                if not part:
+                    continue
+                if param == "fields" and part in cls.FIELDSETS:
+                    out.extend(cls.FIELDSETS[part])
+                elif part in available:
+                    out.append(part)
+                else:
+                    unknown.append(part)
+            if unknown:
+                presets = f" Presets: {', '.join(cls.FIELDSETS)}." if param == "fields" else ""
+                raise ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}.{presets}"]})
+            return out
+
+        chosen = set(names("fields", fields_param)) if fields_param else set(available)
+        chosen -= set(names("omit", omit_param))
+        return [f for f in available if f in chosen]
+
+    @classmethod
+    def columns_for(cls, model, fields) -> tuple[list[str], bool]:
+        """
+        (model columns behind `fields`, whether the category join is needed).
+        Fields that are not model columns (annotations such as distance_km)
+        need none.
+        """
+        concrete = {f.name for f in model._meta.concrete_fields}
+        concrete |= {f.attname for f in model._meta.concrete_fields}
+        declared = cls().fields
+        columns = set(ALWAYS_LOADED)
+        for name in fields:
+            field = declared[name]
+            if name in cls.FIELD_COLUMNS:
+                sources = cls.FIELD_COLUMNS[name]
+            elif isinstance(field, SerializerMethodField):
+                sources = ()
+            else:
+                sources = (field.source.split(".")[0],)
+            columns.update(s for s in sources if s in concrete)
+        needs_category = "category" in columns
+        if needs_category:
+            columns.discard("category_id")
+        return sorted(columns), needs_category
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin for GET requests with ?fields= / ?omit=: the serializer
+    gets the chosen fields and get_queryset() loads just their columns.
+    """
+
+    def sparse_fields(self):
+        if self.request is None or self.request.method != "GET":
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            params = self.request.query_params
+            self._sparse_fields = self.get_serializer_class().resolve_fields(
+                params.get("fields"), params.get("omit"),
+            )
+        return self._sparse_fields
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        fields = self.sparse_fields()
+        if fields is None:
+            return qs
+        columns, needs_category = self.get_serializer_class().columns_for(qs.model, fields)
+        if not needs_category:
+            qs = qs.select_related(None)
+        return qs.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.sparse_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
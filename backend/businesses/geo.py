@@ -0,0 +1,175 @@
+# businesses/geo.py
+"""
+Radius ("near me") search for listings.
+
+Coordinates come from the ZIP code: latitude/longitude are the centroid of
+the listing's 5-digit ZIP in the bundled table data/zip_centroids.csv.gz,
+filled in by Model.save() (sync_geo), the import/bulk_create paths
+(apply_geo) and `manage.py backfill_geo`. No geocoding service is called.
+
+Each listing also stores geo_cell, the id of its CELL_DEG x CELL_DEG grid
+cell (row-major, so one latitude row is a contiguous id range). A query
+for ?near=lat,lng&radius_km=R
+
+  1. turns the radius into a bounding box,
+  2. selects the cell-id range of every grid row the box crosses
+     (a handful of indexed range scans on geo_cell),
+  3. keeps rows inside the box, and
+  4. computes the haversine distance in SQL for those rows only
+     (annotated as distance_km) and drops the ones beyond R.
+"""
+import csv
+import gzip
+import io
+import math
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+ZIP_CENTROIDS_PATH = Path(__file__).resolve().parent / "data" / "zip_centroids.csv.gz"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_MILE = 1.609344
+KM_PER_DEG_LAT = 111.195
+
+CELL_DEG = 0.1  # ~11 km of latitude
+_CELL_COLS = int(360 / CELL_DEG)
+
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 500.0
+
+GEO_FIELDS = ("latitude", "longitude", "geo_cell")
+
+
+@lru_cache(maxsize=1)
+def zip_centroids() -> dict[str, tuple[float, float]]:
+    """{"77002": (29.7594, -95.3594), ...}, read once per process."""
+    with gzip.open(ZIP_CENTROIDS_PATH, "rb") as fh:
+        reader = csv.DictReader(io.TextIOWrapper(fh, encoding="utf-8"))
+        return {row["zip"]: (float(row["lat"]), float(row["lng"])) for row in reader}
+
+
+def zip_centroid(zip_code) -> tuple[float, float] | None:
+    digits = "".join(ch for ch in str(zip_code or "") if ch.isdigit())
+    if len(digits) < 5:
+        return None
+    return zip_centroids().get(digits[:5])
+
+
+def grid_cell(lat: float, lng: float) -> int:
+    row = int(math.floor((lat + 90.0) / CELL_DEG))
+    col = int(math.floor((lng + 180.0) / CELL_DEG)) % _CELL_COLS
+    return row * _CELL_COLS + col
+
+
+def apply_geo(obj) -> bool:
+    """Set latitude/longitude/geo_cell of `obj` from its ZIP; True if they changed."""
+    point = zip_centroid(obj.zip)
+    lat, lng = point if point else (None, None)
+    cell = grid_cell(lat, lng) if point else None
+    if (obj.latitude, obj.longitude, obj.geo_cell) == (lat, lng, cell):
+        return False
+    obj.latitude, obj.longitude, obj.geo_cell = lat, lng, cell
+    return True
+
+
+def sync_geo(instance, save_kwargs: dict) -> None:
+    """
+    Called from Model.save(), like ranking.sync_rank_score: recompute the
+    coordinates unless this is a partial save that does not touch zip.
+    """
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is None:
+        apply_geo(instance)
+        return
+    update_fields = set(update_fields)
+    if "zip" in update_fields:
+        apply_geo(instance)
+        save_kwargs["update_fields"] = update_fields | set(GEO_FIELDS)
+
+
+# -------------------- Queries --------------------
+def parse_near(params):
+    """
+    (lat, lng, radius_km) from ?near=lat,lng (or ?near=<zip>) and
+    ?radius_km= / ?radius_mi=; None without ?near=. Raises ValueError on
+    unusable input.
+    """
+    raw = (params.get("near") or "").strip()
+    if not raw:
+        return None
+    if "," in raw:
+        lat_s, _, lng_s = raw.partition(",")
+        try:
+            lat, lng = float(lat_s), float(lng_s)
+        except ValueError:
+            raise ValueError("near must be lat,lng or a ZIP code.")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError("near is out of range.")
+    else:
+        point = zip_centroid(raw)
+        if point is None:
+            raise ValueError("Unknown ZIP code in near.")
+        lat, lng = point
+
+    try:
+        if params.get("radius_km"):
+            radius = float(params["radius_km"])
+        elif params.get("radius_mi"):
+            radius = float(params["radius_mi"]) * KM_PER_MILE
+        else:
+            radius = DEFAULT_RADIUS_KM
+    except ValueError:
+        radius = -1.0
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValueError(f"radius must be between 0 and {MAX_RADIUS_KM:g} km.")
+    return lat, lng, radius
+
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle."""
+    dlat = radius_km / KM_PER_DEG_LAT
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.9:
+        return min_lat, max_lat, -180.0, 180.0
+    dlng = radius_km / (KM_PER_DEG_LAT * math.cos(math.radians(widest)))
+    return min_lat, max_lat, max(lng - dlng, -180.0), min(lng + dlng, 180.0)
+
+
+def box_cells(min_lat, max_lat, min_lng, max_lng) -> Q:
+    """One geo_cell id range per grid row crossing the box."""
+    max_lng = min(max_lng, 180.0 - 1e-9)  # grid_cell wraps 180 to column 0
+    first, last = grid_cell(min_lat, min_lng), grid_cell(min_lat, max_lng)
+    rows = grid_cell(max_lat, min_lng) // _CELL_COLS - first // _CELL_COLS
+    cond = Q()
+    for r in range(rows + 1):
+        cond |= Q(geo_cell__range=(first + r * _CELL_COLS, last + r * _CELL_COLS))
+    return cond
+
+
+def distance_expression(lat: float, lng: float):
+    """Haversine distance in km from (lat, lng) to each row, as an ORM expression."""
+    def val(x):
+        return Value(x, output_field=FloatField())
+
+    dlat = Radians(F("latitude")) - val(math.radians(lat))
+    dlng = Radians(F("longitude")) - val(math.radians(lng))
+    a = (
+        Power(Sin(dlat / val(2.0)), 2)
+        + val(math.cos(math.radians(lat))) * Cos(Radians(F("latitude"))) * Power(Sin(dlng / val(2.0)), 2)
+    )
+    return val(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a))
+
+
+def within_radius(qs, lat: float, lng: float, radius_km: float):
+    """Rows of `qs` within radius_km of (lat, lng), annotated with distance_km."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    return (
+        qs.filter(box_cells(min_lat, max_lat, min_lng, max_lng))
+        .filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+        .annotate(distance_km=distance_expression(lat, lng))
+        .filter(distance_km__lte=radius_km)
+    )
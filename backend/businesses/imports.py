@@ -0,0 +1,493 @@
+# businesses/imports.py
+"""
+Streaming NDJSON / CSV import for Business and Doctor.
+
+The upload is read line by line and handled in chunks of `chunk_size`
+rows. Each row is validated on its own, so a bad row is reported while
+the rest of its chunk still goes in; the valid rows of a chunk are
+inserted in one transaction. Only one chunk of rows and model instances
+is held in memory at a time.
+
+The response is NDJSON, one line per chunk and a closing summary:
+
+    {"chunk": 1, "rows": 1000, "created": 998, "skipped": 0,
+     "errors": [{"row": 17, "errors": {"name": ["This field is required."]}}]}
+    {"done": true, "rows": 1000, "created": 998, "skipped": 0, "error_rows": 2}
+
+"row" is the line number in the uploaded file; "skipped" counts valid rows
+that were not written (slug conflicts, or unchanged rows in upsert mode).
+
+mode="upsert" matches rows to existing listings by a natural key
+(UPSERT_KEYS: license / npi_number, falling back to normalized
+name + street + zip) and bulk-updates only the fields that changed, so
+re-importing a refreshed dataset touches the delta instead of duplicating
+it. Rows that match nothing are inserted as usual.
+"""
+import codecs
+import csv
+import json
+import logging
+import re
+import time
+
+from django.db import DatabaseError, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Left
+from django.utils import timezone
+
+from categories.models import Category
+from .facets import refresh_facets
+from .featured import bump_featured
+from .geo import GEO_FIELDS, apply_geo
+from .locks import IMPORT_LOCK, release_lock, renew_lock
+from .models import Business, Doctor
+from .ranking import rank_inputs, rank_score
+from .slugs import insert_with_slugs, refresh_listing_paths, register_listing_slugs
+from .tags import TAG_COLUMNS, sync_inserted_tags, sync_tags
+from .utils import COUNT_FIELDS
+from utils.cache import bump_versions
+from utils.edge import CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY, purge_keys, vertical_key
+
+log = logging.getLogger("bulk_import")
+
+try:
+    from seo.utils import bulk_ensure_meta
+except Exception:  # pragma: no cover
+    bulk_ensure_meta = None
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_IMPORT_CHUNK_SIZE = 5000
+
+IMPORT_FORMATS = {"ndjson", "csv"}
+_FORMAT_BY_CONTENT_TYPE = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+}
+
+# kind -> (model, name field used for the slug, fallback slug base)
+IMPORT_TARGETS = {
+    "lawyer": (Business, "name", "business"),
+    "doctor": (Doctor, "provider_name", "provider"),
+}
+
+# PageMeta.meta_type and the columns its defaults are built from
+SEO_META_TYPES = {"lawyer": "business", "doctor": "doctor"}
+SEO_FIELDS = {
+    "lawyer": ("id", "name", "city", "state"),
+    "doctor": ("id", "provider_name", "specialty", "city", "state"),
+}
+
+IMPORT_MODES = {"insert", "upsert"}
+# kind -> natural keys accepted for ?key=, the first is the default
+UPSERT_KEYS = {
+    "lawyer": ("license", "address"),
+    "doctor": ("npi_number", "address"),
+}
+# Moderation, claim and billing state an import never overwrites
+UPSERT_PROTECTED_FIELDS = {
+    "status", "is_premium", "premium_expires",
+    "claimed_by_id", "claimed_at",
+    "pending_claim_by_id", "pending_claim_notes", "pending_claim_requested_at",
+}
+
+
+def detect_format(requested: str | None, content_type: str = "", filename: str = "") -> str | None:
+    """Explicit ?input_format=, else the upload's Content-Type, else its file extension."""
+    if requested:
+        requested = requested.strip().lower()
+        return requested if requested in IMPORT_FORMATS else None
+    fmt = _FORMAT_BY_CONTENT_TYPE.get((content_type or "").split(";")[0].strip().lower())
+    if fmt:
+        return fmt
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def iter_ndjson(lines):
+    """(line_no, data, error) per non-blank line of a binary line iterator."""
+    for line_no, raw in enumerate(lines, 1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            yield line_no, None, {"non_field_errors": [f"Invalid JSON: {e}"]}
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, {"non_field_errors": ["Expected a JSON object."]}
+            continue
+        yield line_no, data, None
+
+
+def iter_csv(lines):
+    """
+    (line_no, data, error) per CSV record; the first record is the header.
+    Empty cells are dropped so optional fields fall back to their defaults.
+    """
+    reader = csv.reader(codecs.iterdecode(lines, "utf-8-sig"))
+    header = None
+    try:
+        for values in reader:
+            if header is None:
+                header = [h.strip() for h in values]
+                continue
+            if not any(v.strip() for v in values):
+                continue
+            if len(values) > len(header):
+                yield reader.line_num, None, {"non_field_errors": ["More values than header columns."]}
+                continue
+            data = {k: v for k, v in zip(header, values) if k and v != ""}
+            yield reader.line_num, data, None
+    except (csv.Error, UnicodeDecodeError) as e:
+        yield reader.line_num, None, {"non_field_errors": [f"Unreadable CSV: {e}"]}
+
+
+def iter_records(lines, fmt: str):
+    return iter_csv(lines) if fmt == "csv" else iter_ndjson(lines)
+
+
+def _chunks(records, size: int):
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert_chunk(kind: str, valid: list[dict]):
+    """
+    Insert one chunk of validated rows (caller holds the transaction).
+    Returns (created, active rows per category, slugs).
+    """
+    model, name_field, fallback = IMPORT_TARGETS[kind]
+    now_ts = timezone.now()
+    objs = []
+    for vd in valid:
+        obj = model(**vd, created_at=now_ts, updated_at=now_ts)
+        obj.rank_score = rank_score(obj)  # bulk_create skips save()
+        apply_geo(obj)
+        objs.append(obj)
+
+    rows = insert_with_slugs(model, objs, [vd.get(name_field) for vd in valid], fallback)
+    created = len(rows)
+    slugs = [slug for _, slug in rows]
+    inserted = set(slugs)
+
+    active_cats: dict[int, int] = {}
+    for o in objs:
+        if o.slug in inserted and o.status == "active" and o.category_id:
+            active_cats[o.category_id] = active_cats.get(o.category_id, 0) + 1
+
+    register_listing_slugs(model, slugs)
+    sync_inserted_tags(kind, objs, rows)
+    count_field = dict(COUNT_FIELDS)[model]
+    for cid, inc in active_cats.items():
+        Category.objects.filter(id=cid).update(**{count_field: F(count_field) + inc})
+    return created, active_cats, slugs
+
+
+def refresh_meta(kind: str, **lookup) -> int:
+    """Bulk-refresh the auto-managed PageMeta of the `kind` listings matching `lookup`."""
+    if bulk_ensure_meta is None:
+        return 0
+    rows = IMPORT_TARGETS[kind][0].objects.filter(**lookup).only(*SEO_FIELDS[kind])
+    return bulk_ensure_meta(SEO_META_TYPES[kind], rows, refresh=True)
+
+
+def _after_chunk(kind: str, active_cats, slugs) -> None:
+    """Cache and SEO upkeep once a chunk is committed."""
+    bump_featured(kind, active_cats)
+    bump_versions(IMPORT_TARGETS[kind][0])
+    # an upsert chunk may touch any listing of the vertical
+    purge_keys(vertical_key(kind), CATEGORIES_KEY, *((NOT_FOUND_KEY, SITEMAP_KEY) if slugs else ()))
+    if kind == "lawyer" and slugs:
+        try:
+            refresh_meta(kind, slug__in=slugs)
+        except Exception:
+            log.exception("import %s: SEO refresh failed", kind)
+
+
+def _categories_of(kind: str, slugs) -> set:
+    model = IMPORT_TARGETS[kind][0]
+    return set(model.objects.filter(slug__in=slugs).values_list("category_id", flat=True).distinct())
+
+
+def _norm(value) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", str(value or "").lower()).split())
+
+
+def _zip5(value) -> str:
+    return re.sub(r"\D", "", str(value or ""))[:5]
+
+
+def natural_keys(kind: str, key: str, get) -> list[tuple]:
+    """
+    Match keys of one row or listing (`get(field)` reads it), strongest
+    first: the identifier field unless key="address", then name+street+zip.
+    """
+    name_field = IMPORT_TARGETS[kind][1]
+    keys = []
+    if key != "address":
+        ident = str(get(key) or "").strip()
+        if ident:
+            keys.append((key, ident))
+    name = _norm(get(name_field))
+    if name:
+        keys.append(("address", name, _norm(get("street_address")), _zip5(get("zip"))))
+    return keys
+
+
+def _upsert_columns(kind: str, key: str, valid: list[dict]) -> set[str]:
+    """Columns _upsert_chunk reads or writes: keys, counts, rank and tag inputs, row fields."""
+    model, name_field, _ = IMPORT_TARGETS[kind]
+    columns = {
+        "id", "slug", "status", "category", name_field, "street_address", "zip",
+        *rank_inputs(model), *TAG_COLUMNS[kind],
+    }
+    if key != "address":
+        columns.add(key)
+    for vd in valid:
+        columns.update(vd)
+    return columns
+
+
+def _existing_by_key(kind: str, key: str, valid: list[dict]) -> dict:
+    """
+    Natural key -> existing listing, for every listing a row of the chunk
+    may match. One query by identifier, then one by name + ZIP for the
+    rows still unmatched; ZIPs compare on their first five characters
+    (stored ZIP+4 included, expression index biz_zip5 / doc_zip5).
+    Listings are loaded with _upsert_columns only.
+    """
+    model, name_field, _ = IMPORT_TARGETS[kind]
+    rows = model.objects.only(*_upsert_columns(kind, key, valid)).order_by("id")
+    existing = {}
+
+    def add(objs):
+        for obj in objs:
+            for k in natural_keys(kind, key, lambda f: getattr(obj, f, None)):
+                existing.setdefault(k, obj)
+
+    pending = valid
+    if key != "address":
+        idents = {str(vd.get(key) or "").strip() for vd in valid} - {""}
+        if idents:
+            add(rows.filter(**{f"{key}__in": idents}))
+            pending = [
+                vd for vd in valid
+                if not any(k in existing for k in natural_keys(kind, key, vd.get))
+            ]
+
+    zips, names = set(), set()
+    for vd in pending:
+        if _zip5(vd.get("zip")):
+            zips.add(_zip5(vd["zip"]))
+        elif vd.get(name_field):
+            names.add(vd[name_field])
+    q = Q()
+    if zips:
+        q |= Q(zip5__in=zips)
+    if names:
+        q |= Q(**{f"{name_field}__in": names})
+    if q:
+        add(rows.annotate(zip5=Left("zip", 5)).filter(q))
+    return existing
+
+
+def _upsert_chunk(kind: str, key: str, valid: list[dict]):
+    """
+    Update matched listings in place (changed fields only, one bulk_update)
+    and insert the rest (caller holds the transaction). Returns
+    (created, updated, skipped, touched category ids, slugs).
+    """
+    model = IMPORT_TARGETS[kind][0]
+    existing = _existing_by_key(kind, key, valid)
+    now_ts = timezone.now()
+
+    new_rows, new_by_key = [], {}
+    changed, fields = {}, set()
+    cats: set[int] = set()
+    deltas: dict[int, int] = {}
+    moved: set[int] = set()
+    retag = []
+    unchanged = 0
+    for vd in valid:
+        keys = natural_keys(kind, key, vd.get)
+        obj = next((existing[k] for k in keys if k in existing), None)
+        if obj is None:
+            pending = next((new_by_key[k] for k in keys if k in new_by_key), None)
+            if pending is not None:  # repeated in this chunk: last row wins
+                pending.update(vd)
+                unchanged += 1
+                continue
+            row = dict(vd)
+            new_rows.append(row)
+            for k in keys:
+                new_by_key[k] = row
+            continue
+
+        diff = {
+            f: v for f, v in vd.items()
+            if f not in UPSERT_PROTECTED_FIELDS and getattr(obj, f, None) != v
+        }
+        if not diff:
+            if obj.pk not in changed:
+                unchanged += 1
+            continue
+        was_active = obj.status == "active" and obj.category_id
+        if was_active:
+            cats.add(obj.category_id)
+        if "category_id" in diff:
+            moved.add(diff["category_id"])
+            cats.add(obj.category_id)
+            if was_active:
+                deltas[obj.category_id] = deltas.get(obj.category_id, 0) - 1
+                if diff["category_id"]:
+                    deltas[diff["category_id"]] = deltas.get(diff["category_id"], 0) + 1
+                    cats.add(diff["category_id"])
+        for f, v in diff.items():
+            setattr(obj, f, v)
+        obj.updated_at = now_ts
+        obj.rank_score = rank_score(obj)
+        fields.update(diff)
+        if "zip" in diff and apply_geo(obj):
+            fields.update(GEO_FIELDS)
+        if set(diff) & set(TAG_COLUMNS[kind]):
+            retag.append(obj)
+        changed[obj.pk] = obj
+
+    created, new_cats, slugs = _insert_chunk(kind, new_rows) if new_rows else (0, {}, [])
+    cats.update(new_cats)
+    if changed:
+        model.objects.bulk_update(
+            list(changed.values()), sorted(fields | {"updated_at", "rank_score"}), batch_size=1000
+        )
+        slugs += [obj.slug for obj in changed.values()]
+        sync_tags(kind, ((obj.pk, obj) for obj in retag))
+        for category in Category.objects.filter(id__in=moved - {None}):
+            refresh_listing_paths(model, category)
+        count_field = dict(COUNT_FIELDS)[model]
+        for cid, inc in deltas.items():
+            if inc:
+                Category.objects.filter(id=cid).update(**{count_field: F(count_field) + inc})
+    skipped = len(new_rows) - created + unchanged
+    return created, len(changed), skipped, cats, slugs
+
+
+class ImportInterrupted(Exception):
+    """The job was cancelled or its lease was lost; stop without marking it failed."""
+
+
+def check_lease(owner: str) -> None:
+    """Renew `owner`'s import lock; ImportInterrupted if the lease was lost meanwhile."""
+    if not renew_lock(IMPORT_LOCK, owner):
+        raise ImportInterrupted("import lock lost")
+
+
+def import_rows(kind: str, records, serializer_class, context=None,
+                chunk_size: int = IMPORT_CHUNK_SIZE, progress=None,
+                mode: str = "insert", key: str | None = None):
+    """
+    Validate and insert (or upsert, see above) `records` ((line_no, data,
+    error) tuples) chunk by chunk, yielding one report dict per chunk and a
+    final summary.
+
+    progress(report, last_line), if given, runs inside each chunk's
+    transaction (a checkpoint written there commits with the rows; raising
+    rolls the chunk back and ends the import). A database error ends the
+    import after reporting the failed chunk; earlier chunks stay committed.
+    Facet rollups of the touched categories are rebuilt once, when the
+    import ends or is closed.
+    """
+    key = key or UPSERT_KEYS[kind][0]
+    totals = {"rows": 0, "created": 0, "updated": 0, "skipped": 0, "error_rows": 0}
+    started = time.perf_counter()
+    touched: set = set()
+    try:
+        for n, chunk in enumerate(_chunks(records, chunk_size), 1):
+            valid, errors = [], []
+            for line_no, data, error in chunk:
+                if error is None:
+                    serializer = serializer_class(data=data, context=context or {})
+                    if serializer.is_valid():
+                        valid.append(serializer.validated_data)
+                        continue
+                    error = serializer.errors
+                errors.append({"row": line_no, "errors": error})
+
+            report = {"chunk": n, "rows": len(chunk), "created": 0, "updated": 0, "skipped": 0,
+                      "errors": errors}
+            active_cats, slugs = {}, []
+            try:
+                with transaction.atomic():
+                    if valid and mode == "upsert":
+                        (report["created"], report["updated"], report["skipped"],
+                         active_cats, slugs) = _upsert_chunk(kind, key, valid)
+                    elif valid:
+                        report["created"], active_cats, slugs = _insert_chunk(kind, valid)
+                        report["skipped"] = len(valid) - report["created"]
+                    if progress:
+                        progress(report, chunk[-1][0])
+            except DatabaseError as e:
+                log.exception("import %s: chunk %d failed", kind, n)
+                report.update(created=0, updated=0, skipped=0, error=str(e))
+                totals["rows"] += len(chunk)
+                totals["error_rows"] += len(chunk)
+                yield report
+                yield {"done": False, **totals}
+                return
+            _after_chunk(kind, active_cats, slugs)
+            touched.update(active_cats)
+            if slugs:
+                touched.update(_categories_of(kind, slugs))
+
+            totals["rows"] += len(chunk)
+            totals["created"] += report["created"]
+            totals["updated"] += report["updated"]
+            totals["skipped"] += report["skipped"]
+            totals["error_rows"] += len(errors)
+            yield report
+    finally:
+        if touched:
+            refresh_facets(kind, touched)
+
+    log.info("import %s (%s): rows=%d created=%d updated=%d errors=%d in %.3fs", kind, mode,
+             totals["rows"], totals["created"], totals["updated"], totals["error_rows"],
+             time.perf_counter() - started)
+    yield {"done": True, **totals}
+
+
+class ImportStream:
+    """
+    NDJSON body for StreamingHttpResponse. close(), which Django calls when
+    the response finishes (even if it was never iterated), releases the
+    import lock held by `lock_owner`.
+    """
+
+    def __init__(self, reports, lock_owner: str):
+        self._reports = reports
+        self._owner = lock_owner
+
+    def __iter__(self):
+        try:
+            for report in self._reports:
+                yield json.dumps(report, default=str) + "\n"
+        except ImportInterrupted as e:
+            # the chunk in flight was rolled back; earlier chunks stay committed
+            log.warning("import stopped: %s", e)
+            yield json.dumps({"done": False, "error": str(e)}) + "\n"
+
+    def close(self):
+        self._reports.close()
+        release_lock(IMPORT_LOCK, self._owner)
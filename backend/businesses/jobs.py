@@ -0,0 +1,200 @@
+# businesses/jobs.py
+"""
+Background imports (ImportJob) and the worker loop behind
+`manage.py run_import_worker`.
+
+Jobs run one at a time under the IMPORT_LOCK lease (businesses/locks.py),
+the same lock the synchronous bulk endpoints take, so a busy lock queues
+the upload instead of answering 409. Each chunk's checkpoint, counts and
+row errors commit in the chunk's transaction; a job left "running" by a
+dead worker is picked up again and resumes after its checkpoint.
+
+Bulk category moves too large for a request (operation "set_category")
+run through the same queue and lock; see businesses/moves.py.
+"""
+import io
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+
+from django.core.files import File
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from categories.models import Category
+from .imports import IMPORT_CHUNK_SIZE, ImportInterrupted, check_lease, import_rows, iter_records
+from .locks import IMPORT_LOCK, acquire_lock, release_lock
+from .models import ImportJob
+from .moves import MOVE_CHUNK_SIZE, finish_move, move_listings
+from .serializers import BusinessSerializer, DoctorSerializer
+from .utils import recalc_category_counts
+
+log = logging.getLogger("bulk_import")
+
+MAX_STORED_ERRORS = 1000
+POLL_INTERVAL = 2.0  # seconds
+_COPY_BLOCK = 64 * 1024
+
+SERIALIZERS = {"lawyer": BusinessSerializer, "doctor": DoctorSerializer}
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_import(kind: str, fmt: str, source, *, filename: str = "", user=None,
+                   chunk_size: int = IMPORT_CHUNK_SIZE, options=None,
+                   operation: str = "import") -> ImportJob:
+    """
+    Copy `source` (anything with .read(), e.g. request.stream or an
+    UploadedFile) to storage and queue an ImportJob for it.
+    """
+    with tempfile.TemporaryFile() as tmp:
+        lines, last = 0, b"\n"
+        while block := source.read(_COPY_BLOCK):
+            tmp.write(block)
+            lines += block.count(b"\n")
+            last = block[-1:]
+        if last != b"\n":
+            lines += 1
+        tmp.seek(0)
+
+        job = ImportJob(
+            kind=kind,
+            operation=operation,
+            input_format=fmt,
+            chunk_size=chunk_size,
+            options=options or {},
+            total_rows=max(lines - (1 if fmt == "csv" else 0), 0),
+            created_by=user if user is not None and user.is_authenticated else None,
+        )
+        name = os.path.basename(filename or "") or f"{kind}-{operation}.{fmt}"
+        job.file.save(name, File(tmp), save=False)
+        job.save()
+    return job
+
+
+def enqueue_items(kind: str, items: list, *, user=None, options=None) -> ImportJob:
+    """Queue already-parsed bulk_create items (stored as NDJSON)."""
+    body = "".join(json.dumps(item, default=str) + "\n" for item in items).encode()
+    return enqueue_import(
+        kind, "ndjson", io.BytesIO(body), user=user,
+        chunk_size=IMPORT_CHUNK_SIZE, options=options,
+    )
+
+
+def enqueue_move(kind: str, ids, *, user=None, options=None) -> ImportJob:
+    """Queue a bulk category move of `ids`; options carry the destination."""
+    body = "".join(json.dumps({"id": pk}) + "\n" for pk in ids).encode()
+    return enqueue_import(
+        kind, "ndjson", io.BytesIO(body), user=user,
+        chunk_size=MOVE_CHUNK_SIZE, options=options, operation="set_category",
+    )
+
+
+def _run_move(job: ImportJob, records, progress) -> None:
+    to_cat = Category.objects.only("id", "full_slug").get(pk=job.options["to_category_id"])
+    move_listings(
+        job.kind, (data["id"] for _, data, _ in records if data), to_cat,
+        refresh_seo=bool(job.options.get("refresh_seo")), chunk_size=job.chunk_size,
+        progress=lambda report, done: progress(report, job.checkpoint + done),
+    )
+
+
+def run_job(job: ImportJob, owner: str) -> None:
+    """Run (or resume) `job`; the caller holds IMPORT_LOCK as `owner`."""
+    now = timezone.now()
+    claimed = ImportJob.objects.filter(pk=job.pk, status__in=ACTIVE_STATUSES).update(
+        status="running", worker=owner, heartbeat_at=now,
+        started_at=Coalesce(F("started_at"), Value(now)),
+    )
+    if not claimed:
+        return
+    job.refresh_from_db()
+    stored_errors = list(job.errors or [])
+
+    def progress(report, last_line):
+        check_lease(owner)
+        room = MAX_STORED_ERRORS - len(stored_errors)
+        if room > 0:
+            stored_errors.extend(report["errors"][:room])
+        updated = ImportJob.objects.filter(pk=job.pk, status="running", worker=owner).update(
+            rows=F("rows") + report["rows"],
+            created=F("created") + report["created"],
+            updated=F("updated") + report["updated"],
+            skipped=F("skipped") + report["skipped"],
+            error_rows=F("error_rows") + len(report["errors"]),
+            errors=stored_errors,
+            checkpoint=last_line,
+            heartbeat_at=timezone.now(),
+        )
+        if not updated:
+            raise ImportInterrupted("job cancelled")
+
+    failure = ""
+    try:
+        with job.file.open("rb") as fh:
+            records = (
+                rec for rec in iter_records(fh, job.input_format)
+                if rec[0] > job.checkpoint
+            )
+            if job.operation == "set_category":
+                _run_move(job, records, progress)
+            else:
+                for report in import_rows(
+                    job.kind, records, SERIALIZERS[job.kind],
+                    chunk_size=job.chunk_size, progress=progress,
+                    mode=job.options.get("mode", "insert"), key=job.options.get("key"),
+                ):
+                    if report.get("error"):
+                        failure = report["error"]
+    except ImportInterrupted as e:
+        log.info("import job %s stopped: %s", job.pk, e)
+        return
+    except Exception as e:
+        log.exception("import job %s failed", job.pk)
+        failure = str(e) or e.__class__.__name__
+
+    if not failure and job.operation == "set_category":
+        finish_move(job.kind, job.options.get("categories") or [])
+    elif not failure and job.options.get("recalc_categories"):
+        recalc_category_counts(job.options["recalc_categories"])
+
+    ImportJob.objects.filter(pk=job.pk, status="running", worker=owner).update(
+        status="failed" if failure else "done",
+        message=failure,
+        finished_at=timezone.now(),
+    )
+
+
+def next_job() -> ImportJob | None:
+    """Oldest unfinished job; "running" ones here were left by a dead worker."""
+    return ImportJob.objects.filter(status__in=ACTIVE_STATUSES).order_by("created_at", "id").first()
+
+
+def run_worker(*, once: bool = False, poll: float = POLL_INTERVAL) -> int:
+    """
+    Poll for jobs and run them one at a time. With once=True, stop when
+    nothing can be run right now. Returns the number of jobs run.
+    """
+    owner = worker_id()
+    ran = 0
+    while True:
+        job = None
+        if next_job() is not None and acquire_lock(IMPORT_LOCK, owner):
+            try:
+                job = next_job()
+                if job is not None:
+                    run_job(job, owner)
+                    ran += 1
+            finally:
+                release_lock(IMPORT_LOCK, owner)
+        if job is None:
+            if once:
+                return ran
+            time.sleep(poll)
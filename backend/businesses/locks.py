@@ -0,0 +1,48 @@
+# businesses/locks.py
+"""
+Named lease locks stored in the JobLock table.
+
+Acquire and renew are single conditional UPDATEs, which both PostgreSQL
+and SQLite apply atomically, so this works where pg advisory locks do not.
+A lease expires after `ttl` seconds unless renewed; a crashed holder
+therefore blocks others for at most one lease.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import JobLock
+
+IMPORT_LOCK = "bulk_import"
+LOCK_TTL = 120  # seconds
+
+
+def acquire_lock(name: str, owner: str, ttl: int = LOCK_TTL) -> bool:
+    """Take (or re-take) the lease on `name` for `owner`; False if someone else holds it."""
+    if not JobLock.objects.filter(name=name).exists():
+        try:
+            with transaction.atomic():
+                JobLock.objects.create(name=name)
+        except IntegrityError:
+            pass
+    now = timezone.now()
+    return bool(
+        JobLock.objects
+        .filter(name=name)
+        .filter(Q(owner="") | Q(owner=owner) | Q(expires_at__lt=now))
+        .update(owner=owner, expires_at=now + timedelta(seconds=ttl))
+    )
+
+
+def renew_lock(name: str, owner: str, ttl: int = LOCK_TTL) -> bool:
+    """Extend `owner`'s lease; False if it was lost (expired and taken over)."""
+    return bool(
+        JobLock.objects.filter(name=name, owner=owner)
+        .update(expires_at=timezone.now() + timedelta(seconds=ttl))
+    )
+
+
+def release_lock(name: str, owner: str) -> None:
+    JobLock.objects.filter(name=name, owner=owner).update(owner="", expires_at=None)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from businesses.geo import grid_cell, zip_centroid
+from businesses.models import Business, Doctor
+from utils.cache import bump_versions
+from utils.edge import purge_keys, vertical_key
+
+MODELS = {"lawyer": Business, "doctor": Doctor}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill latitude/longitude/geo_cell from the bundled ZIP centroid table. "
+        "One UPDATE per distinct ZIP value, so it scales with ZIPs, not listings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(MODELS), help="Only this listing type.")
+        parser.add_argument("--all", action="store_true",
+                            help="Recompute every listing, not just those without coordinates.")
+
+    def handle(self, *args, **options):
+        kinds = [options["kind"]] if options["kind"] else sorted(MODELS)
+        for kind in kinds:
+            model = MODELS[kind]
+            qs = model.objects.exclude(zip__isnull=True).exclude(zip="")
+            if not options["all"]:
+                qs = qs.filter(latitude__isnull=True)
+            zips = list(qs.order_by().values_list("zip", flat=True).distinct())
+
+            located = unknown = 0
+            for i in range(0, len(zips), 500):
+                with transaction.atomic():
+                    for value in zips[i:i + 500]:
+                        point = zip_centroid(value)
+                        if point is None:
+                            unknown += 1
+                            continue
+                        lat, lng = point
+                        located += qs.filter(zip=value).update(
+                            latitude=lat, longitude=lng, geo_cell=grid_cell(lat, lng),
+                            updated_at=timezone.now(),
+                        )
+            bump_versions(model)
+            purge_keys(vertical_key(kind))
+            self.stdout.write(
+                f"{kind}: located {located} listing(s) across {len(zips) - unknown} ZIP(s); "
+                f"{unknown} ZIP value(s) not in the table"
+            )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from businesses.tags import TAG_LINKS, backfill_tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse practice areas / languages / associations of existing listings into "
+        "Tag rows and rewrite their tag links, --batch-size listings per transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(TAG_LINKS), help="Only this listing type.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        kinds = [options["kind"]] if options["kind"] else sorted(TAG_LINKS)
+        size = max(1, options["batch_size"])
+        for kind in kinds:
+            listings, links = backfill_tags(kind, size)
+            self.stdout.write(f"{kind}: {links} tag link(s) across {listings} listing(s)")
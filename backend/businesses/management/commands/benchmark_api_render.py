@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import resolve
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from utils.compression import BROTLI_QUALITY, brotli
+from utils.renderers import FastJSONRenderer, orjson
+
+# (label, path, query) — read-only endpoints, run against the current database
+TARGETS = [
+    ("BusinessViewSet.list", "/api/businesses/", {"limit": 50}),
+    ("BusinessViewSet.list card", "/api/businesses/", {"limit": 50, "fields": "card"}),
+    ("unified_search", "/api/unified_search/", {"limit": 50}),
+    ("unified_search full", "/api/unified_search/", {"limit": 50, "full": 1}),
+    ("sitemap.xml", "/sitemap.xml", {}),
+    ("sitemap businesses-1", "/sitemaps/businesses-1.xml", {}),
+    ("sitemap categories", "/sitemaps/categories.xml", {}),
+]
+
+
+def _timed(fn, repeat: int):
+    """(median milliseconds, last result) over `repeat` calls."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Median render time (stock JSONRenderer vs FastJSONRenderer) and payload "
+        "size (raw / gzip / brotli) of the listing, unified_search and sitemap "
+        "responses, computed in-process against the current database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per measurement.")
+        parser.add_argument("--only", help="Run targets whose label contains this text.")
+        parser.add_argument("--host", help="Host header (default: first ALLOWED_HOSTS entry).")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        targets = [t for t in TARGETS if not options["only"] or options["only"] in t[0]]
+        if not targets:
+            raise CommandError("No target matches --only")
+        host = options["host"] or next((h for h in settings.ALLOWED_HOSTS if "*" not in h), "localhost")
+        factory = APIRequestFactory(HTTP_HOST=host.lstrip("."))
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(
+            f"orjson: {'yes' if orjson else 'no (stdlib fallback)'}; "
+            f"brotli: {'yes' if brotli else 'no'}; median of {repeat} runs"
+        )
+        self.stdout.write(
+            f"{'target':<26} {'json ms':>8} {'fast ms':>8} {'same':>5} "
+            f"{'raw KB':>8} {'gzip KB':>8} {'gz ms':>6} {'br KB':>8} {'br ms':>6}"
+        )
+        for label, path, query in targets:
+            match = resolve(path)
+            response = match.func(factory.get(path, query), *match.args, **match.kwargs)
+            if response.status_code != 200:
+                self.stdout.write(f"{label:<26} HTTP {response.status_code}, skipped")
+                continue
+
+            if hasattr(response, "data"):
+                json_ms, body = _timed(lambda: stock.render(response.data), repeat)
+                fast_ms, fast_body = _timed(lambda: fast.render(response.data), repeat)
+                timings = f"{json_ms:>8.2f} {fast_ms:>8.2f} {'yes' if fast_body == body else 'NO':>5}"
+            else:
+                body = response.content
+                timings = f"{'-':>8} {'-':>8} {'-':>5}"
+
+            gz_ms, gz = _timed(lambda: compress_string(body, max_random_bytes=100), repeat)
+            if brotli:
+                br_ms, br = _timed(lambda: brotli.compress(body, quality=BROTLI_QUALITY), repeat)
+                br_cols = f"{len(br) / 1024:>8.1f} {br_ms:>6.2f}"
+            else:
+                br_cols = f"{'-':>8} {'-':>6}"
+            self.stdout.write(
+                f"{label:<26} {timings} {len(body) / 1024:>8.1f} {len(gz) / 1024:>8.1f} "
+                f"{gz_ms:>6.2f} {br_cols}"
+            )
@@ -0,0 +1,65 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from businesses.copyload import copy_insert, orm_insert
+from businesses.models import Business, Doctor
+from businesses.ranking import rank_score
+
+MODELS = {"lawyer": (Business, "name"), "doctor": (Doctor, "provider_name")}
+
+
+def _objs(model, name_field, n):
+    now_ts = timezone.now()
+    run = uuid.uuid4().hex[:6]
+    for i in range(n):
+        obj = model(
+            **{name_field: f"Bench {run} {i}"},
+            slug=f"bench-{run}-{i}",
+            city="Houston", state="TX", zip="77002",
+            description="Benchmark row " * 8,
+            phone="555-0100", website="https://example.com",
+            status="pending", created_at=now_ts, updated_at=now_ts,
+        )
+        obj.rank_score = rank_score(obj)
+        yield obj
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the COPY loader against bulk_create for listing inserts. "
+        "Every run is rolled back; COPY is skipped off PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", default="10000,100000,1000000",
+                            help="Comma-separated row counts.")
+        parser.add_argument("--kind", choices=sorted(MODELS), default="lawyer")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(n) for n in options["rows"].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError("--rows must be comma-separated integers")
+        model, name_field = MODELS[options["kind"]]
+
+        loaders = [("bulk_create", orm_insert)]
+        if connection.vendor == "postgresql":
+            loaders.append(("copy", copy_insert))
+        else:
+            self.stdout.write(f"{connection.vendor}: COPY unavailable, timing bulk_create only")
+
+        self.stdout.write(f"{'rows':>9}  {'loader':<11} {'seconds':>9} {'rows/s':>10}")
+        for n in sizes:
+            for label, load in loaders:
+                with transaction.atomic():
+                    started = time.perf_counter()
+                    inserted = load(model, _objs(model, name_field, n))
+                    elapsed = time.perf_counter() - started
+                    transaction.set_rollback(True)
+                if len(inserted) != n:
+                    raise CommandError(f"{label}: inserted {len(inserted)} of {n} rows")
+                self.stdout.write(f"{n:>9}  {label:<11} {elapsed:>9.2f} {n / elapsed:>10.0f}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from businesses.facets import FACET_MODELS, rebuild_facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the FacetRollup / TopicRollup tables behind /api/facets/ from the "
+        "listings. Run once after deploying them; writes keep them current afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(FACET_MODELS), help="Only this listing type.")
+
+    def handle(self, *args, **options):
+        kinds = [options["kind"]] if options["kind"] else sorted(FACET_MODELS)
+        for kind in kinds:
+            n = rebuild_facets(kind)
+            self.stdout.write(f"{kind}: rebuilt facet rollups for {n} categor{'y' if n == 1 else 'ies'}")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from businesses.jobs import POLL_INTERVAL, run_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued business/doctor import jobs (polls the ImportJob table; no broker needed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when no job can be run instead of polling.")
+        parser.add_argument("--poll", type=float, default=POLL_INTERVAL,
+                            help="Seconds between polls when idle.")
+
+    def handle(self, *args, **options):
+        ran = run_worker(once=options["once"], poll=options["poll"])
+        if options["once"]:
+            self.stdout.write(f"ran {ran} import job(s)")
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from businesses.search import install_fulltext, uninstall_fulltext
+
+
+def forwards(apps, schema_editor):
+    for name in ("Business", "Doctor"):
+        install_fulltext(schema_editor, apps.get_model("businesses", name))
+
+
+def backwards(apps, schema_editor):
+    for name in ("Business", "Doctor"):
+        uninstall_fulltext(schema_editor, apps.get_model("businesses", name))
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL: weighted tsvector generated column + GIN index.
+    SQLite: FTS5 external-content table + sync triggers.
+    Other backends: no-op (search falls back to icontains).
+    """
+
+    dependencies = [
+        ('businesses', '0007_alter_business_works_for_alter_doctor_works_for'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from businesses.search import install_trigram, uninstall_trigram
+
+
+def forwards(apps, schema_editor):
+    for name in ("Business", "Doctor"):
+        install_trigram(schema_editor, apps.get_model("businesses", name))
+
+
+def backwards(apps, schema_editor):
+    for name in ("Business", "Doctor"):
+        uninstall_trigram(schema_editor, apps.get_model("businesses", name))
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL: pg_trgm + GIN trigram indexes on Business.name,
+    Doctor.provider_name and Doctor.specialty.
+    Other backends: no-op (fuzzy search uses the in-process trigram index).
+    """
+
+    dependencies = [
+        ('businesses', '0008_listing_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
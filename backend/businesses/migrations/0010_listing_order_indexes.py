@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0009_listing_trigram_index'),
+        ('categories', '0003_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-is_premium', '-average_rating', '-updated_at', 'id'], name='biz_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['category', '-is_premium', '-average_rating', '-updated_at', 'id'], name='biz_cat_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-updated_at', 'id'], name='biz_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-created_at', 'id'], name='biz_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-average_rating', 'id'], name='biz_rating_id'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-total_reviews', 'id'], name='biz_reviews_id'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-is_premium', '-average_rating', '-updated_at', 'id'], name='doc_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['category', '-is_premium', '-average_rating', '-updated_at', 'id'], name='doc_cat_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-updated_at', 'id'], name='doc_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-created_at', 'id'], name='doc_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-average_rating', 'id'], name='doc_rating_id'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-total_reviews', 'id'], name='doc_reviews_id'),
+        ),
+    ]
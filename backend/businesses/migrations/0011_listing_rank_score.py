@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+from businesses.ranking import refresh_rank_scores
+
+
+def backfill_rank_scores(apps, schema_editor):
+    for name in ("Business", "Doctor"):
+        refresh_rank_scores(apps.get_model("businesses", name).objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0010_listing_order_indexes'),
+        ('categories', '0003_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='business',
+            name='biz_default_order',
+        ),
+        migrations.RemoveIndex(
+            model_name='business',
+            name='biz_cat_default_order',
+        ),
+        migrations.RemoveIndex(
+            model_name='doctor',
+            name='doc_default_order',
+        ),
+        migrations.RemoveIndex(
+            model_name='doctor',
+            name='doc_cat_default_order',
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='rank_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='doctor',
+            name='rank_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-rank_score', '-updated_at', 'id'], name='biz_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['category', 'status', '-rank_score', '-updated_at', 'id'], name='biz_cat_status_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['-rank_score', '-updated_at', 'id'], name='doc_default_order'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['category', 'status', '-rank_score', '-updated_at', 'id'], name='doc_cat_status_rank'),
+        ),
+        migrations.RunPython(backfill_rank_scores, migrations.RunPython.noop),
+    ]
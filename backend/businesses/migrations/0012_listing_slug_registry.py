@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_registry(apps, schema_editor):
+    """Current slug of every listing; Business first, so it keeps a shared slug."""
+    ListingSlug = apps.get_model("businesses", "ListingSlug")
+    for name, kind, fk in (("Business", "lawyer", "business"), ("Doctor", "doctor", "doctor")):
+        rows = (
+            apps.get_model("businesses", name).objects
+            .exclude(slug="")
+            .values_list("id", "slug", "category__full_slug")
+            .iterator(chunk_size=5000)
+        )
+        batch = []
+        for pk, slug, path in rows:
+            batch.append(ListingSlug(slug=slug, kind=kind, category_full_slug=path or "", **{f"{fk}_id": pk}))
+            if len(batch) >= 5000:
+                ListingSlug.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            ListingSlug.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0011_listing_rank_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSlug',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('kind', models.CharField(choices=[('lawyer', 'Lawyer'), ('doctor', 'Doctor')], max_length=10)),
+                ('category_full_slug', models.CharField(blank=True, default='', max_length=1024)),
+                ('is_current', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='slug_entries', to='businesses.business')),
+                ('doctor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='slug_entries', to='businesses.doctor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('business',), name='uniq_current_business_slug'), models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('doctor',), name='uniq_current_doctor_slug'), models.CheckConstraint(condition=models.Q(models.Q(('business__isnull', False), ('doctor__isnull', True), ('kind', 'lawyer')), models.Q(('business__isnull', True), ('doctor__isnull', False), ('kind', 'doctor')), _connector='OR'), name='listing_slug_one_target')],
+            },
+        ),
+        migrations.RunPython(backfill_registry, migrations.RunPython.noop),
+    ]
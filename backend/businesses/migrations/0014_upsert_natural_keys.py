@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0013_import_jobs'),
+        ('categories', '0003_category_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='updated',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['license'], name='biz_license'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['zip'], name='biz_zip', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['npi_number'], name='doc_npi'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(fields=['zip'], name='doc_zip', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
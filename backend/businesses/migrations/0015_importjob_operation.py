@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0014_upsert_natural_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='operation',
+            field=models.CharField(choices=[('import', 'Import'), ('set_category', 'Set category')], default='import', max_length=20),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0016_listing_geo'),
+        ('categories', '0004_category_doctor_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('lawyer', 'Lawyer'), ('doctor', 'Doctor')], max_length=10)),
+                ('state', models.CharField(blank=True, default='', max_length=64)),
+                ('city', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(max_length=20)),
+                ('is_premium', models.BooleanField(default=False)),
+                ('rating_bucket', models.PositiveSmallIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='categories.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'category', 'status'], name='facet_rollup_scope')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TopicRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('lawyer', 'Lawyer'), ('doctor', 'Doctor')], max_length=10)),
+                ('status', models.CharField(max_length=20)),
+                ('topic', models.CharField(max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='categories.category')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'category', 'status'], name='topic_rollup_scope')],
+            },
+        ),
+    ]
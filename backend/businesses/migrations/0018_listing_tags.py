@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0017_facet_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('practice_area', 'Practice area'), ('language', 'Language'), ('association', 'Association')], max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.SlugField(max_length=255)),
+            ],
+            options={
+                'ordering': ('kind', 'name'),
+                'constraints': [models.UniqueConstraint(fields=('kind', 'slug'), name='uniq_tag_kind_slug')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DoctorTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='businesses.doctor')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='doctor_links', to='businesses.tag')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('tag', 'doctor'), name='uniq_doctor_tag')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BusinessTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='businesses.business')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='business_links', to='businesses.tag')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('tag', 'business'), name='uniq_business_tag')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:44
+
+from django.db import migrations, models
+from django.utils import timezone
+
+from businesses.slugs import allocate_slugs
+
+
+def register_unlisted_doctors(apps, schema_editor):
+    """
+    The 0012 backfill skipped doctors whose slug a Business already held,
+    so they were missing from the registry and the sitemaps. Register the
+    rest as they are; give those a fresh slug, keeping the old one as a
+    non-current entry so its URLs 301.
+    """
+    Doctor = apps.get_model("businesses", "Doctor")
+    ListingSlug = apps.get_model("businesses", "ListingSlug")
+    doctors = list(
+        Doctor.objects.exclude(slug="").exclude(slug_entries__is_current=True)
+        .values_list("id", "slug", "provider_name", "category__full_slug")
+    )
+    if not doctors:
+        return
+    held = set(
+        ListingSlug.objects.filter(is_current=True, slug__in=[slug for _, slug, _, _ in doctors])
+        .values_list("slug", flat=True)
+    )
+    clashing = [row for row in doctors if row[1] in held]
+    fresh = iter(allocate_slugs(Doctor, [name for _, _, name, _ in clashing], "provider"))
+
+    now = timezone.now()
+    for pk, slug, _, path in doctors:
+        entries = [(slug, True)]
+        if slug in held:
+            new = next(fresh)
+            Doctor.objects.filter(pk=pk).update(slug=new, updated_at=now)
+            entries = [(new, True), (slug, False)]
+        for value, current in entries:
+            ListingSlug.objects.update_or_create(
+                slug=value, kind="doctor",
+                defaults={"doctor_id": pk, "category_full_slug": path or "", "is_current": current},
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0018_listing_tags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='listingslug',
+            name='slug',
+            field=models.SlugField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='listingslug',
+            constraint=models.UniqueConstraint(fields=('slug', 'kind'), name='uniq_listing_slug_kind'),
+        ),
+        migrations.AddConstraint(
+            model_name='listingslug',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_current', True)), fields=('slug',), name='uniq_current_listing_slug'),
+        ),
+        migrations.RunPython(register_unlisted_doctors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:46
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0019_listing_slug_per_kind'),
+        ('categories', '0004_category_doctor_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='business',
+            name='biz_zip',
+        ),
+        migrations.RemoveIndex(
+            model_name='doctor',
+            name='doc_zip',
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(django.db.models.functions.text.Left('zip', 5), name='biz_zip5'),
+        ),
+        migrations.AddIndex(
+            model_name='doctor',
+            index=models.Index(django.db.models.functions.text.Left('zip', 5), name='doc_zip5'),
+        ),
+    ]
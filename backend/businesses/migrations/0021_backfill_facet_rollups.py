@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from businesses.facets import FACET_MODELS, rebuild_facets
+
+
+def backfill_facet_rollups(apps, schema_editor):
+    for kind in FACET_MODELS:
+        rebuild_facets(kind, apps=apps)
+
+
+def clear_facet_rollups(apps, schema_editor):
+    for name in ("FacetRollup", "TopicRollup"):
+        apps.get_model("businesses", name).objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0020_listing_zip5_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_facet_rollups, clear_facet_rollups),
+    ]
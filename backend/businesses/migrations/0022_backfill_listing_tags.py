@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from businesses.tags import TAG_LINKS, backfill_tags
+
+
+def backfill_listing_tags(apps, schema_editor):
+    for kind in TAG_LINKS:
+        backfill_tags(kind, apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0021_backfill_facet_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_listing_tags, migrations.RunPython.noop),
+    ]
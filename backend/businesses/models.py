@@ -1,8 +1,11 @@
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Left
 from django.conf import settings
 from categories.models import Category
-from django.utils.text import slugify
+
+from .geo import sync_geo
+from .ranking import sync_rank_score
 
 
 class Business(models.Model):
@@ -24,6 +27,10 @@ class Business(models.Model):
     city = models.CharField(max_length=255, blank=True, null=True)
     state = models.CharField(max_length=64, blank=True, null=True)
     zip = models.CharField(max_length=32, blank=True, null=True)
+    # ZIP centroid + grid cell for radius search (businesses/geo.py)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geo_cell = models.IntegerField(blank=True, null=True)
 
     # Profile
     description = models.TextField(blank=True, null=True)
@@ -78,6 +85,8 @@ class Business(models.Model):
     average_rating = models.FloatField(default=0)
     total_reviews = models.IntegerField(default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # premium + rating + completeness, see businesses/ranking.py
+    rank_score = models.FloatField(default=0)
 
     # Slug & timestamps
     slug = models.SlugField(max_length=255, unique=True, blank=True)
@@ -97,6 +106,18 @@ class Business(models.Model):
             models.Index(fields=["status", "average_rating"], name="biz_status_avg"),
             models.Index(fields=["is_premium", "average_rating"], name="biz_premium_avg"),
             models.Index(fields=["-updated_at"]),
+            # list orderings (+ id tiebreak) so keyset pages are index range scans
+            models.Index(fields=["-rank_score", "-updated_at", "id"], name="biz_default_order"),
+            models.Index(fields=["category", "status", "-rank_score", "-updated_at", "id"], name="biz_cat_status_rank"),
+            models.Index(fields=["-updated_at", "id"], name="biz_updated_id"),
+            models.Index(fields=["-created_at", "id"], name="biz_created_id"),
+            models.Index(fields=["-average_rating", "id"], name="biz_rating_id"),
+            models.Index(fields=["-total_reviews", "id"], name="biz_reviews_id"),
+            # natural keys for upsert imports
+            models.Index(fields=["license"], name="biz_license"),
+            models.Index(Left("zip", 5), name="biz_zip5"),  # upsert address match
+            # radius search: one range scan per grid row
+            models.Index(fields=["geo_cell"], name="biz_geo_cell"),
         ]
         constraints = [
             models.CheckConstraint(
@@ -110,16 +131,15 @@ class Business(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
+        from .slugs import save_with_slug, sync_listing_slug
+
+        sync_rank_score(self, kwargs)
+        sync_geo(self, kwargs)
         if not self.slug and self.name:
-            base = slugify(self.name) or "business"
-            candidate = base
-            n = 1
-            Model = self.__class__
-            while Model.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
-                candidate = f"{base}-{n}"
-                n += 1
-            self.slug = candidate
-        super().save(*args, **kwargs)
+            save_with_slug(self, self.name, "business", lambda: super(Business, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
+        sync_listing_slug(self, kwargs.get("update_fields"))
 
 
 class Doctor(models.Model):
@@ -149,6 +169,10 @@ class Doctor(models.Model):
     city = models.CharField(max_length=255, blank=True, null=True)
     state = models.CharField(max_length=64, blank=True, null=True)
     zip = models.CharField(max_length=32, blank=True, null=True)
+    # ZIP centroid + grid cell for radius search (businesses/geo.py)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geo_cell = models.IntegerField(blank=True, null=True)
 
     # Practice & education
     practice_names = models.TextField(blank=True, null=True)
@@ -201,6 +225,8 @@ class Doctor(models.Model):
     average_rating = models.FloatField(default=0)
     total_reviews = models.IntegerField(default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # premium + rating + completeness, see businesses/ranking.py
+    rank_score = models.FloatField(default=0)
 
     # Slug & timestamps
     slug = models.SlugField(max_length=255, unique=True, blank=True)
@@ -220,6 +246,18 @@ class Doctor(models.Model):
             models.Index(fields=["status", "average_rating"], name="doc_status_avg"),
             models.Index(fields=["is_premium", "average_rating"], name="doc_premium_avg"),
             models.Index(fields=["-updated_at"]),
+            # list orderings (+ id tiebreak) so keyset pages are index range scans
+            models.Index(fields=["-rank_score", "-updated_at", "id"], name="doc_default_order"),
+            models.Index(fields=["category", "status", "-rank_score", "-updated_at", "id"], name="doc_cat_status_rank"),
+            models.Index(fields=["-updated_at", "id"], name="doc_updated_id"),
+            models.Index(fields=["-created_at", "id"], name="doc_created_id"),
+            models.Index(fields=["-average_rating", "id"], name="doc_rating_id"),
+            models.Index(fields=["-total_reviews", "id"], name="doc_reviews_id"),
+            # natural keys for upsert imports
+            models.Index(fields=["npi_number"], name="doc_npi"),
+            models.Index(Left("zip", 5), name="doc_zip5"),  # upsert address match
+            # radius search: one range scan per grid row
+            models.Index(fields=["geo_cell"], name="doc_geo_cell"),
         ]
         constraints = [
             models.CheckConstraint(
@@ -233,13 +271,228 @@ class Doctor(models.Model):
         return self.provider_name
 
     def save(self, *args, **kwargs):
+        from .slugs import save_with_slug, sync_listing_slug
+
+        sync_rank_score(self, kwargs)
+        sync_geo(self, kwargs)
         if not self.slug and self.provider_name:
-            base = slugify(self.provider_name) or "doctor"
-            candidate = base
-            n = 1
-            Model = self.__class__
-            while Model.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
-                candidate = f"{base}-{n}"
-                n += 1
-            self.slug = candidate
-        super().save(*args, **kwargs)
+            save_with_slug(self, self.provider_name, "doctor", lambda: super(Doctor, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
+        sync_listing_slug(self, kwargs.get("update_fields"))
+
+
+class ListingSlug(models.Model):
+    """
+    Global slug registry across both verticals: slug -> listing (+ its
+    category path). Every slug a listing has ever had stays here; only one
+    per listing is current, the rest answer with a 301 to it. A slug has
+    one row per vertical and is current for at most one listing.
+    Maintained by businesses/slugs.py.
+    """
+    KIND_CHOICES = [
+        ("lawyer", "Lawyer"),
+        ("doctor", "Doctor"),
+    ]
+
+    slug = models.SlugField(max_length=255)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+
+    # Exactly one of these is set, depending on kind
+    business = models.ForeignKey(
+        Business, null=True, blank=True, on_delete=models.CASCADE, related_name="slug_entries"
+    )
+    doctor = models.ForeignKey(
+        Doctor, null=True, blank=True, on_delete=models.CASCADE, related_name="slug_entries"
+    )
+
+    category_full_slug = models.CharField(max_length=1024, blank=True, default="")
+    is_current = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["slug", "kind"], name="uniq_listing_slug_kind"),
+            models.UniqueConstraint(
+                fields=["slug"],
+                condition=Q(is_current=True),
+                name="uniq_current_listing_slug",
+            ),
+            models.UniqueConstraint(
+                fields=["business"],
+                condition=Q(is_current=True),
+                name="uniq_current_business_slug",
+            ),
+            models.UniqueConstraint(
+                fields=["doctor"],
+                condition=Q(is_current=True),
+                name="uniq_current_doctor_slug",
+            ),
+            models.CheckConstraint(
+                check=(
+                    Q(kind="lawyer", business__isnull=False, doctor__isnull=True)
+                    | Q(kind="doctor", doctor__isnull=False, business__isnull=True)
+                ),
+                name="listing_slug_one_target",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.slug} -> {self.kind}"
+
+    @property
+    def listing(self):
+        return self.business if self.kind == "lawyer" else self.doctor
+
+
+class ImportJob(models.Model):
+    """
+    A background NDJSON/CSV import of businesses or doctors, run by
+    `manage.py run_import_worker` (see businesses/jobs.py). checkpoint is
+    the last file line whose chunk is committed, so an interrupted job
+    resumes after it.
+
+    operation "set_category" is a bulk category move instead: the file
+    holds one {"id": ...} line per listing and options the destination
+    (businesses/moves.py).
+    """
+    KIND_CHOICES = ListingSlug.KIND_CHOICES
+    OPERATION_CHOICES = [
+        ("import", "Import"),
+        ("set_category", "Set category"),
+    ]
+    FORMAT_CHOICES = [
+        ("ndjson", "NDJSON"),
+        ("csv", "CSV"),
+    ]
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    operation = models.CharField(max_length=20, choices=OPERATION_CHOICES, default="import")
+    input_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    file = models.FileField(upload_to="imports/%Y/%m/")
+    chunk_size = models.PositiveIntegerField(default=1000)
+    # import: {"mode", "key", "recalc_categories"}; set_category: {"to_category_id", "refresh_seo", "categories"}
+    options = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    total_rows = models.PositiveIntegerField(null=True, blank=True)  # line count, approximate
+    rows = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # first MAX_STORED_ERRORS row errors
+    checkpoint = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True, default="")
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True,
+        on_delete=models.SET_NULL, related_name="import_jobs",
+    )
+    worker = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"], name="import_job_status_created")]
+
+    def __str__(self):
+        return f"{self.kind} {self.operation} #{self.pk} ({self.status})"
+
+
+class JobLock(models.Model):
+    """A named lease lock (businesses/locks.py); owner is empty when free."""
+    name = models.CharField(max_length=64, primary_key=True)
+    owner = models.CharField(max_length=255, blank=True, default="")
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.owner or 'free'})"
+
+
+class FacetRollup(models.Model):
+    """
+    Listing counts per kind x category x state x city x status x premium x
+    rating bucket, behind the /facets/ endpoint. Rebuilt per category by
+    businesses/facets.py whenever listings in it change.
+    """
+    kind = models.CharField(max_length=10, choices=ListingSlug.KIND_CHOICES)
+    category = models.ForeignKey(Category, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    state = models.CharField(max_length=64, blank=True, default="")
+    city = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=20)
+    is_premium = models.BooleanField(default=False)
+    rating_bucket = models.PositiveSmallIntegerField(default=0)  # floor(average_rating), 0..5
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["kind", "category", "status"], name="facet_rollup_scope")]
+
+
+class TopicRollup(models.Model):
+    """Listing counts per kind x category x status x practice area (lawyers) / specialty (doctors)."""
+    kind = models.CharField(max_length=10, choices=ListingSlug.KIND_CHOICES)
+    category = models.ForeignKey(Category, null=True, blank=True, on_delete=models.CASCADE, related_name="+")
+    status = models.CharField(max_length=20)
+    topic = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["kind", "category", "status"], name="topic_rollup_scope")]
+
+
+class Tag(models.Model):
+    """
+    Canonical practice area / language / association, parsed out of the
+    listings' free-text columns (businesses/tags.py). The text columns stay
+    for display; filters join through BusinessTag / DoctorTag on tag ids.
+    """
+    KIND_CHOICES = [
+        ("practice_area", "Practice area"),
+        ("language", "Language"),
+        ("association", "Association"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    name = models.CharField(max_length=255)  # display form, as first seen
+    slug = models.SlugField(max_length=255)  # canonical key within kind
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "slug"], name="uniq_tag_kind_slug"),
+        ]
+        ordering = ("kind", "name")
+
+    def __str__(self):
+        return f"{self.kind}: {self.name}"
+
+
+class BusinessTag(models.Model):
+    business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="business_links")
+
+    class Meta:
+        constraints = [
+            # tag first: "listings with tag X" is an index range scan
+            models.UniqueConstraint(fields=["tag", "business"], name="uniq_business_tag"),
+        ]
+
+
+class DoctorTag(models.Model):
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name="tag_links")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="doctor_links")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["tag", "doctor"], name="uniq_doctor_tag"),
+        ]
@@ -0,0 +1,63 @@
+# businesses/moves.py
+"""
+Bulk category moves (bulk_set_category) for Business and Doctor.
+
+Listings are moved MOVE_CHUNK_SIZE ids at a time, each chunk in its own
+transaction together with its registry paths and, optionally, a bulk
+PageMeta refresh, so a 50k-row move never holds one long transaction and
+a background job (operation "set_category", see businesses/jobs.py) can
+resume after its last committed chunk. Category counts and the featured
+cache and facet rollups are settled once at the end (finish_move).
+"""
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from .facets import refresh_facets
+from .featured import bump_featured
+from .imports import IMPORT_TARGETS, refresh_meta
+from .slugs import refresh_listing_paths
+from .utils import recalc_category_counts
+from utils.cache import bump_versions
+from utils.edge import CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY, purge_keys, vertical_key
+
+MOVE_CHUNK_SIZE = 5000
+MOVE_SYNC_LIMIT = 5000  # larger moves always go to the import worker
+
+
+def move_listings(kind: str, ids, to_cat, *, refresh_seo: bool = False,
+                  chunk_size: int = MOVE_CHUNK_SIZE, progress=None) -> int:
+    """
+    Move the `kind` listings in `ids` (any iterable) to `to_cat`, committing
+    per chunk. progress(report, done) runs inside each chunk's transaction,
+    with report shaped like an import report ("updated" = rows moved) and
+    done = ids handled so far. Returns the number of rows moved.
+    """
+    model = IMPORT_TARGETS[kind][0]
+    it = iter(ids)
+    moved = done = 0
+    while chunk := list(islice(it, chunk_size)):
+        with transaction.atomic():
+            count = model.objects.filter(id__in=chunk).update(
+                category_id=to_cat.id, updated_at=timezone.now()
+            )
+            refresh_listing_paths(model, to_cat, ids=chunk)
+            if refresh_seo:
+                refresh_meta(kind, id__in=chunk)
+            done += len(chunk)
+            if progress:
+                progress({"rows": len(chunk), "created": 0, "updated": count,
+                          "skipped": len(chunk) - count, "errors": []}, done)
+        moved += count
+    return moved
+
+
+def finish_move(kind: str, category_ids) -> None:
+    """Counts, facet rollups and featured cache for the source and destination categories."""
+    recalc_category_counts(category_ids)
+    refresh_facets(kind, category_ids)
+    bump_featured(kind, category_ids)
+    bump_versions(IMPORT_TARGETS[kind][0])
+    # moved listings get new paths (old ones 301)
+    purge_keys(vertical_key(kind), CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY)
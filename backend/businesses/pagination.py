@@ -0,0 +1,242 @@
+# businesses/pagination.py
+"""
+Keyset (cursor) helpers for listing endpoints.
+
+unified_search cursor mode orders the merged Business + Doctor stream by
+
+    rank DESC, rank_score DESC, updated_at DESC, type ASC, id ASC
+
+and carries the last row's key as an opaque cursor, so every page is
+"rows after this key" instead of OFFSET n.
+
+ListingPagination applies the same idea to the Business/Doctor list
+endpoints (opt-in with ?cursor=).
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from utils.pagination import EstimatedCountPagination
+
+# Descending sort keys shared by both verticals (type/id are the tiebreakers)
+KEYSET_DESC = ("rank", "rank_score", "updated_at")
+
+
+def encode_cursor(values) -> str:
+    def _default(v):
+        if isinstance(v, datetime):
+            return v.isoformat()
+        raise TypeError(type(v))
+    raw = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> list:
+    """Raises ValueError on anything that is not a cursor we issued."""
+    try:
+        pad = "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(token + pad).decode())
+    except Exception as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(values, list) or len(values) != len(KEYSET_DESC) + 2:
+        raise ValueError("Invalid cursor.")
+    rank, score, updated, kind, pk = values
+    updated_at = parse_datetime(updated) if isinstance(updated, str) else None
+    if updated_at is None or not isinstance(pk, int):
+        raise ValueError("Invalid cursor.")
+    return [float(rank or 0), float(score or 0), updated_at, str(kind), pk]
+
+
+def row_key(kind: str, row, ranked: bool) -> list:
+    """
+    Cursor/merge key of a listing (model instance or .values() dict),
+    in KEYSET_DESC + (type, id) order.
+    """
+    if isinstance(row, dict):
+        get = row.get
+    else:
+        def get(name, default=None):
+            return getattr(row, name, default)
+    return [
+        float(get("rank") or 0) if ranked else 0.0,
+        float(get("rank_score") or 0),
+        get("updated_at"),
+        kind,
+        get("id"),
+    ]
+
+
+def sort_key(key: list) -> tuple:
+    """Ascending tuple for heapq.merge that reproduces the keyset order."""
+    rank, score, updated_at, kind, pk = key
+    return (-rank, -score, -updated_at.timestamp(), kind, pk)
+
+
+def keyset_after(kind: str, cursor: list, ranked: bool) -> Q:
+    """
+    Q selecting rows of vertical `kind` that sort strictly after `cursor`.
+    Within one vertical `type` is constant, so the (type, id) tiebreak
+    collapses to: everything equal-keyed if kind > cursor type, id > cursor
+    id if it is the same type, nothing if kind < cursor type.
+    """
+    fields = list(KEYSET_DESC) if ranked else list(KEYSET_DESC[1:])
+    values = cursor[:3] if ranked else cursor[1:3]
+    c_kind, c_pk = cursor[3], cursor[4]
+
+    after = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(fields, values):
+        after |= equal & Q(**{f"{field}__lt": value})
+        equal &= Q(**{field: value})
+
+    if kind > c_kind:
+        return after | equal
+    if kind == c_kind:
+        return after | (equal & Q(pk__gt=c_pk))
+    return after
+
+
+# -------------------- Composite keyset pagination for list endpoints --------------------
+def _encode_value(v):
+    if isinstance(v, datetime):
+        return {"dt": v.isoformat()}
+    return v
+
+
+def _decode_value(v):
+    if isinstance(v, dict) and "dt" in v:
+        parsed = parse_datetime(str(v["dt"]))
+        if parsed is None:
+            raise ValueError("Invalid cursor.")
+        return parsed
+    if isinstance(v, (list, dict)):
+        raise ValueError("Invalid cursor.")
+    return v
+
+
+def encode_position(values, reverse: bool = False) -> str:
+    payload = {"v": [_encode_value(v) for v in values]}
+    if reverse:
+        payload["r"] = 1
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_position(token: str) -> tuple[list, bool]:
+    try:
+        pad = "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + pad).decode())
+        values = [_decode_value(v) for v in payload["v"]]
+    except Exception as exc:
+        raise ValueError("Invalid cursor.") from exc
+    return values, bool(payload.get("r"))
+
+
+def keyset_filter(ordering: list[str], values: list) -> Q:
+    """
+    Rows strictly after `values` under `ordering` (e.g. ["-rank_score", "id"]),
+    expanded lexicographically: a < x OR (a = x AND b < y) OR ...
+    """
+    after = Q(pk__in=[])
+    equal = Q()
+    for term, value in zip(ordering, values):
+        field = term.lstrip("-")
+        op = "lt" if term.startswith("-") else "gt"
+        after |= equal & Q(**{f"{field}__{op}": value})
+        equal &= Q(**{field: value})
+    return after
+
+
+def _flip(term: str) -> str:
+    return term[1:] if term.startswith("-") else f"-{term}"
+
+
+class ListingPagination(EstimatedCountPagination):
+    """
+    Limit/offset with estimated counts (utils.pagination), plus an opt-in composite keyset mode:
+
+      ?cursor=            first page
+      ?cursor=<opaque>    page after/before the row the cursor was cut at
+
+    The keyset follows whatever ordering the view produced (default
+    -rank_score, -updated_at; ?ordering= over the view's
+    ordering_fields; -rank first for ?q=) with id appended as a tiebreaker,
+    so each page is an index range scan of `limit` rows with no OFFSET and
+    no COUNT(*). Ordering columns must be non-null.
+    """
+    cursor_query_param = "cursor"
+    max_cursor_limit = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if not all(isinstance(t, str) for t in ordering):
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+        ordering = [t.replace("pk", "id") if t.lstrip("-") == "pk" else t for t in ordering]
+        if not any(t.lstrip("-") == "id" for t in ordering):
+            ordering.append("id")
+        self.ordering = ordering
+
+        self.request = request
+        self.limit = min(self.get_limit(request) or self.default_limit, self.max_cursor_limit)
+
+        token = (request.query_params.get(self.cursor_query_param) or "").strip()
+        values, reverse = None, False
+        if token:
+            try:
+                values, reverse = decode_position(token)
+            except ValueError:
+                raise NotFound("Invalid cursor.")
+            if len(values) != len(ordering):
+                raise NotFound("Invalid cursor.")
+
+        order = [_flip(t) for t in ordering] if reverse else ordering
+        qs = queryset.order_by(*order)
+        if values is not None:
+            qs = qs.filter(keyset_filter(order, values))
+
+        rows = list(qs[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            first, last = self._position(rows[0]), self._position(rows[-1])
+            if reverse:
+                self.next_position = (last, False)
+                self.previous_position = (first, True) if has_more else None
+            else:
+                self.next_position = (last, False) if has_more else None
+                self.previous_position = (first, True) if values is not None else None
+        return rows
+
+    def _position(self, obj) -> list:
+        return [getattr(obj, t.lstrip("-")) for t in self.ordering]
+
+    def _cursor_link(self, position):
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, encode_position(*position))
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self._cursor_link(self.next_position),
+            "previous": self._cursor_link(self.previous_position),
+            "results": data,
+        })
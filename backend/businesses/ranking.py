@@ -0,0 +1,91 @@
+# businesses/ranking.py
+"""
+Persisted listing rank (Business.rank_score / Doctor.rank_score).
+
+    rank_score = 10 * is_premium + average_rating + 0.001 * completeness
+
+completeness is the share of profile fields that are filled in (0..1), so
+the score keeps the old "premium first, then rating" order and only uses
+completeness to break rating ties ahead of recency. Default list ordering
+is -rank_score, -updated_at (index: category, status, -rank_score).
+
+Kept current by:
+  - Model.save()                  (sync_rank_score)
+  - bulk_create paths             (rank_score() before insert)
+  - queryset .update() paths      (refresh_rank_scores afterwards)
+"""
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast
+
+PREMIUM_BOOST = 10.0
+COMPLETENESS_WEIGHT = 0.001
+
+COMPLETENESS_FIELDS = {
+    "businesses.business": (
+        "description", "practice_areas", "phone", "website", "image_url",
+        "email", "street_address", "education", "language",
+    ),
+    "businesses.doctor": (
+        "description", "specialty", "phone", "website", "image_url",
+        "email", "street_address", "educations", "languages", "insurances",
+    ),
+}
+
+
+def _fields(model) -> tuple[str, ...]:
+    return COMPLETENESS_FIELDS[model._meta.label_lower]
+
+
+def rank_inputs(model) -> set[str]:
+    return {"is_premium", "average_rating", *_fields(model)}
+
+
+def rank_score(obj) -> float:
+    fields = _fields(obj)
+    filled = sum(1 for f in fields if getattr(obj, f, None))
+    return (
+        (PREMIUM_BOOST if obj.is_premium else 0.0)
+        + float(obj.average_rating or 0)
+        + COMPLETENESS_WEIGHT * filled / len(fields)
+    )
+
+
+def rank_score_expression(model):
+    """The same formula as an ORM expression, for queryset.update()."""
+    fields = _fields(model)
+    filled = sum(
+        (
+            Case(
+                When(Q(**{f"{f}__isnull": False}) & ~Q(**{f: ""}), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            for f in fields
+        ),
+        Value(0),
+    )
+    return (
+        Case(When(is_premium=True, then=Value(PREMIUM_BOOST)), default=Value(0.0), output_field=FloatField())
+        + F("average_rating")
+        + Value(COMPLETENESS_WEIGHT / len(fields)) * Cast(filled, FloatField())
+    )
+
+
+def refresh_rank_scores(queryset) -> int:
+    """Recompute rank_score in SQL for every row of `queryset`."""
+    return queryset.order_by().update(rank_score=rank_score_expression(queryset.model))
+
+
+def sync_rank_score(instance, save_kwargs: dict) -> None:
+    """
+    Called from Model.save(): recompute rank_score unless this is a partial
+    save that touches none of its inputs (and then also write it back).
+    """
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is None:
+        instance.rank_score = rank_score(instance)
+        return
+    update_fields = set(update_fields)
+    if update_fields & rank_inputs(instance):
+        instance.rank_score = rank_score(instance)
+        save_kwargs["update_fields"] = update_fields | {"rank_score"}
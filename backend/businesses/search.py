@@ -0,0 +1,442 @@
+# businesses/search.py
+"""
+Full-text search for Business (lawyers) and Doctor (providers).
+
+PostgreSQL: a generated, weighted `search_vector` tsvector column + GIN index.
+SQLite:     an FTS5 external-content shadow table kept in sync by triggers.
+
+Both indexes are maintained by the database itself, so Model.save(),
+bulk_create() and queryset .update() all keep them current.
+
+Fuzzy (typo-tolerant) name matching uses pg_trgm on PostgreSQL and the
+pure-Python trigram index in businesses/trigram.py elsewhere.
+
+Field weights mirror the old Case/When rank:
+  A  name / provider_name
+  B  practice_areas / specialty
+  C  description (+ long profile text)
+  D  location (city, state, zip, ...)
+and, as before, a name equal to q (+100) or starting with q (+60) is
+boosted above any index rank.
+"""
+import logging
+import re
+
+from django.db import connections, transaction, DEFAULT_DB_ALIAS, DatabaseError
+from django.db.models import (
+    Q, F, Value, Case, When, FloatField, IntegerField, Func,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Greatest
+
+from categories.models import Category
+from . import trigram
+
+log = logging.getLogger(__name__)
+
+# Weight buckets per model (keyed by model._meta.model_name)
+FTS_FIELDS = {
+    "business": {
+        "A": ["name"],
+        "B": ["practice_areas"],
+        "C": ["description", "honors", "associations", "education",
+              "publications", "speaking_engagements"],
+        "D": ["city", "state", "zip", "language", "work_experience"],
+    },
+    "doctor": {
+        "A": ["provider_name"],
+        "B": ["specialty"],
+        "C": ["description"],
+        "D": ["city", "state", "zip", "npi_number"],
+    },
+}
+
+# Short identity fields that get trigram (fuzzy) matching
+TRIGRAM_FIELDS = {
+    "business": ["name"],
+    "doctor": ["provider_name", "specialty"],
+}
+
+# Relative importance of each bucket (PG ts_rank array is ordered {D, C, B, A})
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+NAME_EXACT_BOOST = 100.0
+NAME_PREFIX_BOOST = 60.0
+PG_CONFIG = "simple"  # no stemming: names and cities must match as typed
+
+MAX_TERMS = 8
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _key(model) -> str:
+    return model._meta.model_name
+
+
+def _table(model) -> str:
+    return model._meta.db_table
+
+
+def _fts_table(model) -> str:
+    return f"{_table(model)}_fts"
+
+
+def _columns(model) -> list[tuple[str, str]]:
+    """[(field, weight), ...] in A→D order (also the FTS5 column order)."""
+    spec = FTS_FIELDS[_key(model)]
+    return [(f, w) for w in "ABCD" for f in spec.get(w, [])]
+
+
+def terms_for(q: str) -> list[str]:
+    return [t.lower() for t in _TERM_RE.findall(q or "")][:MAX_TERMS]
+
+
+# -------------------- DDL (used by the migration + post_migrate) --------------------
+def _pg_statements(model) -> list[str]:
+    table = _table(model)
+    parts = " || ".join(
+        f"setweight(to_tsvector('{PG_CONFIG}', coalesce({f}, '')), '{w}')"
+        for f, w in _columns(model)
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({parts}) STORED",
+        f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)",
+    ]
+
+
+def _sqlite_statements(model) -> list[str]:
+    table = _table(model)
+    fts = _fts_table(model)
+    cols = [f for f, _ in _columns(model)]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({col_list}, "
+        f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def install_fulltext(schema_editor, model) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in _pg_statements(model):
+            schema_editor.execute(sql)
+    elif vendor == "sqlite":
+        for sql in _sqlite_statements(model):
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {_fts_table(model)}({_fts_table(model)}) VALUES ('rebuild')")
+    _ready.clear()
+
+
+def uninstall_fulltext(schema_editor, model) -> None:
+    vendor = schema_editor.connection.vendor
+    table = _table(model)
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        fts = _fts_table(model)
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+    _ready.clear()
+
+
+def install_trigram(schema_editor, model) -> None:
+    """pg_trgm GIN indexes; other backends use the in-process index instead."""
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=conn.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        log.warning("pg_trgm unavailable; fuzzy search will use the in-process trigram index")
+        return
+    table = _table(model)
+    for field in TRIGRAM_FIELDS[_key(model)]:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_{field}_trgm ON {table} USING gin ({field} gin_trgm_ops)"
+        )
+    _trgm_ready.clear()
+
+
+def uninstall_trigram(schema_editor, model) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = _table(model)
+    for field in TRIGRAM_FIELDS[_key(model)]:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{field}_trgm")
+    _trgm_ready.clear()
+
+
+def ensure_sqlite_triggers(using: str = DEFAULT_DB_ALIAS, models=()) -> None:
+    """
+    SQLite rebuilds a table (copy + drop + rename) for many ALTERs, which
+    silently drops its triggers. Re-create them after migrate and rebuild
+    the shadow table if any were missing.
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cur:
+        cur.execute("SELECT name, type FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {name for name, _ in cur.fetchall()}
+        for model in models:
+            fts = _fts_table(model)
+            if fts not in existing:
+                continue  # migration not applied yet
+            if all(f"{fts}_{s}" in existing for s in ("ai", "ad", "au")):
+                continue
+            for sql in _sqlite_statements(model):
+                cur.execute(sql)
+            cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    _ready.clear()
+
+
+# -------------------- query side --------------------
+_ready: dict[tuple[str, str], bool] = {}
+
+
+def fulltext_available(model, using: str = DEFAULT_DB_ALIAS) -> bool:
+    key = (using, _key(model))
+    if key not in _ready:
+        conn = connections[using]
+        ok = False
+        try:
+            if conn.vendor == "postgresql":
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT 1 FROM information_schema.columns "
+                        "WHERE table_name = %s AND column_name = 'search_vector'",
+                        [_table(model)],
+                    )
+                    ok = cur.fetchone() is not None
+            elif conn.vendor == "sqlite":
+                ok = _fts_table(model) in conn.introspection.table_names()
+        except Exception:
+            ok = False
+        _ready[key] = ok
+    return _ready[key]
+
+
+def _match_expr(vendor: str, model, terms: list[str], weights: str) -> str:
+    if vendor == "postgresql":
+        suffix = "" if weights == "ABCD" else weights
+        return " & ".join(f"{t}:*{suffix}" for t in terms)
+    # SQLite FTS5: prefix phrases, optionally restricted to the weight's columns
+    expr = " ".join(f'"{t}"*' for t in terms)
+    if weights == "ABCD":
+        return expr
+    cols = " ".join(f for f, w in _columns(model) if w in weights)
+    return f"{{{cols}}} : ({expr})"
+
+
+class _FulltextRank(Func):
+    """
+    Rank of the outer listing row. The outer pk goes through the compiler,
+    so {pk} and {table} (its alias) follow whatever alias the outer query,
+    or a UNION / pk__in subquery, gives the listing table.
+    """
+    output_field = FloatField()
+
+    def __init__(self, template: str, match: str):
+        self.rank_template = template
+        super().__init__(Value(match), F("pk"))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        match_sql, match_params = compiler.compile(self.source_expressions[0])
+        pk_sql, pk_params = compiler.compile(self.source_expressions[1])
+        table = pk_sql.rsplit(".", 1)[0]
+        sql = self.rank_template.format(match=match_sql, pk=pk_sql, table=table)
+        return sql, [*match_params, *pk_params]
+
+
+def _rank_expr(vendor: str, model, match: str) -> Func:
+    if vendor == "postgresql":
+        # search_vector is a column of the outer row: no lookup needed
+        arr = "{%s}" % ",".join(str(WEIGHTS[w]) for w in "DCBA")
+        template = (
+            f"ts_rank('{arr}'::float4[], {{table}}.search_vector, to_tsquery('{PG_CONFIG}', {{match}}))"
+        )
+    else:
+        # bm25() only exists inside the MATCH query. Run that once (LIMIT -1
+        # keeps SQLite from flattening it into the correlated lookup) and
+        # look each row up in it through SQLite's automatic index.
+        fts = _fts_table(model)
+        bm25_w = ", ".join(str(WEIGHTS[w] * 10) for _, w in _columns(model))
+        template = (
+            f"(SELECT r.score FROM (SELECT rowid AS id, -bm25({fts}, {bm25_w}) AS score "
+            f"FROM {fts} WHERE {fts} MATCH {{match}} LIMIT -1) r WHERE r.id = {{pk}})"
+        )
+    return _FulltextRank(template, match)
+
+
+def _name_boost(model, q: str) -> Case:
+    """The old name == q / name startswith q points, on top of the index rank."""
+    name = FTS_FIELDS[_key(model)]["A"][0]
+    return Case(
+        When(**{f"{name}__iexact": q}, then=Value(NAME_EXACT_BOOST + NAME_PREFIX_BOOST)),
+        When(**{f"{name}__istartswith": q}, then=Value(NAME_PREFIX_BOOST)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def _match_ids(vendor: str, model, match: str) -> RawSQL:
+    if vendor == "postgresql":
+        return RawSQL(
+            f"SELECT id FROM {_table(model)} WHERE search_vector @@ to_tsquery('{PG_CONFIG}', %s)",
+            [match],
+        )
+    fts = _fts_table(model)
+    return RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+
+
+def _category_ids(q: str):
+    return Category.objects.filter(
+        Q(name__icontains=q) | Q(full_slug__icontains=q)
+    ).values("id")
+
+
+# -------------------- legacy icontains fallback --------------------
+_LEGACY_POINTS = {"B": 20, "C": 10, "D": 5}
+
+
+def _legacy_parts(model, q: str, weights: str, with_category: bool):
+    cols = [(f, w) for f, w in _columns(model) if w in weights]
+    cond = Q()
+    for f, _ in cols:
+        cond |= Q(**{f"{f}__icontains": q})
+    if with_category:
+        cond |= Q(category__name__icontains=q) | Q(category__full_slug__icontains=q)
+
+    def pts(lookup, value):
+        return Case(When(**{lookup: q}, then=Value(value)), default=Value(0), output_field=IntegerField())
+
+    parts = []
+    for f, w in cols:
+        if w == "A":
+            parts += [pts(f"{f}__iexact", 100), pts(f"{f}__istartswith", 60), pts(f"{f}__icontains", 40)]
+        else:
+            parts.append(pts(f"{f}__icontains", _LEGACY_POINTS[w]))
+    if with_category:
+        parts.append(pts("category__name__icontains", 5))
+    total = parts[0]
+    for p in parts[1:]:
+        total = total + p
+    return cond, total
+
+
+def _fulltext_parts(queryset, q: str, weights: str, with_category: bool):
+    """(filter Q, rank expression) for `q`, via the index when present."""
+    model = queryset.model
+    terms = terms_for(q)
+    using = queryset.db
+    if not terms or not fulltext_available(model, using):
+        return _legacy_parts(model, q, weights, with_category)
+
+    vendor = connections[using].vendor
+    match = _match_expr(vendor, model, terms, weights)
+    cond = Q(pk__in=_match_ids(vendor, model, match))
+    if with_category:
+        cond |= Q(category_id__in=_category_ids(q))
+    rank = _rank_expr(vendor, model, match)
+    if "A" in weights:
+        rank = Coalesce(rank, Value(0.0), output_field=FloatField()) + _name_boost(model, q)
+    return cond, rank
+
+
+# -------------------- trigram (fuzzy) --------------------
+_trgm_ready: dict[str, bool] = {}
+
+
+def trigram_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+    if using not in _trgm_ready:
+        conn = connections[using]
+        ok = False
+        if conn.vendor == "postgresql":
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                    ok = cur.fetchone() is not None
+            except Exception:
+                ok = False
+        _trgm_ready[using] = ok
+    return _trgm_ready[using]
+
+
+def _trigram_parts(queryset, q: str, threshold: float):
+    """(filter Q, word-similarity expression) over TRIGRAM_FIELDS."""
+    model = queryset.model
+    fields = TRIGRAM_FIELDS[_key(model)]
+    using = queryset.db
+
+    if trigram_available(using):
+        # `q <% f` (word similarity: q against the best-matching run of words
+        # in f) uses the GIN trigram indexes; its threshold is a session setting
+        with connections[using].cursor() as cur:
+            cur.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)", [str(threshold)])
+        where = " OR ".join(f"%s <%% {f}" for f in fields)
+        cond = Q(pk__in=RawSQL(f"SELECT id FROM {_table(model)} WHERE {where}", [q] * len(fields)))
+        sims = [Func(Value(q), F(f), function="word_similarity", output_field=FloatField()) for f in fields]
+        sim = sims[0] if len(sims) == 1 else Greatest(*sims)
+        return cond, Coalesce(sim, Value(0.0), output_field=FloatField())
+
+    hits = trigram.fuzzy_ids(model, fields, q, using, threshold=threshold)
+    if not hits:
+        return Q(pk__in=[]), Value(0.0, output_field=FloatField())
+    sim = Case(
+        *[When(pk=pk, then=Value(score)) for pk, score in hits.items()],
+        default=Value(0.0), output_field=FloatField(),
+    )
+    return Q(pk__in=list(hits)), sim
+
+
+# -------------------- public API --------------------
+def fulltext_search(queryset, q: str, *, weights: str = "ABCD",
+                    with_category: bool = True, rank: bool = True):
+    """
+    Filter `queryset` (Business or Doctor) to rows matching `q` and, when
+    `rank` is True, annotate a field-weighted `rank` (higher is better).
+
+    Uses the FTS index when present; otherwise falls back to the old
+    OR-chained icontains filter so the endpoints behave the same everywhere.
+    Category name / path matches are resolved against the (small) category
+    table first and OR'ed in by id.
+    """
+    q = (q or "").strip()
+    if not q:
+        return queryset
+    cond, rank_expr = _fulltext_parts(queryset, q, weights, with_category)
+    queryset = queryset.filter(cond)
+    if rank:
+        queryset = queryset.annotate(
+            rank=Coalesce(rank_expr, Value(0.0), output_field=FloatField())
+        )
+    return queryset
+
+
+def fuzzy_search(queryset, q: str, *, threshold: float = trigram.DEFAULT_THRESHOLD):
+    """
+    Typo-tolerant variant of fulltext_search(): rows matching the full-text
+    index OR with a name (doctors: provider_name/specialty) trigram-similar
+    to `q`. Annotates `similarity` and `rank` = full-text rank + similarity.
+    """
+    q = (q or "").strip()
+    if not q:
+        return queryset
+    fts_cond, fts_rank = _fulltext_parts(queryset, q, "ABCD", True)
+    trgm_cond, sim = _trigram_parts(queryset, q, threshold)
+    return (
+        queryset.filter(fts_cond | trgm_cond)
+        .annotate(similarity=sim)
+        .annotate(rank=Coalesce(fts_rank, Value(0.0), output_field=FloatField()) + F("similarity"))
+    )
@@ -2,7 +2,9 @@ from rest_framework import serializers
 from django.utils.text import slugify
 from django.utils.timezone import now
 
-from .models import Business, Doctor
+from .fieldsets import SparseFieldsetSerializer
+from .models import Business, Doctor, ImportJob
+from .slugs import allocate_slug
 from categories.models import Category  # noqa
 from django.contrib.auth import get_user_model
 
@@ -10,15 +12,8 @@ User = get_user_model()
 
 
 # -------- slug helpers (lawyer/business) --------
-def _unique_slug_for(instance, base_name: str) -> str:
-    base = slugify(base_name) or "business"
-    candidate = base
-    n = 1
-    Model = instance.__class__
-    while Model.objects.filter(slug=candidate).exclude(pk=instance.pk).exists():
-        candidate = f"{base}-{n}"
-        n += 1
-    return candidate
+def _unique_slug_for(instance, base_name: str, fallback: str = "business") -> str:
+    return allocate_slug(instance, base_name, fallback)
 
 
 def _looks_auto_slug(slug: str | None, from_name: str | None) -> bool:
@@ -28,9 +23,25 @@ def _looks_auto_slug(slug: str | None, from_name: str | None) -> bool:
     return slug == auto or slug.startswith(f"{auto}-")
 
 
-class BusinessSerializer(serializers.ModelSerializer):
+# Columns behind the computed listing fields (see businesses/fieldsets.py)
+_LISTING_FIELD_COLUMNS = {
+    "is_claimed": ("claimed_by_id",),
+    "has_pending_claim": ("pending_claim_by_id",),
+    "url_path": ("slug", "category"),
+}
+
+# Admin/claim bookkeeping and the created_date/updated_date aliases:
+# left out of the public "detail" preset
+_ADMIN_ONLY_FIELDS = {
+    "claimed_by_id", "pending_claim_by_id", "pending_claim_notes", "pending_claim_requested_at",
+    "created_date", "updated_date",
+}
+
+
+class BusinessSerializer(SparseFieldsetSerializer, serializers.ModelSerializer):
     """
-    Lawyer-centric listing (Business).
+    Lawyer-centric listing (Business). ?fields= / ?omit= select a subset
+    (presets: card, detail, admin).
     """
     # Foreign key by id (write) + convenient read-only info
     category_id = serializers.IntegerField(required=True)
@@ -55,6 +66,9 @@ class BusinessSerializer(serializers.ModelSerializer):
     # URL-ish path for front-end routing (category_full_slug/slug)
     url_path = serializers.SerializerMethodField()
 
+    # Only present on ?near= results
+    distance_km = serializers.FloatField(read_only=True)
+
     class Meta:
         model = Business
         fields = [
@@ -64,6 +78,7 @@ class BusinessSerializer(serializers.ModelSerializer):
             "email",  # NEW
             # address
             "street_address", "city", "state", "zip",
+            "latitude", "longitude", "distance_km",
             # profile
             "description", "practice_areas", "honors", "work_experience",
             "associations", "education", "speaking_engagements", "publications",
@@ -94,8 +109,25 @@ class BusinessSerializer(serializers.ModelSerializer):
             "is_claimed", "has_pending_claim",
             "category_name", "category_full_slug", "url_path",
             "created_date", "updated_date",
+            "latitude", "longitude",  # from the ZIP (businesses/geo.py)
         ]
 
+    FIELD_COLUMNS = _LISTING_FIELD_COLUMNS
+    FIELDSETS = {
+        # search/category grids: no long profile text
+        "card": [
+            "id", "name", "slug", "url_path", "status",
+            "city", "state", "zip", "distance_km",
+            "practice_areas", "language",
+            "website", "phone", "email", "image_url",
+            "is_premium", "average_rating", "total_reviews",
+            "category_id", "category_name", "category_full_slug",
+            "is_claimed", "updated_at",
+        ],
+        "detail": [f for f in Meta.fields if f not in _ADMIN_ONLY_FIELDS],
+        "admin": list(Meta.fields),
+    }
+
     # --- convenience getters ---
     def get_is_claimed(self, obj: Business) -> bool:
         return bool(getattr(obj, "claimed_by_id", None))
@@ -132,9 +164,10 @@ class BusinessSerializer(serializers.ModelSerializer):
         return instance
 
 
-class DoctorSerializer(serializers.ModelSerializer):
+class DoctorSerializer(SparseFieldsetSerializer, serializers.ModelSerializer):
     """
-    Doctor vertical listing.
+    Doctor vertical listing. ?fields= / ?omit= select a subset
+    (presets: card, detail, admin).
     """
     category_id = serializers.IntegerField(required=False, allow_null=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
@@ -153,6 +186,9 @@ class DoctorSerializer(serializers.ModelSerializer):
     has_pending_claim = serializers.SerializerMethodField()
     url_path = serializers.SerializerMethodField()
 
+    # Only present on ?near= results
+    distance_km = serializers.FloatField(read_only=True)
+
     class Meta:
         model = Doctor
         fields = [
@@ -164,6 +200,7 @@ class DoctorSerializer(serializers.ModelSerializer):
             "description", "insurances", "popular_visit_reasons",
             # address
             "street_address", "city", "state", "zip",
+            "latitude", "longitude", "distance_km",
             # practice & education
             "practice_names", "educations",
             # misc
@@ -193,8 +230,24 @@ class DoctorSerializer(serializers.ModelSerializer):
             "is_claimed", "has_pending_claim",
             "category_name", "category_full_slug", "url_path",
             "created_date", "updated_date",
+            "latitude", "longitude",  # from the ZIP (businesses/geo.py)
         ]
 
+    FIELD_COLUMNS = _LISTING_FIELD_COLUMNS
+    FIELDSETS = {
+        "card": [
+            "id", "provider_name", "specialty", "slug", "url_path", "status",
+            "city", "state", "zip", "distance_km",
+            "languages", "gender",
+            "website", "phone", "email", "image_url",
+            "is_premium", "average_rating", "total_reviews",
+            "category_id", "category_name", "category_full_slug",
+            "is_claimed", "updated_at",
+        ],
+        "detail": [f for f in Meta.fields if f not in _ADMIN_ONLY_FIELDS],
+        "admin": list(Meta.fields),
+    }
+
     def get_is_claimed(self, obj: Doctor) -> bool:
         return bool(getattr(obj, "claimed_by_id", None))
 
@@ -222,14 +275,7 @@ class DoctorSerializer(serializers.ModelSerializer):
         if new_name and new_name != old_name:
             old_auto = slugify(old_name) if old_name else ""
             if instance.slug in (old_auto, f"{old_auto}-") or (instance.slug or "").startswith(f"{old_auto}-"):
-                base = slugify(new_name) or "doctor"
-                candidate = base
-                n = 1
-                Model = instance.__class__
-                while Model.objects.filter(slug=candidate).exclude(pk=instance.pk).exists():
-                    candidate = f"{base}-{n}"
-                    n += 1
-                validated_data["slug"] = candidate
+                validated_data["slug"] = _unique_slug_for(instance, new_name, "doctor")
 
         instance = super().update(instance, validated_data)
         instance.updated_at = now()
@@ -245,6 +291,7 @@ class UnifiedSearchItemSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
     slug = serializers.CharField()
+    category_id = serializers.IntegerField(allow_null=True, required=False)
     category_full_slug = serializers.CharField(allow_null=True, required=False)
     city = serializers.CharField(allow_null=True, required=False)
     state = serializers.CharField(allow_null=True, required=False)
@@ -252,3 +299,26 @@ class UnifiedSearchItemSerializer(serializers.Serializer):
     total_reviews = serializers.IntegerField()
     is_premium = serializers.BooleanField()
     image_url = serializers.CharField(allow_null=True, required=False)
+    distance_km = serializers.FloatField(required=False)  # ?near= only
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Status of a background import, polled by the bulk upload page."""
+    percent = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id", "kind", "operation", "input_format", "status", "chunk_size", "options",
+            "total_rows", "rows", "created", "updated", "skipped", "error_rows", "errors",
+            "percent", "checkpoint", "message", "created_by",
+            "created_at", "started_at", "heartbeat_at", "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_percent(self, obj):
+        if obj.status == "done":
+            return 100
+        if not obj.total_rows:
+            return None
+        return min(99, int(100 * obj.rows / obj.total_rows))
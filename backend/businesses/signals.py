@@ -2,8 +2,12 @@
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
-from .models import Business
+from .models import Business, Doctor
+from .facets import TOPIC_FIELDS, rating_bucket, refresh_facets
+from .featured import bump_featured
+from .tags import TAG_COLUMNS, sync_tags
 from .utils import recalc_category_counts
+from utils.edge import CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY, featured_key, listing_key, purge_keys
 
 # ✅ SEO auto-generator
 # - safe: wrapped in try/except so SEO hiccups never block writes
@@ -13,6 +17,44 @@ try:
 except Exception:  # pragma: no cover
     ensure_business_meta = None
 
+# Columns behind the facet rollups (see businesses/facets.py); the rating
+# is compared by bucket so a review nudging 4.2 -> 4.3 does no refresh
+FACET_COLUMNS = {
+    kind: ("category_id", "status", "state", "city", "is_premium", "average_rating", topic)
+    for kind, topic in TOPIC_FIELDS.items()
+}
+
+
+def _facet_key(values: tuple, kind: str) -> tuple:
+    return tuple(rating_bucket(v) if f == "average_rating" else v for f, v in zip(FACET_COLUMNS[kind], values))
+
+
+def _facet_values(obj, kind: str) -> tuple:
+    return _facet_key(tuple(getattr(obj, f) for f in FACET_COLUMNS[kind]), kind)
+
+
+def _tag_values(obj, kind: str) -> tuple:
+    return tuple(getattr(obj, f) for f in TAG_COLUMNS[kind])
+
+
+def _purge_edge(kind: str, instance, deleted: bool = False) -> None:
+    """
+    CDN keys a listing write makes stale (utils/edge.py). A delete is
+    handled like a create (no previous values): counts, 404s and the
+    sitemap are purged too.
+    """
+    def old(name):
+        return None if deleted else getattr(instance, f"_old_{name}", None)
+
+    keys = [listing_key(kind, instance.pk)]
+    if "active" in (instance.status, old("status")):
+        keys.append(featured_key(kind))
+    if old("status") != instance.status or old("category_id") != instance.category_id:
+        keys.append(CATEGORIES_KEY)
+    if old("slug") != instance.slug:
+        keys += [NOT_FOUND_KEY, SITEMAP_KEY]
+    purge_keys(*keys)
+
 
 @receiver(pre_save, sender=Business)
 def _business_pre_save(sender, instance: Business, **kwargs):
@@ -22,12 +64,21 @@ def _business_pre_save(sender, instance: Business, **kwargs):
             old = sender.objects.get(pk=instance.pk)
             instance._old_category_id = old.category_id
             instance._old_status = old.status
+            instance._old_slug = old.slug
+            instance._old_facets = _facet_values(old, "lawyer")
+            instance._old_tags = _tag_values(old, "lawyer")
         except sender.DoesNotExist:
             instance._old_category_id = None
             instance._old_status = None
+            instance._old_slug = None
+            instance._old_facets = None
+            instance._old_tags = None
     else:
         instance._old_category_id = None
         instance._old_status = None
+        instance._old_slug = None
+        instance._old_facets = None
+        instance._old_tags = None
 
 
 @receiver(post_save, sender=Business)
@@ -40,6 +91,21 @@ def _business_post_save(sender, instance: Business, created: bool, **kwargs):
         category_ids.add(getattr(instance, "_old_category_id", None))
     recalc_category_counts(category_ids)
 
+    # --- Featured cache: only active listings (now or before) can be featured ---
+    if "active" in (instance.status, getattr(instance, "_old_status", None)):
+        bump_featured("lawyer", category_ids)
+
+    # --- Facet rollups: only when a faceted column changed ---
+    if getattr(instance, "_old_facets", None) != _facet_values(instance, "lawyer"):
+        refresh_facets("lawyer", category_ids)
+
+    # --- Tag links: re-parse when a tagged text column changed ---
+    if getattr(instance, "_old_tags", None) != _tag_values(instance, "lawyer"):
+        sync_tags("lawyer", [(instance.pk, instance)])
+
+    # --- Edge cache: this listing's pages, plus featured / counts / 404s when affected ---
+    _purge_edge("lawyer", instance)
+
     # --- SEO meta: auto-create / refresh (new) ---
     # Safe: never blocks business saves if SEO has an issue
     if ensure_business_meta:
@@ -55,3 +121,42 @@ def _business_post_save(sender, instance: Business, created: bool, **kwargs):
 def _business_post_delete(sender, instance: Business, **kwargs):
     # Removing a business reduces the count of its category
     recalc_category_counts([instance.category_id])
+    if instance.status == "active":
+        bump_featured("lawyer", [instance.category_id])
+    refresh_facets("lawyer", [instance.category_id])
+    _purge_edge("lawyer", instance, deleted=True)
+
+
+@receiver(pre_save, sender=Doctor)
+def _doctor_pre_save(sender, instance: Doctor, **kwargs):
+    columns = (*FACET_COLUMNS["doctor"], *TAG_COLUMNS["doctor"], "slug")
+    old = sender.objects.filter(pk=instance.pk).values_list(*columns).first() if instance.pk else None
+    old = dict(zip(columns, old)) if old else {}
+    instance._old_category_id = old.get("category_id")
+    instance._old_status = old.get("status")
+    instance._old_slug = old.get("slug")
+    instance._old_facets = _facet_key(tuple(old[f] for f in FACET_COLUMNS["doctor"]), "doctor") if old else None
+    instance._old_tags = tuple(old[f] for f in TAG_COLUMNS["doctor"]) if old else None
+
+
+@receiver(post_save, sender=Doctor)
+def _doctor_post_save(sender, instance: Doctor, created: bool, **kwargs):
+    category_ids = {instance.category_id, instance._old_category_id}
+    if created or instance._old_category_id != instance.category_id or instance._old_status != instance.status:
+        recalc_category_counts(category_ids)
+    if "active" in (instance.status, instance._old_status):
+        bump_featured("doctor", category_ids)
+    if instance._old_facets != _facet_values(instance, "doctor"):
+        refresh_facets("doctor", category_ids)
+    if instance._old_tags != _tag_values(instance, "doctor"):
+        sync_tags("doctor", [(instance.pk, instance)])
+    _purge_edge("doctor", instance)
+
+
+@receiver(post_delete, sender=Doctor)
+def _doctor_post_delete(sender, instance: Doctor, **kwargs):
+    recalc_category_counts([instance.category_id])
+    if instance.status == "active":
+        bump_featured("doctor", [instance.category_id])
+    refresh_facets("doctor", [instance.category_id])
+    _purge_edge("doctor", instance, deleted=True)
@@ -0,0 +1,283 @@
+# businesses/slugs.py
+"""
+ListingSlug registry upkeep and lookups, and slug allocation.
+
+One row per slug a Business or Doctor has ever used. The current row is
+written by Model.save() (sync_listing_slug) and after bulk_create
+(register_listing_slugs); a renamed listing keeps its old rows with
+is_current=False so old URLs can 301. A slug has at most one row per
+vertical and is current for at most one listing: when a Business and a
+Doctor share a slug the Business keeps it (migration 0019 re-slugs such
+doctors, leaving their old slug as a redirect), matching the old
+Business-then-Doctor lookup order.
+
+New slugs are base, base-1, base-2, ... (first free), avoiding the
+model's own slugs and every registry slug, redirects included, so an old
+URL keeps pointing at the listing that left it. allocate_slug reads the
+whole base-N family in one query; allocate_slugs does a batch at once.
+"""
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Substr
+from django.utils.text import slugify
+
+from .models import Business, Doctor, ListingSlug
+
+log = logging.getLogger(__name__)
+
+KIND_BY_MODEL = {Business: "lawyer", Doctor: "doctor"}
+FK_BY_KIND = {"lawyer": "business", "doctor": "doctor"}
+
+# Only saves touching these change the registry row
+_TRACKED_FIELDS = {"slug", "category", "category_id"}
+
+SLUG_RETRIES = 3
+_MAX_BASE_LEN = 240  # leaves room for "-N" within the 255-char slug column
+_FAMILY_QUERY_BATCH = 500
+
+
+def _kind(instance_or_model) -> str:
+    model = instance_or_model if isinstance(instance_or_model, type) else type(instance_or_model)
+    return KIND_BY_MODEL[model._meta.concrete_model]
+
+
+# ---- Slug allocation ----
+def slug_base(name, fallback: str) -> str:
+    return (slugify(name or "") or fallback)[:_MAX_BASE_LEN].strip("-") or fallback
+
+
+def _family_q(bases) -> Q:
+    """
+    `base` itself or anything starting with `base-`, for each base. A plain
+    prefix LIKE, so PostgreSQL serves it from the varchar_pattern_ops
+    "<column>_like" index it keeps next to every unique / db_index slug
+    column; _in_family() drops the non-numeric suffixes afterwards.
+    """
+    q = Q()
+    for base in bases:
+        q |= Q(slug=base) | Q(slug__startswith=f"{base}-")
+    return q
+
+
+def _in_family(slug: str, bases: set[str]) -> bool:
+    base, sep, n = slug.rpartition("-")
+    return slug in bases or (bool(sep) and n.isdigit() and base in bases)
+
+
+def taken_slugs(model, bases, exclude=None) -> set[str]:
+    """
+    Slugs in the base / base-N families of `bases` that `model` rows use or
+    that the registry holds (either vertical, current or redirect),
+    excluding `exclude`'s own. One query per _FAMILY_QUERY_BATCH bases.
+    """
+    bases = sorted(set(bases))
+    taken = set()
+    for i in range(0, len(bases), _FAMILY_QUERY_BATCH):
+        batch = bases[i:i + _FAMILY_QUERY_BATCH]
+        q = _family_q(batch)
+        rows = model.objects.filter(q)
+        registered = ListingSlug.objects.filter(q)
+        if exclude is not None and exclude.pk:
+            rows = rows.exclude(pk=exclude.pk)
+            registered = registered.exclude(**{FK_BY_KIND[_kind(exclude)]: exclude.pk})
+        found = (
+            rows.order_by().values_list("slug", flat=True)
+            .union(registered.order_by().values_list("slug", flat=True))
+        )
+        batch = set(batch)
+        taken.update(slug for slug in found if _in_family(slug, batch))
+    return taken
+
+
+def _next_free(base: str, taken: set[str]) -> str:
+    if base not in taken:
+        return base
+    n = 1
+    while f"{base}-{n}" in taken:
+        n += 1
+    return f"{base}-{n}"
+
+
+def allocate_slug(instance, name, fallback: str) -> str:
+    """First free slug for `name` (base, base-1, base-2, ...) in one query."""
+    base = slug_base(name, fallback)
+    return _next_free(base, taken_slugs(type(instance), [base], exclude=instance))
+
+
+def allocate_slugs(model, names, fallback: str) -> list[str]:
+    """allocate_slug for a whole batch of new listings (distinct within the batch)."""
+    bases = [slug_base(name, fallback) for name in names]
+    taken = taken_slugs(model, bases)
+    slugs = []
+    for base in bases:
+        slug = _next_free(base, taken)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def save_with_slug(instance, name, fallback: str, save) -> None:
+    """
+    Allocate instance.slug and run save(); if a concurrent save took the
+    slug first (unique violation), allocate again, up to SLUG_RETRIES times.
+    """
+    for attempt in range(SLUG_RETRIES):
+        instance.slug = allocate_slug(instance, name, fallback)
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            lost_race = (
+                type(instance).objects.filter(slug=instance.slug).exclude(pk=instance.pk).exists()
+            )
+            if not lost_race or attempt == SLUG_RETRIES - 1:
+                raise
+            log.info("slug %r taken concurrently, retrying", instance.slug)
+
+
+def insert_with_slugs(model, objs, names, fallback: str) -> list[tuple[int, str]]:
+    """
+    copy_insert `objs` with slugs allocated for the whole batch. Rows that
+    lose a slug to a concurrent insert get a fresh one and are retried, up
+    to SLUG_RETRIES times. Returns [(id, slug), ...] of inserted rows.
+    """
+    from .copyload import copy_insert
+
+    pending = list(zip(objs, names))
+    inserted = []
+    for _ in range(SLUG_RETRIES):
+        slugs = allocate_slugs(model, [name for _, name in pending], fallback)
+        for (obj, _), slug in zip(pending, slugs):
+            obj.slug = slug
+        rows = copy_insert(model, [obj for obj, _ in pending])
+        inserted.extend(rows)
+        done = {slug for _, slug in rows}
+        pending = [(obj, name) for obj, name in pending if obj.slug not in done]
+        if not pending:
+            break
+    return inserted
+
+
+def _category_path(instance) -> str:
+    if not instance.category_id:
+        return ""
+    cat = instance.category
+    return cat.full_slug if cat else ""
+
+
+def sync_listing_slug(instance, update_fields=None) -> None:
+    """
+    Make instance.slug the listing's current registry entry (called after
+    save). A previous current slug is demoted to a redirect; a slug another
+    listing currently holds is left alone.
+    """
+    if not instance.slug:
+        return
+    if update_fields is not None and not (set(update_fields) & _TRACKED_FIELDS):
+        return
+
+    kind = _kind(instance)
+    fk = FK_BY_KIND[kind]
+    path = _category_path(instance)
+    try:
+        with transaction.atomic():
+            ListingSlug.objects.filter(**{fk: instance.pk}, is_current=True).exclude(
+                slug=instance.slug
+            ).update(is_current=False)
+
+            rows = list(ListingSlug.objects.select_for_update().filter(slug=instance.slug))
+            holder = next((r for r in rows if r.is_current), None)
+            if holder is not None and (holder.kind != kind or getattr(holder, f"{fk}_id") != instance.pk):
+                log.warning("slug %r already registered to %s %s", instance.slug, holder.kind,
+                            holder.business_id or holder.doctor_id)
+                return
+            entry = next((r for r in rows if r.kind == kind), None)
+            if entry is None:
+                ListingSlug.objects.create(
+                    slug=instance.slug, kind=kind, category_full_slug=path,
+                    **{fk: instance},
+                )
+            else:
+                # ours (maybe a slug we are renaming back to), or a stale redirect of this vertical
+                setattr(entry, f"{fk}_id", instance.pk)
+                entry.category_full_slug = path
+                entry.is_current = True
+                entry.save()
+    except IntegrityError:
+        log.warning("could not register slug %r", instance.slug, exc_info=True)
+
+
+def register_listing_slugs(model, slugs) -> None:
+    """Registry rows for listings just inserted by bulk_create (looked up by slug)."""
+    kind = _kind(model)
+    fk = FK_BY_KIND[kind]
+    chunk = 5000
+    slugs = list(slugs)
+    for i in range(0, len(slugs), chunk):
+        rows = (
+            model.objects.filter(slug__in=slugs[i:i + chunk])
+            .values_list("id", "slug", "category__full_slug")
+        )
+        ListingSlug.objects.bulk_create(
+            [
+                ListingSlug(slug=slug, kind=kind, category_full_slug=path or "", **{f"{fk}_id": pk})
+                for pk, slug, path in rows
+            ],
+            ignore_conflicts=True,
+            batch_size=chunk,
+        )
+
+
+def refresh_listing_paths(model, category, ids=None) -> int:
+    """
+    Re-copy `category`'s path into the registry after a queryset
+    .update(category=...); `ids` limits it to the listings just moved.
+    """
+    fk = FK_BY_KIND[_kind(model)]
+    lookup = {f"{fk}__category_id": category.id}
+    if ids is not None:
+        lookup[f"{fk}_id__in"] = ids
+    return (
+        ListingSlug.objects
+        .filter(**lookup)
+        .exclude(category_full_slug=category.full_slug)
+        .update(category_full_slug=category.full_slug)
+    )
+
+
+def rebase_category_paths(old_full_slug: str, new_full_slug: str) -> None:
+    """A category (and so its subtree) moved: rewrite stored path prefixes."""
+    ListingSlug.objects.filter(category_full_slug=old_full_slug).update(
+        category_full_slug=new_full_slug
+    )
+    ListingSlug.objects.filter(category_full_slug__startswith=f"{old_full_slug}/").update(
+        category_full_slug=Concat(
+            Value(new_full_slug), Substr("category_full_slug", len(old_full_slug) + 1)
+        )
+    )
+
+
+def lookup_slug(slug: str, kind: str | None = None) -> ListingSlug | None:
+    """
+    The registry row of `slug` (of `kind`, if given); one index hit, with
+    the listing and its category joined in.
+    """
+    rows = ListingSlug.objects.select_related("business__category", "doctor__category").filter(slug=slug)
+    if kind:
+        return rows.filter(kind=kind).first()  # unique (slug, kind)
+    # only migration 0019 left slugs in both verticals: the current row wins
+    return rows.order_by("-is_current").first()
+
+
+def current_entry(entry: ListingSlug) -> ListingSlug | None:
+    """The current registry row of the listing `entry` belongs to."""
+    if entry.is_current:
+        return entry
+    fk = FK_BY_KIND[entry.kind]
+    return ListingSlug.objects.filter(
+        **{fk: getattr(entry, f"{fk}_id")}, is_current=True
+    ).first()
+
@@ -0,0 +1,168 @@
+# businesses/tags.py
+"""
+Normalized tags for the free-text list columns.
+
+Business.practice_areas / language / associations and Doctor.languages
+hold comma-separated text for display. Each value is also parsed into
+canonical Tag rows (one per kind + slug, so "Personal Injury",
+"personal  injury" and "PERSONAL-INJURY" are the same tag) linked through
+BusinessTag / DoctorTag. sync_tags() rewrites the links of a batch of
+listings with a handful of queries; it runs from the listing signals, the
+import chunks and bulk_create; backfill_tags() fills existing rows (run
+by migration 0022 and `manage.py backfill_tags`).
+
+The practice_areas / language / languages / associations / tags filters
+(see tag_filter) select listings by tag id through the link tables'
+(tag, listing) index instead of scanning the text columns.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils.text import slugify
+
+from .models import Business, BusinessTag, Doctor, DoctorTag, Tag
+
+# Text column parsed into each tag kind, per vertical
+TAG_SOURCES = {
+    "lawyer": {"practice_area": "practice_areas", "language": "language", "association": "associations"},
+    "doctor": {"language": "languages"},
+}
+TAG_LINKS = {
+    "lawyer": (Business, BusinessTag, "business_id"),
+    "doctor": (Doctor, DoctorTag, "doctor_id"),
+}
+TAG_COLUMNS = {kind: tuple(sources.values()) for kind, sources in TAG_SOURCES.items()}
+
+_SPLIT_RE = re.compile(r"[,;|\n]+")
+_NAME_MAX = Tag._meta.get_field("name").max_length
+
+
+def parse_tags(value) -> dict[str, str]:
+    """{slug: display name} for a comma/semicolon/pipe/newline separated list."""
+    tags = {}
+    for part in _SPLIT_RE.split(str(value or "")):
+        name = " ".join(part.split())[:_NAME_MAX]
+        # ASCII-fold ("Français" == "francais"); keep non-Latin names as unicode slugs
+        slug = (slugify(name) or slugify(name, allow_unicode=True))[:_NAME_MAX]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+def canonical_slugs(value) -> list[str]:
+    return list(parse_tags(value))
+
+
+def _tag_models(kind: str, apps):
+    """(listing, link model, fk, Tag) from `apps` (a migration's historical models)."""
+    model, link_model, fk = TAG_LINKS[kind]
+    if apps is None:
+        return model, link_model, fk, Tag
+    return (
+        apps.get_model("businesses", model.__name__),
+        apps.get_model("businesses", link_model.__name__),
+        fk,
+        apps.get_model("businesses", "Tag"),
+    )
+
+
+def _tag_ids(wanted: dict[tuple[str, str], str], tag_model=Tag) -> dict[tuple[str, str], int]:
+    """{(kind, slug): id} for `wanted` ({(kind, slug): name}), creating missing tags."""
+    if not wanted:
+        return {}
+
+    def lookup():
+        found = {}
+        for kind in {k for k, _ in wanted}:
+            slugs = [s for k, s in wanted if k == kind]
+            for tag_id, slug in tag_model.objects.filter(kind=kind, slug__in=slugs).values_list("id", "slug"):
+                found[(kind, slug)] = tag_id
+        return found
+
+    found = lookup()
+    missing = [tag_model(kind=k, slug=s, name=wanted[(k, s)]) for k, s in wanted if (k, s) not in found]
+    if missing:
+        # ignore_conflicts: a concurrent writer may create the same tag
+        tag_model.objects.bulk_create(missing, ignore_conflicts=True, batch_size=1000)
+        found = lookup()
+    return found
+
+
+def sync_tags(kind: str, listings, *, apps=None) -> int:
+    """
+    Rewrite the tag links of `listings` ((listing id, obj) pairs; obj
+    carries the TAG_COLUMNS of `kind`). Returns the number of links written.
+    """
+    _, link_model, fk, tag_model = _tag_models(kind, apps)
+    parsed, wanted = {}, {}
+    for listing_id, obj in listings:
+        keys = set()
+        for tag_kind, column in TAG_SOURCES[kind].items():
+            for slug, name in parse_tags(getattr(obj, column, None)).items():
+                keys.add((tag_kind, slug))
+                wanted.setdefault((tag_kind, slug), name)
+        parsed[listing_id] = keys
+    if not parsed:
+        return 0
+
+    ids = _tag_ids(wanted, tag_model)
+    link_model.objects.filter(**{f"{fk}__in": list(parsed)}).delete()
+    links = [
+        link_model(**{fk: listing_id, "tag_id": ids[key]})
+        for listing_id, keys in parsed.items() for key in keys if key in ids
+    ]
+    link_model.objects.bulk_create(links, batch_size=2000)
+    return len(links)
+
+
+def backfill_tags(kind: str, batch_size: int = 2000, *, apps=None) -> tuple[int, int]:
+    """
+    sync_tags over every listing of `kind`, `batch_size` listings per
+    transaction. Returns (listings, links written).
+    """
+    model = _tag_models(kind, apps)[0]
+    listings = links = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(id__gt=last_id).order_by("id")
+            .only("id", *TAG_COLUMNS[kind])[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic():
+            links += sync_tags(kind, ((row.id, row) for row in rows), apps=apps)
+        listings += len(rows)
+        last_id = rows[-1].id
+    return listings, links
+
+
+def sync_inserted_tags(kind: str, objs, rows) -> int:
+    """sync_tags for freshly inserted `objs`; rows = [(id, slug)] from insert_with_slugs."""
+    by_slug = {obj.slug: obj for obj in objs}
+    return sync_tags(kind, ((pk, by_slug[slug]) for pk, slug in rows if slug in by_slug))
+
+
+# -------------------- Filters --------------------
+def tag_filter(queryset, kind: str, tag_kind: str | None, values, match_all: bool = False):
+    """
+    Restrict `queryset` (listings of `kind`) to rows tagged with any (or,
+    with match_all, every) tag in `values`: tag names/slugs of `tag_kind`,
+    or tag ids when tag_kind is None. One semi-join on the link table.
+    """
+    _, link_model, fk = TAG_LINKS[kind]
+    if tag_kind is None:
+        ids = set(Tag.objects.filter(id__in=values).values_list("id", flat=True))
+        wanted = len(set(values))
+    else:
+        slugs = {slug for value in values for slug in canonical_slugs(value)}
+        ids = set(Tag.objects.filter(kind=tag_kind, slug__in=slugs).values_list("id", flat=True))
+        wanted = len(slugs)
+    if not ids or (match_all and len(ids) < wanted):
+        return queryset.none()
+
+    links = link_model.objects.filter(tag_id__in=ids)
+    if match_all and len(ids) > 1:
+        links = links.values(fk).annotate(n=Count("tag_id")).filter(n=len(ids))
+    return queryset.filter(id__in=links.values(fk))
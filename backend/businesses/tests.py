@@ -0,0 +1,961 @@
+import gzip
+import io
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from categories.models import Category
+from categories.tree import CategoryTrie
+from reviews.models import Review
+from businesses.facets import facet_counts
+from businesses.featured import bump_featured
+from businesses.imports import ImportInterrupted, check_lease, import_rows
+from businesses.jobs import enqueue_import, run_job
+from businesses.locks import IMPORT_LOCK, acquire_lock, release_lock, renew_lock
+from businesses.models import Business, Doctor, FacetRollup, ImportJob, JobLock, ListingSlug, Tag
+from businesses.pagination import (
+    decode_cursor, decode_position, encode_cursor, encode_position, keyset_after, row_key, sort_key,
+)
+from businesses.serializers import BusinessSerializer
+from businesses.slugs import allocate_slug, allocate_slugs
+from businesses.tags import parse_tags
+from businesses.trigram import similarity, word_similarity
+from utils.cache import bump_versions, model_versions, response_key
+from utils.compression import accepted_encodings, brotli
+from utils.edge import purge_backend
+from utils.renderers import FastJSONRenderer
+
+
+class ListingTestCase(APITestCase):
+    """Two categories and a few listings of each vertical with tied sort keys."""
+
+    def setUp(self):
+        cache.clear()
+        self.law = Category.objects.create(name="Lawyers")
+        self.med = Category.objects.create(name="Doctors")
+        Business.objects.bulk_create([
+            Business(name=f"Firm {i}", slug=f"firm-{i}", status="active", category=self.law,
+                     city="Austin", state="TX", average_rating=i % 3)
+            for i in range(7)
+        ])
+        Doctor.objects.bulk_create([
+            Doctor(provider_name=f"Doc {i}", slug=f"doc-{i}", status="active", category=self.med,
+                   city="Austin", state="TX", average_rating=i % 2)
+            for i in range(5)
+        ])
+        # one shared updated_at and rank_score: only (type, id) separates rows
+        self.stamp = timezone.now().replace(microsecond=0)
+        for model in (Business, Doctor):
+            model.objects.update(updated_at=self.stamp, rank_score=1.0)
+
+    def all_keys(self):
+        return sorted(
+            [("lawyer", pk) for pk in Business.objects.values_list("id", flat=True)]
+            + [("doctor", pk) for pk in Doctor.objects.values_list("id", flat=True)]
+        )
+
+
+class CursorTests(ListingTestCase):
+    def test_cursor_round_trip(self):
+        key = [0.5, 2.0, self.stamp, "lawyer", 7]
+        self.assertEqual(decode_cursor(encode_cursor(key)), key)
+
+    def test_invalid_cursors_rejected(self):
+        for token in ["", "not-a-cursor", encode_cursor([1, 2, 3]), encode_cursor([0, 0, "x", "lawyer", 1])]:
+            with self.assertRaises(ValueError):
+                decode_cursor(token)
+        r = self.client.get("/api/unified_search/", {"cursor": "garbage"})
+        self.assertEqual(r.status_code, 400)
+
+    def test_keyset_after_breaks_ties_on_type_then_id(self):
+        first = Business.objects.order_by("id").first()
+        cursor = row_key("lawyer", first, ranked=False)
+        after_lawyers = Business.objects.filter(keyset_after("lawyer", cursor, False))
+        self.assertEqual(
+            list(after_lawyers.values_list("id", flat=True).order_by("id")),
+            list(Business.objects.filter(id__gt=first.id).values_list("id", flat=True).order_by("id")),
+        )
+        # "doctor" < "lawyer": every equal-keyed doctor sorts before the cursor
+        self.assertFalse(Doctor.objects.filter(keyset_after("doctor", cursor, False)).exists())
+        doc_cursor = row_key("doctor", Doctor.objects.order_by("-id").first(), ranked=False)
+        self.assertEqual(Business.objects.filter(keyset_after("lawyer", doc_cursor, False)).count(), 7)
+
+    def test_sort_key_orders_rank_then_type_then_id(self):
+        keys = [
+            [0.0, 1.0, self.stamp, "lawyer", 1],
+            [0.0, 1.0, self.stamp, "doctor", 2],
+            [1.0, 0.0, self.stamp, "lawyer", 3],
+            [0.0, 1.0, self.stamp + timedelta(seconds=1), "lawyer", 4],
+        ]
+        self.assertEqual([k[4] for k in sorted(keys, key=sort_key)], [3, 4, 2, 1])
+
+    def test_unified_search_cursor_merges_verticals(self):
+        seen, token, pages = [], "", 0
+        while True:
+            r = self.client.get("/api/unified_search/", {"cursor": token, "limit": 5})
+            self.assertEqual(r.status_code, 200)
+            seen += [(item["type"], item["data"]["id"]) for item in r.data["items"]]
+            pages += 1
+            token = r.data["next_cursor"]
+            if not token:
+                break
+        self.assertEqual(pages, 3)
+        # all keys tie except (type, id): doctors first, then lawyers, each by id
+        self.assertEqual(seen, self.all_keys())
+        offset = self.client.get("/api/unified_search/", {"limit": 100})
+        self.assertEqual([(i["type"], i["data"]["id"]) for i in offset.data["items"]], seen)
+
+    def test_offset_paging_validates_and_caps(self):
+        for params in ({"limit": "abc"}, {"offset": "x"}, {"offset": 100000}):
+            self.assertEqual(self.client.get("/api/unified_search/", params).status_code, 400)
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/unified_search/", {"limit": 100000})
+        self.assertEqual((r.status_code, len(r.data["items"])), (200, 12))
+        self.assertFalse([q for q in ctx.captured_queries if "LIMIT 100000" in q["sql"]])
+        r = self.client.get("/api/unified_search/", {"limit": 0, "offset": -5})
+        self.assertEqual(len(r.data["items"]), 1)
+
+
+class DirectorySearchTests(ListingTestCase):
+    def test_union_columns_line_up(self):
+        r = self.client.get("/api/directory/search/", {"limit": 100})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["count"], 12)
+        self.assertFalse(r.data["count_approximate"])
+        by_key = {(row["type"], row["id"]): row for row in r.data["results"]}
+        self.assertEqual(sorted(by_key), self.all_keys())
+        doc = Doctor.objects.get(slug="doc-3")
+        row = by_key[("doctor", doc.id)]
+        self.assertEqual((row["name"], row["slug"], row["category_full_slug"]), ("Doc 3", "doc-3", "Doctors"))
+        firm = Business.objects.get(slug="firm-2")
+        row = by_key[("lawyer", firm.id)]
+        self.assertEqual((row["name"], row["category_full_slug"], float(row["average_rating"])), ("Firm 2", "Lawyers", 2.0))
+
+    def test_paging_covers_every_row_once(self):
+        seen, offset = [], 0
+        while True:
+            r = self.client.get("/api/directory/search/", {"limit": 5, "offset": offset, "ordering": "name"})
+            self.assertEqual(r.data["count"], 12)
+            seen += [(row["type"], row["id"]) for row in r.data["results"]]
+            if not r.data["next"]:
+                break
+            offset += 5
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(sorted(seen), self.all_keys())
+
+    def test_ordering_spans_both_verticals(self):
+        r = self.client.get("/api/directory/search/", {"limit": 100, "ordering": "name"})
+        names = [row["name"] for row in r.data["results"]]
+        self.assertEqual(names, sorted(names))
+
+    def test_page_numbers_and_past_the_end(self):
+        r = self.client.get("/api/directory/search/", {"page": 3, "page_size": 5})
+        self.assertEqual(len(r.data["results"]), 2)
+        self.assertIsNone(r.data["next"])
+        self.assertIsNotNone(r.data["previous"])
+        r = self.client.get("/api/directory/search/", {"limit": 5, "offset": 50})
+        self.assertEqual((r.data["results"], r.data["count"]), ([], 12))
+
+    def test_type_and_bad_params(self):
+        r = self.client.get("/api/directory/search/", {"type": "doctor"})
+        self.assertEqual({row["type"] for row in r.data["results"]}, {"doctor"})
+        self.assertEqual(self.client.get("/api/directory/search/", {"type": "vet"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/directory/search/", {"limit": "x"}).status_code, 400)
+
+
+class ListingCursorTests(ListingTestCase):
+    def test_position_round_trip(self):
+        values = [3.5, self.stamp, "x", 9]
+        self.assertEqual(decode_position(encode_position(values, reverse=True)), (values, True))
+
+    def test_invalid_position_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_position("%%%")
+        r = self.client.get("/api/businesses/", {"cursor": "garbage"})
+        self.assertEqual(r.status_code, 404)
+
+    def walk(self, params):
+        ids, token = [], ""
+        while True:
+            r = self.client.get("/api/businesses/", {**params, "cursor": token, "limit": 2})
+            self.assertEqual(r.status_code, 200)
+            self.assertNotIn("count", r.data)
+            ids += [row["id"] for row in r.data["results"]]
+            if not r.data["next"]:
+                return ids, r.data
+            token = r.data["next"].split("cursor=")[1].split("&")[0]
+
+    def test_listing_cursor_mixed_direction_ordering(self):
+        ids, last = self.walk({"ordering": "-average_rating,id"})
+        expected = list(Business.objects.order_by("-average_rating", "id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+        ids, _ = self.walk({"ordering": "average_rating,-updated_at"})
+        expected = list(Business.objects.order_by("average_rating", "-updated_at", "id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+        # the previous link of the last page walks back to the page before it
+        token = last["previous"].split("cursor=")[1].split("&")[0]
+        back = self.client.get("/api/businesses/", {"ordering": "-average_rating,id", "cursor": token, "limit": 2})
+        expected = list(Business.objects.order_by("-average_rating", "id").values_list("id", flat=True))
+        self.assertEqual([row["id"] for row in back.data["results"]], expected[4:6])
+
+
+class StreamingImportTests(APITestCase):
+    def setUp(self):
+        self.cat = Category.objects.create(name="Lawyers")
+        admin = get_user_model().objects.create_superuser(username="admin", email="a@example.com", password="x")
+        self.client.force_authenticate(admin)
+
+    def post(self, lines, chunk_size=3):
+        body = ("\n".join(lines) + "\n").encode()
+        return self.client.post(
+            f"/api/businesses/import/?chunk_size={chunk_size}", data=body, content_type="application/x-ndjson",
+        )
+
+    def rows(self, n):
+        return [json.dumps({"name": f"Imp {i}", "category_id": self.cat.id}) for i in range(n)]
+
+    def test_reports_each_chunk_and_bad_rows(self):
+        lines = self.rows(5)
+        lines.insert(1, "{bad json")
+        lines.insert(3, json.dumps({"category_id": self.cat.id}))
+        r = self.post(lines)
+        self.assertEqual(r["Content-Type"], "application/x-ndjson")
+        out = [json.loads(line) for line in b"".join(r.streaming_content).decode().splitlines()]
+        self.assertEqual([o.get("chunk") for o in out], [1, 2, 3, None])
+        self.assertEqual([e["row"] for o in out[:-1] for e in o["errors"]], [2, 4])
+        self.assertEqual(out[-1], {"done": True, "rows": 7, "created": 5, "updated": 0, "skipped": 0, "error_rows": 2})
+        self.assertEqual(ListingSlug.objects.filter(business__name__startswith="Imp ").count(), 5)
+        self.assertEqual(JobLock.objects.get(name=IMPORT_LOCK).owner, "")  # released
+
+    def test_stream_stops_when_lease_lost(self):
+        stream = iter(self.post(self.rows(9)).streaming_content)
+        first = json.loads(next(stream))
+        self.assertEqual(first["created"], 3)
+        JobLock.objects.filter(name=IMPORT_LOCK).update(owner="other")
+        rest = [json.loads(line) for line in b"".join(stream).decode().splitlines()]
+        self.assertEqual(rest[-1]["done"], False)
+        self.assertEqual(Business.objects.filter(name__startswith="Imp ").count(), 3)
+        self.assertEqual(JobLock.objects.get(name=IMPORT_LOCK).owner, "other")
+
+    def test_check_lease_raises_once_lost(self):
+        acquire_lock(IMPORT_LOCK, "a")
+        check_lease("a")
+        with self.assertRaises(ImportInterrupted):
+            check_lease("b")
+
+
+class JobLockTests(APITestCase):
+    def test_acquire_renew_release(self):
+        self.assertTrue(acquire_lock("t", "a"))
+        self.assertTrue(acquire_lock("t", "a"))  # re-entrant for the holder
+        self.assertFalse(acquire_lock("t", "b"))
+        self.assertTrue(renew_lock("t", "a"))
+        self.assertFalse(renew_lock("t", "b"))
+        release_lock("t", "a")
+        self.assertTrue(acquire_lock("t", "b"))
+
+    def test_expired_lease_is_taken_over(self):
+        self.assertTrue(acquire_lock("t", "a", ttl=60))
+        JobLock.objects.filter(name="t").update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(acquire_lock("t", "b"))
+        self.assertFalse(renew_lock("t", "a"))
+        release_lock("t", "a")  # no-op: not the holder
+        self.assertEqual(JobLock.objects.get(name="t").owner, "b")
+
+
+class ImportJobTests(APITestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.cat = Category.objects.create(name="Lawyers")
+
+    def enqueue(self, n, chunk_size=2):
+        body = "".join(
+            json.dumps({"name": f"Job Firm {i}", "license": f"J-{i}", "category_id": self.cat.id}) + "\n"
+            for i in range(1, n + 1)
+        ).encode()
+        return enqueue_import("lawyer", "ndjson", io.BytesIO(body), chunk_size=chunk_size)
+
+    def test_job_runs_to_done(self):
+        job = self.enqueue(5)
+        acquire_lock(IMPORT_LOCK, "w")
+        run_job(job, "w")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.created, job.rows, job.checkpoint), ("done", 5, 5, 5))
+
+    def test_job_resumes_after_checkpoint(self):
+        job = self.enqueue(5)
+        # a dead worker committed the first chunk (lines 1-2) and left the job running
+        Business.objects.create(name="Job Firm 1", license="J-1", category=self.cat)
+        Business.objects.create(name="Job Firm 2", license="J-2", category=self.cat)
+        ImportJob.objects.filter(pk=job.pk).update(status="running", worker="dead", checkpoint=2, rows=2, created=2)
+
+        acquire_lock(IMPORT_LOCK, "w")
+        run_job(job, "w")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.checkpoint, job.rows, job.created), ("done", 5, 5, 5))
+        self.assertEqual(Business.objects.filter(name__startswith="Job Firm").count(), 5)
+
+    def test_job_stops_when_lease_lost(self):
+        job = self.enqueue(5)
+        acquire_lock(IMPORT_LOCK, "other")  # "w" never holds the lease
+        run_job(job, "w")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.checkpoint), ("running", 0))
+        self.assertFalse(Business.objects.filter(name__startswith="Job Firm").exists())
+
+
+class UpsertTests(APITestCase):
+    def setUp(self):
+        self.cat = Category.objects.create(name="Lawyers")
+
+    def run_import(self, rows, mode="upsert", key=None):
+        records = [(n, {"category_id": self.cat.id, **row}, None) for n, row in enumerate(rows, 1)]
+        reports = list(import_rows("lawyer", records, BusinessSerializer, mode=mode, key=key))
+        self.assertEqual(reports[-1]["error_rows"], 0, reports)
+        return reports[-1]
+
+    def test_license_match_updates_changed_fields_only(self):
+        self.run_import([{"name": "Acme Law", "license": "L-1", "city": "Austin"}], mode="insert")
+        biz = Business.objects.get(license="L-1")
+        Business.objects.filter(pk=biz.pk).update(status="active", phone="555")
+
+        totals = self.run_import([{"name": "Acme Law", "license": "L-1", "city": "Dallas"}])
+        self.assertEqual((totals["created"], totals["updated"], totals["skipped"]), (0, 1, 0))
+        biz.refresh_from_db()
+        self.assertEqual((biz.city, biz.phone, biz.status), ("Dallas", "555", "active"))
+
+        totals = self.run_import([{"name": "Acme Law", "license": "L-1", "city": "Dallas"}])
+        self.assertEqual((totals["created"], totals["updated"], totals["skipped"]), (0, 0, 1))
+
+    def test_protected_fields_are_not_overwritten(self):
+        self.run_import([{"name": "Acme Law", "license": "L-1"}], mode="insert")
+        Business.objects.filter(license="L-1").update(status="active")
+        self.run_import([{"name": "Acme Law", "license": "L-1", "status": "pending"}])
+        self.assertEqual(Business.objects.get(license="L-1").status, "active")
+
+    def test_address_match_normalizes_name_street_and_zip(self):
+        self.run_import([{"name": "Smith & Co", "street_address": "1 Main St.", "zip": "78701-1234"}], mode="insert")
+        totals = self.run_import(
+            [{"name": "smith  co", "street_address": "1 main st", "zip": "78701", "city": "Austin"}],
+            key="address",
+        )
+        self.assertEqual((totals["created"], totals["updated"]), (0, 1))
+        self.assertEqual(Business.objects.get().city, "Austin")
+
+    def test_identifier_wins_over_address(self):
+        self.run_import([
+            {"name": "Acme Law", "license": "L-1", "street_address": "1 Main", "zip": "78701"},
+            {"name": "Other Firm", "license": "L-2", "street_address": "9 Elm", "zip": "78702"},
+        ], mode="insert")
+        # same name/address as L-1, but the license says it is L-2
+        totals = self.run_import([
+            {"name": "Acme Law", "license": "L-2", "street_address": "1 Main", "zip": "78701"},
+        ])
+        self.assertEqual((totals["created"], totals["updated"]), (0, 1))
+        self.assertEqual(Business.objects.get(license="L-2").name, "Acme Law")
+        self.assertEqual(Business.objects.get(license="L-1").name, "Acme Law")
+
+    def test_unmatched_rows_insert_and_repeats_collapse(self):
+        totals = self.run_import([
+            {"name": "New Firm", "license": "N-1", "city": "Austin"},
+            {"name": "New Firm", "license": "N-1", "city": "Dallas"},
+        ])
+        self.assertEqual((totals["created"], totals["skipped"]), (1, 1))
+        self.assertEqual(Business.objects.get(license="N-1").city, "Dallas")
+
+
+class FulltextSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        for name, extra in [
+            ("Beta Firm", {"description": "We handle tax audits"}),
+            ("Alpha Firm", {"practice_areas": "Tax, Estate"}),
+            ("Tax Partners", {}),
+            ("Tax", {}),
+            ("Unrelated", {"description": "family law"}),
+        ]:
+            Business.objects.create(name=name, status="active", category=self.cat, **extra)
+
+    def names(self, **params):
+        r = self.client.get("/api/businesses/", params)
+        self.assertEqual(r.status_code, 200)
+        return [row["name"] for row in r.data["results"]]
+
+    def test_rank_follows_field_weights_and_name_boosts(self):
+        self.assertEqual(self.names(q="tax"), ["Tax", "Tax Partners", "Alpha Firm", "Beta Firm"])
+
+    def test_index_follows_saves(self):
+        biz = Business.objects.get(name="Unrelated")
+        biz.description = "tax disputes"
+        biz.save()
+        self.assertIn("Unrelated", self.names(q="disputes"))
+        self.assertEqual(self.names(q="family"), [])
+
+    def test_category_name_matches(self):
+        estate = Category.objects.create(name="Estate Planning")
+        Business.objects.create(name="Will Writers", status="active", category=estate)
+        r = self.client.get("/api/unified_search/", {"q": "planning"})
+        self.assertEqual([item["data"]["name"] for item in r.data["items"]], ["Will Writers"])
+
+
+class FuzzySearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        Business.objects.create(name="John Smith", status="active", category=self.cat)
+        Business.objects.create(name="Jane Doe Legal", status="active", category=self.cat)
+
+    def names(self, q):
+        r = self.client.get("/api/businesses/", {"q": q, "fuzzy": 1})
+        return [row["name"] for row in r.data["results"]]
+
+    def test_word_similarity_matches_pg_trgm(self):
+        self.assertAlmostEqual(similarity("word", "two words"), 4 / 11)
+        self.assertAlmostEqual(word_similarity("word", "two words"), 0.8)
+
+    def test_typo_in_one_word_of_a_name(self):
+        self.assertEqual(self.names("smiht"), ["John Smith"])
+        self.assertEqual(self.names("jonh"), ["John Smith"])
+        self.assertEqual(self.names("qqq"), [])
+
+    def test_index_follows_renames(self):
+        self.assertEqual(self.names("doe legl"), ["Jane Doe Legal"])
+        biz = Business.objects.get(name="Jane Doe Legal")
+        biz.name = "Roe Partners"
+        with self.captureOnCommitCallbacks(execute=True):  # version tokens move on commit
+            biz.save()
+        self.assertEqual(self.names("doe legl"), [])
+        self.assertEqual(self.names("roe partnrs"), ["Roe Partners"])
+
+
+class CategoryPathTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.law = Category.objects.create(name="Lawyers")
+        self.pi = Category.objects.create(name="Personal Injury", parent=self.law)
+        self.med = Category.objects.create(name="Doctors")
+        self.biz = Business.objects.create(name="Crash Firm", status="active", category=self.pi)
+
+    def get(self, catpath):
+        return self.client.get(f"/api/businesses/by-path/{catpath}/{self.biz.slug}/")
+
+    def test_trie_lookups(self):
+        trie = CategoryTrie([
+            (1, "lawyers", "Lawyers"), (2, "personal_injury", "Lawyers/Personal_Injury"), (3, "tax", "Lawyers/Tax"),
+        ])
+        self.assertEqual(trie.lookup("lawyers/personal_injury"), 2)
+        self.assertEqual(trie.prefixed("Lawyers/Pers"), {2})
+        self.assertEqual(trie.candidates("Lawyers"), {1, 2, 3})
+        self.assertEqual(trie.candidates("elsewhere/tax"), {3})
+        self.assertEqual(trie.candidates("Nope"), set())
+
+    def test_path_tolerance(self):
+        for catpath in (self.pi.full_slug, self.pi.full_slug.lower(), "Lawyers", self.pi.slug):
+            r = self.get(catpath)
+            self.assertEqual((r.status_code, r.data.get("id")), (200, self.biz.id), catpath)
+
+    def test_wrong_path_redirects_to_current(self):
+        r = self.get("Doctors")
+        self.assertEqual(r.status_code, 301)
+        self.assertTrue(r["Location"].endswith(f"/by-path/{self.pi.full_slug}/{self.biz.slug}/"))
+
+    def test_tree_follows_category_renames(self):
+        self.assertEqual(self.get(self.pi.full_slug).status_code, 200)
+        self.pi.name = "Accidents"
+        self.pi.slug = ""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pi.save()
+        self.assertEqual(self.get("Lawyers/Accidents").status_code, 200)
+
+
+class SlugRegistryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.law = Category.objects.create(name="Lawyers")
+        self.med = Category.objects.create(name="Doctors")
+
+    def rename(self, listing, slug):
+        listing.slug = slug
+        with self.captureOnCommitCallbacks(execute=True):
+            listing.save()
+
+    def test_allocation_skips_model_and_registry_slugs(self):
+        Business.objects.create(name="John Smith", status="active", category=self.law)
+        doc = Doctor.objects.create(provider_name="John Smith", status="active", category=self.med)
+        self.assertEqual(doc.slug, "john-smith-1")
+        self.assertEqual(allocate_slugs(Business, ["John Smith", "John Smith"], "business"),
+                         ["john-smith-2", "john-smith-3"])
+
+    def test_old_slug_redirects_after_rename(self):
+        biz = Business.objects.create(name="John Smith", status="active", category=self.law)
+        self.rename(biz, "jane-doe")
+        r = self.client.get("/api/businesses/by-slug/john-smith/")
+        self.assertEqual(r.status_code, 301)
+        self.assertTrue(r["Location"].endswith("/by-slug/jane-doe/"))
+        self.assertEqual(self.client.get("/api/businesses/by-slug/jane-doe/").data["id"], biz.id)
+
+    def test_redirect_slug_is_not_reallocated(self):
+        biz = Business.objects.create(name="John Smith", status="active", category=self.law)
+        self.rename(biz, "jane-doe")
+        doc = Doctor.objects.create(provider_name="John Smith", status="active", category=self.med)
+        other = Business.objects.create(name="John Smith", status="active", category=self.law)
+        self.assertNotIn("john-smith", (doc.slug, other.slug))
+        r = self.client.get("/api/businesses/by-slug/john-smith/")
+        self.assertEqual(r.status_code, 301)
+        self.assertTrue(r["Location"].endswith("/by-slug/jane-doe/"))
+        self.assertEqual(self.client.get(f"/api/doctors/by-slug/{doc.slug}/").data["id"], doc.id)
+
+    def test_renaming_back_reclaims_own_redirect(self):
+        biz = Business.objects.create(name="John Smith", status="active", category=self.law)
+        self.rename(biz, "jane-doe")
+        biz.slug = ""
+        self.assertEqual(allocate_slug(biz, "John Smith", "business"), "john-smith")
+        self.rename(biz, "john-smith")
+        self.assertEqual(self.client.get("/api/businesses/by-slug/john-smith/").data["id"], biz.id)
+        self.assertEqual(self.client.get("/api/businesses/by-slug/jane-doe/").status_code, 301)
+
+    def test_doctor_by_path_redirects_old_slug(self):
+        doc = Doctor.objects.create(provider_name="Ann Lee", status="active", category=self.med)
+        self.rename(doc, "ann-lee-md")
+        r = self.client.get(f"/api/doctors/by-path/{self.med.full_slug}/ann-lee/")
+        self.assertEqual(r.status_code, 301)
+        self.assertTrue(r["Location"].endswith(f"/by-path/{self.med.full_slug}/ann-lee-md/"))
+
+
+class FeaturedCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.law = Category.objects.create(name="Lawyers")
+        self.pi = Category.objects.create(name="Personal Injury", parent=self.law)
+        self.tax = Category.objects.create(name="Tax", parent=self.law)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crash = Business.objects.create(name="Crash Firm", status="active", category=self.pi)
+            self.audit = Business.objects.create(name="Audit Firm", status="active", category=self.tax)
+
+    def featured(self, **params):
+        r = self.client.get("/api/businesses/featured/", params)
+        self.assertEqual(r.status_code, 200)
+        return sorted(row["name"] for row in r.data)
+
+    def test_scopes_cached_and_invalidated_by_category(self):
+        scopes = [{}, {"category_path": self.law.full_slug}, {"category_id": self.pi.id}, {"category_id": self.tax.id}]
+        before = [self.featured(**p) for p in scopes]
+        self.assertEqual(before[0], ["Audit Firm", "Crash Firm"])
+        # writes that skip the signals are not seen: the lists are cached
+        Business.objects.filter(pk=self.crash.pk).update(name="Crash Partners")
+        Business.objects.filter(pk=self.audit.pk).update(name="Audit Partners")
+        self.assertEqual([self.featured(**p) for p in scopes], before)
+
+        self.crash.name = "Crash Partners"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crash.save()
+        after = [self.featured(**p) for p in scopes]
+        # "*", "Lawyers" and "Lawyers/Personal_Injury" recompute; the Tax list is untouched
+        self.assertEqual(after[0], ["Audit Partners", "Crash Partners"])
+        self.assertEqual(after[1], ["Audit Partners", "Crash Partners"])
+        self.assertEqual(after[2], ["Crash Partners"])
+        self.assertEqual(after[3], ["Audit Firm"])
+
+    def test_bump_waits_for_commit(self):
+        self.featured()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            bump_featured("lawyer", [self.pi.id])
+        Business.objects.filter(pk=self.crash.pk).update(name="Crash Partners")
+        self.assertEqual(self.featured(), ["Audit Firm", "Crash Firm"])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.featured(), ["Audit Firm", "Crash Partners"])
+
+    def test_other_params_bypass_the_cache(self):
+        self.featured(city="Austin")
+        Business.objects.filter(pk=self.crash.pk).update(city="Austin")
+        self.assertEqual(self.featured(city="Austin"), ["Crash Firm"])
+
+
+class NearSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        for name, zip_code in [("Downtown", "78701"), ("East Side", "78702-1234"), ("Houston", "77002"),
+                               ("New York", "10001"), ("No Zip", "")]:
+            Business.objects.create(name=name, zip=zip_code, status="active", category=self.cat)
+
+    def near(self, **params):
+        r = self.client.get("/api/businesses/", {"ordering": "distance_km", **params})
+        self.assertEqual(r.status_code, 200, r.data)
+        return [(row["name"], round(row["distance_km"])) for row in r.data["results"]]
+
+    def test_coordinates_come_from_the_zip(self):
+        biz = Business.objects.get(name="East Side")
+        self.assertEqual((biz.latitude, biz.longitude), (30.2638, -97.7166))
+        self.assertIsNone(Business.objects.get(name="No Zip").latitude)
+
+    def test_radius_filter_and_distance(self):
+        self.assertEqual(self.near(near="78701"), [("Downtown", 0), ("East Side", 3)])
+        self.assertEqual(self.near(near="30.2713,-97.7426", radius_km=300),
+                         [("Downtown", 0), ("East Side", 3), ("Houston", 236)])
+        self.assertEqual([n for n, _ in self.near(near="78701", radius_mi=200)], ["Downtown", "East Side", "Houston"])
+
+    def test_bad_near_rejected(self):
+        for params in ({"near": "abc"}, {"near": "99999"}, {"near": "95,0"}, {"near": "78701", "radius_km": 5000}):
+            self.assertEqual(self.client.get("/api/businesses/", params).status_code, 400, params)
+
+
+class FacetRollupTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        for name, state, city, premium, rating, areas in [
+            ("A", "TX", "Austin", True, 4.5, "Tax, Family"),
+            ("B", "tx", "Austin", False, 3.2, "Tax"),
+            ("C", "NY", "New York", False, 0, ""),
+        ]:
+            Business.objects.create(name=name, state=state, city=city, is_premium=premium, average_rating=rating,
+                                    practice_areas=areas, status="active", category=self.cat)
+        Doctor.objects.create(provider_name="Dr", state="TX", city="Austin", specialty="Cardiology", status="active",
+                              category=self.cat)
+
+    def facets(self, **params):
+        r = self.client.get("/api/facets/", params)
+        self.assertEqual(r.status_code, 200, r.data)
+        return r.data
+
+    def test_rollups_match_the_grouped_query(self):
+        rollup = self.facets(category_id=self.cat.pk, q="")  # blank filters stay on the rollups
+        query = facet_counts({"lawyer": Business.objects.all(), "doctor": Doctor.objects.all()}, 20)
+        self.assertEqual((rollup["source"], query["source"]), ("rollup", "query"))
+        self.assertEqual((rollup["total"], rollup["facets"]), (query["total"], query["facets"]))
+        data = rollup["facets"]
+        self.assertEqual(rollup["total"], 4)
+        self.assertEqual(data["state"], [{"value": "TX", "count": 3}, {"value": "NY", "count": 1}])
+        self.assertEqual(data["practice_area"], [{"value": "Tax", "count": 2}, {"value": "Family", "count": 1}])
+        self.assertEqual(data["specialty"], [{"value": "Cardiology", "count": 1}])
+        self.assertEqual({r["value"]: r["count"] for r in data["rating"]}, {5: 0, 4: 1, 3: 1, 2: 0, 1: 0, 0: 2})
+        filtered = self.facets(category_id=self.cat.pk, state="TX")
+        self.assertEqual(filtered["source"], "query")
+        self.assertEqual(filtered["facets"]["city"], [{"value": "Austin", "state": "TX", "count": 3}])
+
+    def rollup_writes(self, obj, **changes):
+        for field, value in changes.items():
+            setattr(obj, field, value)
+        with CaptureQueriesContext(connection) as ctx:
+            obj.save()
+        return sum(FacetRollup._meta.db_table in q["sql"] for q in ctx.captured_queries)
+
+    def test_refresh_only_when_a_bucket_changes(self):
+        biz = Business.objects.get(name="A")
+        self.assertEqual(self.rollup_writes(biz, average_rating=4.9, phone="555"), 0)
+        self.assertTrue(self.rollup_writes(biz, average_rating=5.0))
+        self.assertTrue(self.rollup_writes(biz, city="Dallas"))
+        doc = Doctor.objects.get(provider_name="Dr")
+        self.assertEqual(self.rollup_writes(doc, average_rating=0.5), 0)
+        self.assertTrue(self.rollup_writes(doc, average_rating=1.5))
+        rating = {r["value"]: r["count"] for r in self.facets(category_id=self.cat.pk)["facets"]["rating"]}
+        self.assertEqual(rating, {5: 1, 4: 0, 3: 1, 2: 0, 1: 1, 0: 1})
+
+
+class TagFilterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        self.a = Business.objects.create(name="A", practice_areas="Personal Injury, Tax", language="English; Français",
+                                         status="active", category=self.cat)
+        self.b = Business.objects.create(name="B", practice_areas="personal  injury|Family", language="English",
+                                         status="active", category=self.cat)
+        Business.objects.create(name="C", practice_areas="Tax law", status="active", category=self.cat)
+        Doctor.objects.create(provider_name="Dr", languages="Spanish, English", status="active", category=self.cat)
+
+    def names(self, url="/api/businesses/", **params):
+        r = self.client.get(url, params)
+        self.assertEqual(r.status_code, 200, r.data)
+        return sorted(row.get("name") or row.get("provider_name") for row in r.data["results"])
+
+    def test_parse_tags_canonicalizes(self):
+        self.assertEqual(parse_tags(" Personal  Injury ;PERSONAL-INJURY\nFrançais, ,日本語"),
+                         {"personal-injury": "Personal Injury", "francais": "Français", "日本語": "日本語"})
+        self.assertEqual(Tag.objects.filter(kind="practice_area", slug="personal-injury").count(), 1)
+
+    def test_filters_join_on_tags(self):
+        self.assertEqual(self.names(practice_areas="PERSONAL injury"), ["A", "B"])
+        self.assertEqual(self.names(practice_areas="tax"), ["A"])  # not "Tax law"
+        self.assertEqual(self.names(practice_areas="Tax, Family"), ["A", "B"])
+        self.assertEqual(self.names(practice_areas="Tax, Family", tag_match="all"), [])
+        self.assertEqual(self.names(practice_areas="Tax, Personal Injury", tag_match="all"), ["A"])
+        self.assertEqual(self.names(language="francais"), ["A"])
+        self.assertEqual(self.names(practice_areas="Nope"), [])
+        self.assertEqual(self.names("/api/doctors/", languages="spanish"), ["Dr"])
+        self.assertEqual(self.names("/api/doctors/", languages="French"), [])
+        tag_id = Tag.objects.get(kind="practice_area", slug="family").pk
+        self.assertEqual(self.names(tags=str(tag_id)), ["B"])
+        self.assertEqual(self.client.get("/api/businesses/", {"tags": "x"}).status_code, 400)
+
+    def test_links_follow_saves(self):
+        self.assertEqual(self.names(practice_areas="Family"), ["B"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a.practice_areas = "Family"
+            self.a.save()
+        self.assertEqual(self.names(practice_areas="Family"), ["A", "B"])
+        self.assertEqual(self.names(practice_areas="tax"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.b.delete()
+        self.assertEqual(self.names(practice_areas="Family"), ["A"])
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        Business.objects.create(name="A", city="Austin", description="long " * 100, status="active", category=self.cat)
+
+    def row(self, **params):
+        r = self.client.get("/api/businesses/", params)
+        self.assertEqual(r.status_code, 200, r.data)
+        return r.data["results"][0]
+
+    def test_fields_and_omit(self):
+        self.assertEqual(set(self.row(fields="id,name")), {"id", "name"})
+        card = self.row(fields="card")
+        preset = set(BusinessSerializer.FIELDSETS["card"]) - {"distance_km"}  # only with ?near=
+        self.assertEqual(set(card), preset)
+        self.assertEqual(card["category_name"], "Lawyers")
+        self.assertIn("description", self.row(fields="card,description"))
+        full = self.row()
+        self.assertIn("description", full)
+        self.assertEqual(set(self.row(omit="description")), set(full) - {"description"})
+        self.assertEqual(set(self.row(fields="id,name,city", omit="city")), {"id", "name"})
+
+    def test_unknown_field_rejected(self):
+        r = self.client.get("/api/businesses/", {"fields": "id,bogus"})
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("bogus", str(r.data["fields"]))
+        self.assertEqual(self.client.get("/api/businesses/", {"omit": "card"}).status_code, 400)
+
+    def test_only_the_chosen_columns_are_loaded(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.row(fields="id,name")
+        sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "businesses_business"' in q["sql"]
+                   and "COUNT(" not in q["sql"])
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("categories_category", sql)
+        with CaptureQueriesContext(connection) as ctx:
+            self.row(fields="id,category_name")
+        self.assertTrue(any("categories_category" in q["sql"] for q in ctx.captured_queries))
+
+
+class RenderAndCompressTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        cat = Category.objects.create(name="Lawyers")
+        Business.objects.bulk_create([
+            Business(name=f"Firm {i}", slug=f"firm-{i}", description="Same text. " * 20, status="active", category=cat)
+            for i in range(30)
+        ])
+
+    def test_renderer_matches_drf(self):
+        data = {"a": [1, 2.5, None, True], "when": timezone.now(), "price": Decimal("1.10"),
+                "text": "caf\u00e9 \u2028 line", 1: "int key", "big": 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip;q=0.5, br;q=0, *"), {"gzip", "*"})
+        self.assertEqual(accepted_encodings(""), set())
+
+    def get(self, encoding, **params):
+        r = self.client.get("/api/businesses/", {"page_size": 30, **params}, HTTP_ACCEPT_ENCODING=encoding)
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("Accept-Encoding", r["Vary"])
+        return r
+
+    def test_gzip(self):
+        plain = self.get("identity")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        r = self.get("gzip, br;q=0")
+        self.assertEqual(r["Content-Encoding"], "gzip")
+        self.assertEqual(int(r["Content-Length"]), len(r.content))
+        self.assertLess(len(r.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(r.content)), json.loads(plain.content))
+        small = self.get("gzip", fields="id", page_size=1)  # below COMPRESS_MIN_SIZE
+        self.assertFalse(small.has_header("Content-Encoding"))
+
+    @unittest.skipIf(brotli is None, "brotli not installed")
+    def test_brotli_preferred(self):
+        r = self.get("gzip, br")
+        self.assertEqual(r["Content-Encoding"], "br")
+        self.assertEqual(json.loads(brotli.decompress(r.content)), json.loads(self.get("").content))
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        self.biz = Business.objects.create(name="A", status="active", category=self.cat)
+        self.user = get_user_model().objects.create_user(username="u", email="u@example.com", password="pw")
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"]).status_code
+
+    def test_listing_detail(self):
+        url = f"/api/businesses/{self.biz.pk}/"
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r["ETag"].startswith('W/"'))
+        self.assertEqual(self.revalidate(url, r), 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=r["Last-Modified"]).status_code, 304)
+        self.assertEqual(self.revalidate(url, r, fields="id"), 200)  # another representation
+
+        self.cat.name = "Attorneys"  # category_name is rendered
+        self.cat.save()
+        r2 = self.client.get(url, HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual((r2.status_code, r2.data["category_name"]), (200, "Attorneys"))
+        self.biz.phone = "555"
+        self.biz.save()
+        self.assertEqual(self.revalidate(url, r2), 200)
+
+    def test_reviews_list(self):
+        url = "/api/reviews/"
+        Review.objects.create(business=self.biz, user=self.user, rating=5, title="t", content="c", status="approved")
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertIsNone(r.get("Last-Modified"))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.revalidate(url, r), 304)
+        self.assertEqual(len(ctx.captured_queries), 0)  # versioned by cache tokens, no probe
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(business=self.biz, user=self.user, rating=3, title="t", content="c")
+        self.assertEqual(self.revalidate(url, r), 200)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.cat = Category.objects.create(name="Lawyers")
+        self.biz = Business.objects.create(name="A", status="active", category=self.cat)
+
+    def test_local_tier(self):
+        cache.set("k", 1)
+        cache.shared.set("k", 2)  # another process's write
+        self.assertEqual(cache.get("k"), 1)  # served locally for up to LOCAL_TIMEOUT
+        later = time.monotonic() + cache.local_timeout + 1
+        with mock.patch("utils.cache.time.monotonic", return_value=later):
+            self.assertEqual(cache.get("k"), 2)
+        cache.delete("k")
+        self.assertIsNone(cache.shared.get("k"))
+        self.assertIsNone(cache.get("k"))
+
+    def test_version_tokens(self):
+        before = model_versions(Business, "categories.counts")
+        self.assertEqual(model_versions(Business, "categories.counts"), before)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions(Business)
+        after = model_versions(Business, "categories.counts")
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], before[1])
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "other.example.com"])
+    def test_key_covers_scheme_and_host(self):
+        factory = APIRequestFactory()
+
+        def key(**extra):
+            return response_key(Request(factory.get("/api/categories/", {"b": "2", "a": "1", "c": ""}, **extra)),
+                                "v", {}, ("t",))
+
+        self.assertEqual(key(), response_key(Request(factory.get("/api/categories/?a=1&b=2")), "v", {}, ("t",)))
+        self.assertNotEqual(key(), key(secure=True))
+        self.assertNotEqual(key(), key(HTTP_HOST="other.example.com"))
+
+    def counts(self):
+        r = self.client.get("/api/categories/")
+        self.assertEqual(r.status_code, 200)
+        return [row["business_count"] for row in r.data["results"]]
+
+    def test_category_list_follows_counts_not_every_listing_edit(self):
+        self.assertEqual(self.counts(), [1])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.biz.phone = "555"
+            self.biz.save()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.counts(), [1])
+        self.assertEqual(len(ctx.captured_queries), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Business.objects.create(name="B", status="active", category=self.cat)
+        self.assertEqual(self.counts(), [2])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.biz.status = "inactive"
+            self.biz.save()
+        self.assertEqual(self.counts(), [1])
+
+
+class EdgePurgeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        self.log = f"{tmp}/purge.log"
+        self.settings_override = override_settings(EDGE_PURGE_LOG=self.log)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        purge_backend.cache_clear()
+        self.addCleanup(purge_backend.cache_clear)
+        self.cat = Category.objects.create(name="Lawyers")
+        self.biz = Business.objects.create(name="Acme Law", status="active", category=self.cat)
+
+    def purged(self, **changes):
+        """Keys purged by saving self.biz with `changes`."""
+        open(self.log, "w").close()
+        with self.captureOnCommitCallbacks(execute=True):
+            for field, value in changes.items():
+                setattr(self.biz, field, value)
+            self.biz.save()
+        with open(self.log) as fh:
+            return {key for line in fh for key in json.loads(line)["keys"]}
+
+    def test_surrogate_keys(self):
+        r = self.client.get(f"/api/businesses/by-slug/{self.biz.slug}/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Surrogate-Key"].split(),
+                         [f"listing:lawyer:{self.biz.pk}", "vertical:lawyer", f"category:{self.cat.pk}"])
+        self.assertIn("s-maxage=", r["Cache-Control"])
+        self.assertTrue(r["Cache-Control"].startswith("public"))
+        missing = self.client.get("/api/businesses/by-slug/nope/")
+        self.assertEqual((missing.status_code, missing["Surrogate-Key"]), (404, "not-found"))
+        self.assertIn("s-maxage=300", missing["Cache-Control"])
+        private = self.client.get(f"/api/businesses/by-slug/{self.biz.slug}/", HTTP_AUTHORIZATION="Bearer x")
+        self.assertEqual(private["Cache-Control"], "private, no-cache")
+        self.assertFalse(private.has_header("Surrogate-Key"))
+        self.assertEqual(self.client.get("/api/businesses/featured/")["Surrogate-Key"],
+                         "featured:lawyer vertical:lawyer")
+
+    def test_writes_purge_affected_keys(self):
+        listing = f"listing:lawyer:{self.biz.pk}"
+        self.assertEqual(self.purged(phone="555"), {listing, "featured:lawyer"})
+        self.assertEqual(self.purged(status="inactive"), {listing, "featured:lawyer", "categories"})
+        self.assertEqual(self.purged(phone="556"), {listing})  # not featured before or after
+        self.assertEqual(self.purged(name="Acme Legal", slug="acme-legal"), {listing, "not-found", "sitemap"})
+        open(self.log, "w").close()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.biz.delete()
+        with open(self.log) as fh:
+            self.assertEqual(set(json.loads(fh.read())["keys"]), {listing, "categories", "not-found", "sitemap"})
@@ -0,0 +1,150 @@
+# businesses/trigram.py
+"""
+Pure-Python trigram index used for fuzzy name matching when the database
+has no pg_trgm (SQLite). Trigram extraction and similarity follow pg_trgm,
+so both backends agree on what "similar" means:
+
+  - lowercase, split into words on non-alphanumerics
+  - pad each word with two leading spaces and one trailing space
+  - similarity = |A ∩ B| / |A ∪ B|
+  - word_similarity = the best similarity between A and any contiguous
+    run of B's trigrams (in text order), so a typo in one word of a
+    multi-word name still scores as a near match of that word
+
+Search scores rows with word_similarity, like pg_trgm's `<%`.
+
+One index per (db alias, model, field) lives in process memory and is
+rebuilt when the model's version token (utils.cache.model_versions) moves.
+The token is read once per model per search, not once per field.
+"""
+import re
+import threading
+from collections import defaultdict
+
+from utils.cache import model_versions
+
+DEFAULT_THRESHOLD = 0.3  # word similarity; pg_trgm.word_similarity_threshold is set to this
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def trigram_sequence(text: str) -> list[str]:
+    """Trigrams of `text` in order, word by word (repeats kept)."""
+    grams = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigrams(text: str) -> set[str]:
+    return set(trigram_sequence(text))
+
+
+def similarity(a: str, b: str) -> float:
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    shared = len(ta & tb)
+    return shared / (len(ta) + len(tb) - shared)
+
+
+def _extent_score(qgrams: set[str], seq: list[str]) -> float:
+    """Best |Q ∩ E| / |Q ∪ E| over contiguous runs E of `seq`."""
+    best = 0.0
+    nq = len(qgrams)
+    for i, first in enumerate(seq):
+        if first not in qgrams:
+            continue  # the best run starts and ends on a shared trigram
+        seen, common = set(), 0
+        for g in seq[i:]:
+            if g not in seen:
+                seen.add(g)
+                common += g in qgrams
+            if g in qgrams:
+                best = max(best, common / (nq + len(seen) - common))
+    return best
+
+
+def word_similarity(q: str, text: str) -> float:
+    """pg_trgm word_similarity(q, text)."""
+    qgrams = trigrams(q)
+    if not qgrams:
+        return 0.0
+    return _extent_score(qgrams, trigram_sequence(text))
+
+
+class TrigramIndex:
+    """Inverted index: trigram -> [row ids]; plus each row's trigram sequence."""
+
+    def __init__(self, rows):
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        self.sequences: dict[int, list[str]] = {}
+        for pk, text in rows:
+            seq = trigram_sequence(text)
+            if not seq:
+                continue
+            self.sequences[pk] = seq
+            for g in set(seq):
+                self.postings[g].append(pk)
+
+    def search(self, q: str, threshold: float = DEFAULT_THRESHOLD, limit: int = 200) -> list[tuple[int, float]]:
+        qgrams = trigrams(q)
+        if not qgrams:
+            return []
+        shared: dict[int, int] = defaultdict(int)
+        for g in qgrams:
+            for pk in self.postings.get(g, ()):
+                shared[pk] += 1
+        nq = len(qgrams)
+        hits = []
+        for pk, c in shared.items():
+            if c / nq < threshold:
+                continue  # upper bound of the word score
+            score = _extent_score(qgrams, self.sequences[pk])
+            if score >= threshold:
+                hits.append((pk, score))
+        hits.sort(key=lambda x: (-x[1], x[0]))
+        return hits[:limit]
+
+
+_lock = threading.Lock()
+_indexes: dict[tuple[str, str, str], tuple[tuple, TrigramIndex]] = {}
+
+
+def _stamp(model) -> str:
+    return model_versions(model)[0]
+
+
+def get_index(model, field: str, using: str, stamp: str | None = None) -> TrigramIndex:
+    key = (using, model._meta.label_lower, field)
+    if stamp is None:
+        stamp = _stamp(model)
+    cached = _indexes.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with _lock:
+        cached = _indexes.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        rows = (
+            model._default_manager.using(using)
+            .exclude(**{f"{field}__isnull": True})
+            .values_list("id", field)
+            .iterator(chunk_size=5000)
+        )
+        index = TrigramIndex(rows)
+        _indexes[key] = (stamp, index)
+        return index
+
+
+def fuzzy_ids(model, fields, q: str, using: str,
+              threshold: float = DEFAULT_THRESHOLD, limit: int = 200) -> dict[int, float]:
+    """{id: best word similarity across `fields`} for rows similar to `q`."""
+    best: dict[int, float] = {}
+    stamp = _stamp(model)
+    for field in fields:
+        for pk, score in get_index(model, field, using, stamp).search(q, threshold, limit):
+            if score > best.get(pk, 0.0):
+                best[pk] = score
+    return best
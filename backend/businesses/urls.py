@@ -1,15 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BusinessViewSet, DoctorViewSet, unified_search
+from .views import BusinessViewSet, DoctorViewSet, ImportJobViewSet, unified_search, directory_search, facets
 
 app_name = "businesses"
 
 router = DefaultRouter()
 router.register(r"businesses", BusinessViewSet, basename="business")
 router.register(r"doctors", DoctorViewSet, basename="doctor")
+router.register(r"import-jobs", ImportJobViewSet, basename="import-job")
 
 urlpatterns = [
     path("", include(router.urls)),
 
     path("unified_search/", unified_search, name="unified-search"),
+    path("directory/search/", directory_search, name="directory-search"),
+    path("facets/", facets, name="facets"),
 ]
\ No newline at end of file
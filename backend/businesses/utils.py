@@ -1,37 +1,53 @@
 from typing import Iterable, Optional
 from django.db.models import Count
 from categories.models import Category
-from .models import Business
+from utils.cache import bump_versions
+from .models import Business, Doctor
 
-# Count only ACTIVE businesses in the totals
+# Count only ACTIVE listings in the totals
 COUNT_ACTIVE_ONLY = True
 
+# Category column kept in sync for each listing model
+COUNT_FIELDS = ((Business, "business_count"), (Doctor, "doctor_count"))
+
+# Cache token of the listing counts (categories' cached list/top responses)
+CATEGORY_COUNTS = "categories.counts"
+
+
 def recalc_category_counts(category_ids: Optional[Iterable[int]] = None) -> None:
     """
-    Recompute Category.business_count from Business rows.
+    Recompute Category.business_count / doctor_count from Business / Doctor rows.
     If category_ids is provided, limit to those categories; otherwise update all.
     """
-    qs = Business.objects.all()
-    if COUNT_ACTIVE_ONLY:
-        qs = qs.filter(status="active")
-
+    ids = None
     if category_ids:
         ids = {int(cid) for cid in category_ids if cid}
         if not ids:
             return
-        qs = qs.filter(category_id__in=ids)
         categories = Category.objects.filter(id__in=ids)
     else:
         categories = Category.objects.all()
 
-    counts = {row["category_id"]: row["c"] for row in qs.values("category_id").annotate(c=Count("id"))}
+    counts = {}
+    for model, field in COUNT_FIELDS:
+        qs = model.objects.all()
+        if COUNT_ACTIVE_ONLY:
+            qs = qs.filter(status="active")
+        if ids is not None:
+            qs = qs.filter(category_id__in=ids)
+        counts[field] = {row["category_id"]: row["c"] for row in qs.values("category_id").annotate(c=Count("id"))}
 
     to_update = []
-    for cat in categories:
-        new_val = int(counts.get(cat.id, 0))
-        if cat.business_count != new_val:
-            cat.business_count = new_val
+    for cat in categories.only("id", *counts):
+        changed = False
+        for field, by_cat in counts.items():
+            new_val = int(by_cat.get(cat.id, 0))
+            if getattr(cat, field) != new_val:
+                setattr(cat, field, new_val)
+                changed = True
+        if changed:
             to_update.append(cat)
 
     if to_update:
-        Category.objects.bulk_update(to_update, ["business_count"], batch_size=1000)
+        Category.objects.bulk_update(to_update, list(counts), batch_size=1000)
+        bump_versions(CATEGORY_COUNTS)
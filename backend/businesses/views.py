@@ -1,25 +1,54 @@
 from django.utils import timezone
-from django.utils.text import slugify
+from django.urls import reverse
+from django.http import StreamingHttpResponse
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
 from django.contrib.auth import get_user_model
 
 from django.db import connection, transaction
-from django.db.models import F, Q, Value, IntegerField, Case, When
+from django.db.models import F, Q, Value, CharField, FloatField
 from django.db.utils import DatabaseError
 
 from categories.models import Category  # hierarchical Category with full_slug
-from .models import Business, Doctor
-from .serializers import BusinessSerializer, DoctorSerializer
+from categories.tree import category_tree
+from .models import Business, Doctor, ImportJob
+from .serializers import BusinessSerializer, DoctorSerializer, ImportJobSerializer, UnifiedSearchItemSerializer
+from .search import fulltext_search, fuzzy_search
+from .ranking import rank_score
+from .facets import DEFAULT_FACET_LIMIT, MAX_FACET_LIMIT, facet_counts, refresh_facets, rollup_counts
+from .fieldsets import SparseFieldsetViewMixin
+from .featured import FEATURED_LIMIT, bump_featured, cached_featured
+from .geo import apply_geo, parse_near, within_radius
+from .imports import (
+    IMPORT_CHUNK_SIZE, IMPORT_MODES, MAX_IMPORT_CHUNK_SIZE, UPSERT_KEYS, ImportInterrupted, ImportStream,
+    check_lease, detect_format, import_rows, iter_records, refresh_meta,
+)
+from .jobs import ACTIVE_STATUSES, SERIALIZERS, enqueue_import, enqueue_items, enqueue_move
+from .locks import IMPORT_LOCK, acquire_lock, release_lock
+from .moves import MOVE_SYNC_LIMIT, finish_move, move_listings
+from .slugs import (
+    current_entry, insert_with_slugs, lookup_slug, register_listing_slugs,
+)
+from .tags import sync_inserted_tags, tag_filter
+from .pagination import ListingPagination, encode_cursor, decode_cursor, keyset_after, row_key, sort_key
+from utils.cache import bump_versions, cache_response
+from utils.conditional import ConditionalGetMixin
+from utils.edge import (
+    CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY, EdgeCacheMixin, featured_key, listing_keys, purge_keys, vertical_key,
+)
 from utils.email_utils import email_business_approved, email_claim_approved, email_claim_rejected
-from .utils import recalc_category_counts  # (counts Business under Category)
+from utils.pagination import estimated_count
+from .utils import recalc_category_counts  # (counts Business / Doctor under Category)
 
 import uuid
 import time
+import heapq
 import logging
 import traceback
 
@@ -27,19 +56,85 @@ log = logging.getLogger("bulk_import")
 
 User = get_user_model()
 
-# ---- SEO helper (safe import; becomes None if seo app not present)
-try:
-    from seo.utils import ensure_business_meta  # ensure_business_meta(biz, refresh=True)
-except Exception:  # pragma: no cover
-    ensure_business_meta = None
-
-
 class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
     pass
 
 
 # -------------------- FILTERS --------------------
-class BusinessFilter(django_filters.FilterSet):
+class NearFilterSet(django_filters.FilterSet):
+    """
+    ?near=lat,lng (or ?near=<zip>) with ?radius_km= / ?radius_mi= (see
+    businesses/geo.py). Annotates distance_km and, unless ?q= ranks the
+    results, orders nearest first.
+    """
+    near = django_filters.CharFilter(method="filter_near")
+    radius_km = django_filters.NumberFilter(method="pass_through")
+    radius_mi = django_filters.NumberFilter(method="pass_through")
+
+    def pass_through(self, queryset, name, value):
+        return queryset
+
+    def filter_near(self, queryset, name, value):
+        try:
+            near = parse_near(self.data)
+        except ValueError as e:
+            raise ValidationError({"near": [str(e)]})
+        if near is None:
+            return queryset
+        queryset = within_radius(queryset, *near)
+        if not (self.data.get("q") or "").strip():
+            queryset = queryset.order_by("distance_km", "-rank_score", "-updated_at")
+        return queryset
+
+
+class TagFilterSet(django_filters.FilterSet):
+    """
+    Tag filters (businesses/tags.py): each TAG_PARAMS filter takes a comma
+    list of tag names (or ids for ?tags=) and matches listings with any of
+    them, or all of them with ?tag_match=all. Different tag filters AND
+    together like any other filter.
+    """
+    LISTING_KIND = None
+    TAG_PARAMS = {"tags": None}  # param -> Tag.kind (None = tag ids)
+
+    tags = django_filters.CharFilter(method="filter_tags")
+    tag_match = django_filters.ChoiceFilter(choices=[("any", "any"), ("all", "all")], method="pass_through")
+
+    def pass_through(self, queryset, name, value):
+        return queryset
+
+    def filter_tags(self, queryset, name, value):
+        tag_kind = self.TAG_PARAMS[name]
+        values = [value]
+        if tag_kind is None:
+            try:
+                values = [int(v) for v in value.split(",") if v.strip()]
+            except ValueError:
+                raise ValidationError({name: ["Expected a comma-separated list of tag ids."]})
+        if not values:
+            return queryset
+        match_all = self.data.get("tag_match") == "all"
+        return tag_filter(queryset, self.LISTING_KIND, tag_kind, values, match_all)
+
+
+class ListingOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that only honours ?ordering=distance_km when ?near= annotated it."""
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term for term in valid
+            if term.lstrip("-") != "distance_km" or "distance_km" in queryset.query.annotations
+        ]
+
+
+class BusinessFilter(NearFilterSet, TagFilterSet):
+    LISTING_KIND = "lawyer"
+    TAG_PARAMS = {
+        "tags": None, "practice_areas": "practice_area",
+        "language": "language", "associations": "association",
+    }
+
     id__in = NumberInFilter(field_name="id", lookup_expr="in")
 
     # Category filters
@@ -55,8 +150,11 @@ class BusinessFilter(django_filters.FilterSet):
     # Address/profile filters (examples)
     city = django_filters.CharFilter(field_name="city", lookup_expr="iexact")
     state = django_filters.CharFilter(field_name="state", lookup_expr="iexact")
-    language = django_filters.CharFilter(field_name="language", lookup_expr="iexact")
-    practice_areas = django_filters.CharFilter(field_name="practice_areas", lookup_expr="icontains")
+
+    # Tag joins (canonical names, comma = any; see TagFilterSet)
+    language = django_filters.CharFilter(method="filter_tags")
+    practice_areas = django_filters.CharFilter(method="filter_tags")
+    associations = django_filters.CharFilter(method="filter_tags")
 
     # Back-compat: legacy ?tag=... maps to various profile text fields
     tag = django_filters.CharFilter(method="filter_legacy_tag")
@@ -64,28 +162,22 @@ class BusinessFilter(django_filters.FilterSet):
     # Field-scoped OR search
     q = django_filters.CharFilter(method="filter_q")              # the query string
     search_in = django_filters.CharFilter(method="pass_through")  # comma list of fields
-
-    def pass_through(self, queryset, name, value):
-        return queryset
+    fuzzy = django_filters.CharFilter(method="pass_through")      # typo-tolerant ?q= (see get_queryset)
 
     def filter_legacy_tag(self, queryset, name, value: str):
         v = (value or "").strip()
         if not v:
             return queryset
-        return queryset.filter(
-            Q(practice_areas__icontains=v) |
-            Q(honors__icontains=v) |
-            Q(associations__icontains=v) |
-            Q(education__icontains=v) |
-            Q(publications__icontains=v) |
-            Q(speaking_engagements__icontains=v) |
-            Q(description__icontains=v)
-        )
+        # practice_areas (B) + description/honors/associations/education/
+        # publications/speaking_engagements (C) in the full-text index
+        return fulltext_search(queryset, v, weights="BC", with_category=False, rank=False)
 
     def filter_q(self, queryset, name, value: str):
         value = (value or "").strip()
         if not value:
             return queryset
+        if str(self.data.get("fuzzy") or "").strip().lower() in ("1", "true", "yes", "on"):
+            return queryset  # BusinessViewSet.get_queryset applies the fuzzy match
 
         raw = (self.data.get("search_in") or "")
         requested = [f.strip() for f in raw.split(",") if f.strip()]
@@ -96,9 +188,10 @@ class BusinessFilter(django_filters.FilterSet):
             "language", "street_address", "city", "state", "zip",
             "website", "phone",
         }
-        fields = [f for f in requested if f in allowed] or [
-            "name", "description", "practice_areas", "city", "state", "zip", "language"
-        ]
+        fields = [f for f in requested if f in allowed]
+        if not fields:
+            # default field set is covered by the full-text index
+            return fulltext_search(queryset, value, with_category=False, rank=False)
 
         q_obj = Q()
         for f in fields:
@@ -111,12 +204,16 @@ class BusinessFilter(django_filters.FilterSet):
             "status", "is_premium", "slug",
             "category", "category_id", "category_full_slug", "category_path",
             "claimed_by", "pending_claim_by",
-            "city", "state", "language", "practice_areas",
-            "q", "search_in", "tag",
+            "city", "state", "language", "practice_areas", "associations",
+            "tags", "tag_match",
+            "q", "search_in", "fuzzy", "tag",
         ]
 
 
-class DoctorFilter(django_filters.FilterSet):
+class DoctorFilter(NearFilterSet, TagFilterSet):
+    LISTING_KIND = "doctor"
+    TAG_PARAMS = {"tags": None, "languages": "language"}
+
     id__in = NumberInFilter(field_name="id", lookup_expr="in")
 
     # Category filters
@@ -134,6 +231,7 @@ class DoctorFilter(django_filters.FilterSet):
     state = django_filters.CharFilter(field_name="state", lookup_expr="iexact")
     specialty = django_filters.CharFilter(field_name="specialty", lookup_expr="icontains")
     npi_number = django_filters.CharFilter(field_name="npi_number", lookup_expr="icontains")
+    languages = django_filters.CharFilter(method="filter_tags")
 
     class Meta:
         model = Doctor
@@ -141,10 +239,341 @@ class DoctorFilter(django_filters.FilterSet):
             "status", "is_premium", "slug",
             "category", "category_id", "category_full_slug", "category_path",
             "claimed_by", "pending_claim_by",
-            "city", "state", "specialty", "npi_number",
+            "city", "state", "specialty", "npi_number", "languages",
+            "tags", "tag_match",
         ]
 
 
+# -------------------- Slug registry redirects --------------------
+def _slug_moved(request, entry, url_name, **kwargs):
+    """301 to the listing's current URL; the body lets API clients update theirs."""
+    url = request.build_absolute_uri(reverse(f"businesses:{url_name}", kwargs=kwargs))
+    return Response(
+        {
+            "detail": "Moved permanently.",
+            "type": entry.kind,
+            "slug": entry.slug,
+            "category_full_slug": entry.category_full_slug,
+        },
+        status=status.HTTP_301_MOVED_PERMANENTLY,
+        headers={"Location": url},
+    )
+
+
+# -------------------- Streaming import / import jobs (shared) --------------------
+def _read_upload(request):
+    """
+    (source, fmt, filename) for a raw NDJSON/CSV body or a multipart "file",
+    or an error Response.
+    """
+    content_type = request.content_type or ""
+    if content_type.startswith("multipart/form-data"):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+        source, filename, upload_type = upload, upload.name, upload.content_type
+    else:
+        source, filename, upload_type = request.stream, "", content_type
+    if source is None:
+        return Response({"detail": "Empty upload."}, status=status.HTTP_400_BAD_REQUEST)
+
+    fmt = detect_format(request.query_params.get("input_format"), upload_type, filename)
+    if fmt is None:
+        return Response(
+            {"detail": "Send NDJSON or CSV (Content-Type or ?input_format=ndjson|csv)."},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    return source, fmt, filename
+
+
+def _chunk_size(request) -> int:
+    try:
+        chunk_size = int(request.query_params.get("chunk_size") or IMPORT_CHUNK_SIZE)
+    except ValueError:
+        chunk_size = IMPORT_CHUNK_SIZE
+    return min(max(chunk_size, 1), MAX_IMPORT_CHUNK_SIZE)
+
+
+def _import_mode(request, kind):
+    """(mode, key) from ?mode=insert|upsert&key=..., or an error Response."""
+    mode = (request.query_params.get("mode") or "insert").strip().lower()
+    key = (request.query_params.get("key") or UPSERT_KEYS[kind][0]).strip()
+    if mode not in IMPORT_MODES:
+        return Response({"detail": "mode must be insert or upsert"}, status=status.HTTP_400_BAD_REQUEST)
+    if key not in UPSERT_KEYS[kind]:
+        return Response(
+            {"detail": f"key must be one of: {', '.join(UPSERT_KEYS[kind])}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return mode, key
+
+
+def _bulk_upsert(view, kind, items, key, owner):
+    """
+    bulk_create?mode=upsert: run the posted items through the per-row
+    import path ("row" in errors is the 1-based item index), renewing
+    `owner`'s import lock per chunk.
+    """
+    records = (
+        (i, item, None) if isinstance(item, dict)
+        else (i, None, {"non_field_errors": ["Expected an object."]})
+        for i, item in enumerate(items, 1)
+    )
+    *reports, summary = import_rows(
+        kind, records, view.get_serializer_class(), context=view.get_serializer_context(),
+        chunk_size=MAX_IMPORT_CHUNK_SIZE, progress=lambda report, last_line: check_lease(owner),
+        mode="upsert", key=key,
+    )
+    body = {**summary, "errors": [e for r in reports for e in r["errors"]]}
+    if not summary["done"]:
+        body["detail"] = "Database is busy; please retry later."
+        body["error"] = reports[-1].get("error")
+        return Response(body, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(body, status=status.HTTP_201_CREATED)
+
+
+def _job_queued(job, count_key="created"):
+    """202 for an upload (or bulk move) that went to the background queue."""
+    return Response(
+        {count_key: 0, "queued": True, "job": ImportJobSerializer(job).data},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def _stream_import(view, request, kind):
+    """
+    POST a raw NDJSON/CSV body (Content-Type application/x-ndjson or text/csv)
+    or a multipart "file". ?input_format=ndjson|csv overrides detection;
+    ?chunk_size= sets rows per transaction; ?mode=upsert&key=... updates
+    listings matched by natural key instead of duplicating them. Streams one
+    NDJSON report line per chunk (see businesses/imports.py).
+
+    With ?background=1, or while another import holds the lock, the upload
+    is stored as an ImportJob instead and the answer is 202 with the job.
+    """
+    upload = _read_upload(request)
+    if isinstance(upload, Response):
+        return upload
+    source, fmt, filename = upload
+    chunk_size = _chunk_size(request)
+    mode = _import_mode(request, kind)
+    if isinstance(mode, Response):
+        return mode
+    mode, key = mode
+
+    owner = f"request:{uuid.uuid4().hex}"
+    background = str(request.query_params.get("background", "0")).strip().lower() in ("1", "true", "yes", "on")
+    if background or not acquire_lock(IMPORT_LOCK, owner):
+        job = enqueue_import(kind, fmt, source, filename=filename, user=request.user,
+                             chunk_size=chunk_size, options={"mode": mode, "key": key})
+        return _job_queued(job)
+
+    reports = import_rows(
+        kind, iter_records(source, fmt), view.get_serializer_class(),
+        context=view.get_serializer_context(), chunk_size=chunk_size,
+        progress=lambda report, last_line: check_lease(owner),
+        mode=mode, key=key,
+    )
+    return StreamingHttpResponse(ImportStream(reports, owner), content_type="application/x-ndjson")
+
+
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Background imports (admin). POST a multipart "file" (or a raw NDJSON/CSV
+    body) with ?kind=lawyer|doctor to queue one; poll GET /import-jobs/{id}/.
+    Jobs are run by `manage.py run_import_worker`.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["kind", "status"]
+
+    def create(self, request):
+        kind = request.query_params.get("kind") or request.data.get("kind")
+        if kind not in SERIALIZERS:
+            return Response({"detail": "kind must be lawyer or doctor"}, status=status.HTTP_400_BAD_REQUEST)
+        upload = _read_upload(request)
+        if isinstance(upload, Response):
+            return upload
+        source, fmt, filename = upload
+        mode = _import_mode(request, kind)
+        if isinstance(mode, Response):
+            return mode
+        mode, key = mode
+        job = enqueue_import(kind, fmt, source, filename=filename, user=request.user,
+                             chunk_size=_chunk_size(request), options={"mode": mode, "key": key})
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        ImportJob.objects.filter(pk=job.pk, status__in=ACTIVE_STATUSES).update(
+            status="cancelled", finished_at=timezone.now()
+        )
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=["post"])
+    def retry(self, request, pk=None):
+        """Re-queue a failed or cancelled job; it resumes after its checkpoint."""
+        job = self.get_object()
+        if job.status not in ("failed", "cancelled"):
+            return Response({"detail": f"Job is {job.status}."}, status=status.HTTP_400_BAD_REQUEST)
+        ImportJob.objects.filter(pk=job.pk, status=job.status).update(
+            status="queued", message="", finished_at=None
+        )
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+# -------------------- Bulk category move (shared) --------------------
+def _bulk_set_category(request, kind):
+    """
+    Body of bulk_set_category for both listing types. Moves of more than
+    MOVE_SYNC_LIMIT listings, moves with "background": true, and moves
+    made while an import holds the lock are queued as a "set_category"
+    ImportJob (202 with the job); the rest run here, one transaction per
+    chunk (businesses/moves.py).
+    """
+    data = request.data or {}
+    model = Business if kind == "lawyer" else Doctor
+
+    ids = data.get("ids")
+    from_category_id = data.get("from_category_id")
+    to_category_id = data.get("to_category_id")
+    dry_run = str(data.get("dry_run", "0")).strip().lower() in ("1", "true", "yes", "on")
+    refresh_seo = str(data.get("refresh_seo", "0")).strip().lower() in ("1", "true", "yes", "on")
+    background = str(data.get("background", "0")).strip().lower() in ("1", "true", "yes", "on")
+
+    if not to_category_id:
+        return Response({"detail": "to_category_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Validate destination category
+    try:
+        to_cat = Category.objects.only("id", "full_slug").get(pk=int(to_category_id))
+    except Exception:
+        return Response({"detail": "Invalid to_category_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Destination must be a subcategory (not main)
+    if "/" not in (to_cat.full_slug or ""):
+        return Response(
+            {"detail": "Destination must be a subcategory (no main→main allowed)."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # Build queryset of candidates
+    qs = model.objects.all()
+
+    # Scope by ids OR from_category_id (both can narrow)
+    if ids:
+        try:
+            ids = [int(x) for x in ids]
+        except Exception:
+            return Response({"detail": "ids must be a list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(id__in=ids)
+
+    if from_category_id:
+        try:
+            from_category_id = int(from_category_id)
+        except Exception:
+            return Response({"detail": "from_category_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(category_id=from_category_id)
+
+    # Optional filters
+    opt_filters = data.get("filters") or {}
+    if isinstance(opt_filters, dict):
+        if "status" in opt_filters and str(opt_filters["status"]).strip():
+            qs = qs.filter(status=str(opt_filters["status"]).strip())
+        if "city" in opt_filters and str(opt_filters["city"]).strip():
+            qs = qs.filter(city__iexact=str(opt_filters["city"]).strip())
+        if "state" in opt_filters and str(opt_filters["state"]).strip():
+            qs = qs.filter(state__iexact=str(opt_filters["state"]).strip())
+
+    total = qs.count()
+
+    if total == 0:
+        if dry_run:
+            return Response({
+                "dry_run": True,
+                "count": 0,
+                "to_category_id": to_cat.id,
+                "from_category_id": from_category_id,
+            })
+        return Response({"moved": 0, "to_category_id": to_cat.id, "from_category_id": from_category_id})
+
+    # Validate SAME MAIN constraint
+    src_cat_ids = list(qs.values_list("category_id", flat=True).distinct())
+    src_cats = {c.id: c for c in Category.objects.filter(id__in=src_cat_ids).only("id", "full_slug")}
+
+    def root_of(cat_full_slug: str) -> str:
+        fs = (cat_full_slug or "").strip()
+        return fs.split("/")[0] if fs else ""
+
+    src_roots = {root_of(src_cats.get(cid).full_slug) for cid in src_cat_ids if cid in src_cats}
+    if len(src_roots) == 0:
+        return Response(
+            {"detail": "Selected listings have no valid category; cannot determine main category."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(src_roots) > 1:
+        return Response(
+            {"detail": "Selected listings span multiple main categories. Split your selection and retry."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    src_root = next(iter(src_roots))
+    dest_root = root_of(to_cat.full_slug)
+
+    if src_root != dest_root:
+        return Response(
+            {"detail": "Destination subcategory is under a different main category. This move is not allowed."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if dry_run:
+        return Response({
+            "dry_run": True,
+            "count": total,
+            "to_category_id": to_cat.id,
+            "from_category_id": from_category_id,
+            "main_category": src_root,
+        })
+
+    # Snapshot the ids: a from_category_id scope shrinks as rows move
+    id_list = list(qs.order_by("id").values_list("id", flat=True))
+    # Categories to recount (old + new)
+    affected = sorted({cid for cid in src_cat_ids if cid} | {to_cat.id})
+
+    owner = f"request:{uuid.uuid4().hex}"
+    if background or len(id_list) > MOVE_SYNC_LIMIT or not acquire_lock(IMPORT_LOCK, owner):
+        job = enqueue_move(kind, id_list, user=request.user, options={
+            "to_category_id": to_cat.id, "refresh_seo": refresh_seo, "categories": affected,
+        })
+        return _job_queued(job, count_key="moved")
+
+    try:
+        moved = move_listings(
+            kind, id_list, to_cat, refresh_seo=refresh_seo,
+            progress=lambda report, done: check_lease(owner),
+        )
+    except ImportInterrupted:
+        # chunks moved before the lease was lost stay committed
+        finish_move(kind, affected)
+        return Response({"detail": "Import lock lost; please retry later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    else:
+        finish_move(kind, affected)
+    finally:
+        release_lock(IMPORT_LOCK, owner)
+
+    return Response({
+        "moved": moved,
+        "to_category_id": to_cat.id,
+        "from_category_id": from_category_id,
+        "main_category": src_root,
+    }, status=status.HTTP_200_OK)
+
+
 # -------------------- Claim mixin (shared) --------------------
 class _ClaimMixin:
     OWNER_EDITABLE_FIELDS = set()  # override in subclasses
@@ -257,7 +686,8 @@ class _ClaimMixin:
 
 
 # -------------------- Business (Lawyers) --------------------
-class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
+class BusinessViewSet(_ClaimMixin, SparseFieldsetViewMixin, ConditionalGetMixin, EdgeCacheMixin,
+                      viewsets.ModelViewSet):
     queryset = (
         Business.objects.only(
             # identity + slugs + status
@@ -266,7 +696,7 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
             "email",
             "works_for",   # CHANGED: simple URL
             # address
-            "street_address", "city", "state", "zip",
+            "street_address", "city", "state", "zip", "latitude", "longitude",
             # profile text
             "description", "practice_areas", "honors", "work_experience",
             "associations", "education", "speaking_engagements", "publications",
@@ -278,7 +708,7 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
             # claim meta
             "claimed_at", "pending_claim_notes", "pending_claim_requested_at",
             # monetization/ratings
-            "is_premium", "premium_expires", "average_rating", "total_reviews",
+            "is_premium", "premium_expires", "average_rating", "total_reviews", "rank_score",
             # timestamps
             "created_at", "updated_at",
         )
@@ -286,9 +716,19 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
         .order_by("-updated_at")
     )
     serializer_class = BusinessSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    conditional_related = ("category",)  # category_name / category_full_slug
+    # public reads the CDN may hold (utils/edge.py); by_slug / by_path add the listing's keys
+    edge_actions = {
+        "by_slug": (), "by_path": (),
+        "featured": (featured_key("lawyer"), vertical_key("lawyer")),
+    }
+    filter_backends = [DjangoFilterBackend, ListingOrderingFilter, filters.SearchFilter]
+    pagination_class = ListingPagination  # ?cursor= opts into keyset pages
     filterset_class = BusinessFilter
-    ordering_fields = ["updated_at", "created_at", "average_rating", "total_reviews", "is_premium"]
+    ordering_fields = [
+        "updated_at", "created_at", "average_rating", "total_reviews", "is_premium", "rank_score",
+        "distance_km",  # with ?near=
+    ]
 
     # Legacy DRF ?search= support (broad)
     search_fields = [
@@ -318,7 +758,7 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
         if self.action in [
             "update", "partial_update", "destroy",
             "approve_claim", "reject_claim", "set_owner",
-            "bulk_set_category",
+            "bulk_set_category", "import_file",
         ]:
             return [IsAdminUser()]
         if self.action in ["claim"]:
@@ -328,61 +768,42 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Add prioritized ranking when ?q= is present.
-        Rank breakdown (accumulating):
-          +100 name==q (case-insensitive exact)
-           +60 name startswith q
-           +40 name contains q
-           +20 practice_areas contains q
-           +10 description contains q
-            +5 category name contains q
-            +5 city/state/zip contains q (each)
-        Then order by -rank, -is_premium, -average_rating, -updated_at.
+        Matching and rank come from the full-text index (see businesses/search.py),
+        weighted name > practice_areas > description > location; category
+        name/path matches are included with rank 0.
+        With ?fuzzy=1, names within trigram distance of q match too.
+        Then order by -rank, -rank_score, -updated_at.
         """
         qs = super().get_queryset()
 
-        default_order = ["-is_premium", "-average_rating", "-updated_at"]
+        default_order = ["-rank_score", "-updated_at"]
         params = getattr(self.request, "query_params", {})
         raw_q = (params.get("q") or "").strip()
 
         if raw_q:
-            q = raw_q
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(description__icontains=q) |
-                Q(practice_areas__icontains=q) |
-                Q(city__icontains=q) |
-                Q(state__icontains=q) |
-                Q(zip__icontains=q) |
-                Q(category__name__icontains=q) |
-                Q(category__full_slug__icontains=q)
-            )
-
-            rank = (
-                Case(When(name__iexact=q, then=Value(100)), default=Value(0), output_field=IntegerField()) +
-                Case(When(name__istartswith=q, then=Value(60)), default=Value(0), output_field=IntegerField()) +
-                Case(When(name__icontains=q, then=Value(40)), default=Value(0), output_field=IntegerField()) +
-                Case(When(practice_areas__icontains=q, then=Value(20)), default=Value(0), output_field=IntegerField()) +
-                Case(When(description__icontains=q, then=Value(10)), default=Value(0), output_field=IntegerField()) +
-                Case(When(category__name__icontains=q, then=Value(5)), default=Value(0), output_field=IntegerField()) +
-                Case(When(city__icontains=q, then=Value(5)), default=Value(0), output_field=IntegerField()) +
-                Case(When(state__icontains=q, then=Value(5)), default=Value(0), output_field=IntegerField()) +
-                Case(When(zip__icontains=q, then=Value(5)), default=Value(0), output_field=IntegerField())
-            )
-            qs = qs.annotate(rank=rank).order_by("-rank", *default_order)
+            search = fuzzy_search if self._truthy(params.get("fuzzy")) else fulltext_search
+            qs = search(qs, raw_q).order_by("-rank", *default_order)
         else:
             qs = qs.order_by(*default_order)
 
         return qs
 
+    # ---------- List (cached per filter set until a listing or category changes) ----------
+    @cache_response(Business, Category)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     # ---------- Featured ----------
     @action(detail=False, methods=["get"])
     def featured(self, request):
-        qs = (
-            self.filter_queryset(self.get_queryset())
-            .filter(status="active")
-            .order_by("-average_rating")[:8]
-        )
-        return Response(self.get_serializer(qs, many=True).data)
+        def compute():
+            qs = (
+                self.filter_queryset(self.get_queryset())
+                .filter(status="active")
+                .order_by("-rank_score", "-updated_at")[:FEATURED_LIMIT]
+            )
+            return list(self.get_serializer(qs, many=True).data)
+        return Response(cached_featured("lawyer", request.query_params, compute))
 
     # ---------- Create / Update ----------
     def perform_create(self, serializer):
@@ -439,122 +860,78 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
     @action(detail=False, url_path=r"by-slug/(?P<slug>[^/]+)", methods=["get"])
     def by_slug(self, request, slug=None):
         """
-        Resolve a listing by slug.
-        First try Business; if not found, fall back to Doctor so
-        /api/businesses/by-slug/<slug>/ works for both worlds.
+        Resolve a listing by slug through the ListingSlug registry, so
+        /api/businesses/by-slug/<slug>/ works for both worlds in one
+        query. Old slugs of renamed listings answer 301 to the current one.
         """
-        # 1) Try Business
-        try:
-            obj = self.get_queryset().get(slug=slug)
-            return Response(self.get_serializer(obj).data)
-        except Business.DoesNotExist:
-            pass
-
-        # 2) Fallback: Doctor
-        try:
-            doc = (
-                Doctor.objects.only(
-                    "id", "provider_name", "specialty", "slug", "status",
-                    "description", "insurances", "popular_visit_reasons",
-                    "street_address", "city", "state", "zip",
-                    "practice_names", "educations",
-                    "languages", "gender", "npi_number",
-                    "website", "phone", "image_url",
-                    "email", "works_for",  # include new simple fields
-                    "category_id", "claimed_by_id", "pending_claim_by_id",
-                    "claimed_at", "pending_claim_notes", "pending_claim_requested_at",
-                    "is_premium", "premium_expires", "average_rating", "total_reviews",
-                    "created_at", "updated_at",
-                )
-                .select_related("category")
-                .get(slug=slug)
-            )
-            data = DoctorSerializer(doc).data
-            return Response(data, status=status.HTTP_200_OK)
-        except Doctor.DoesNotExist:
+        entry = lookup_slug(slug)
+        if entry is None:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not entry.is_current:
+            cur = current_entry(entry)
+            if cur is None:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            self.edge_keys = listing_keys(cur.kind, cur.business_id or cur.doctor_id)
+            return _slug_moved(request, cur, "business-by-slug", slug=cur.slug)
+
+        self.edge_keys = listing_keys(entry.kind, entry.listing.pk, entry.listing.category_id)
+        if entry.kind == "lawyer":
+            return self.conditional_object(
+                request, entry.business, lambda: Response(self.get_serializer(entry.business).data)
+            )
+        return self.conditional_object(
+            request, entry.doctor, lambda: Response(DoctorSerializer(entry.doctor).data, status=status.HTTP_200_OK)
+        )
 
     # ---------- Public read by hierarchical path ----------
     @action(detail=False, url_path=r"by-path/(?P<catpath>.+)/(?P<bizslug>[^/]+)", methods=["get"])
     def by_path(self, request, catpath=None, bizslug=None):
-        catpath = (catpath or "").strip("/")
-
-        # ----- Business attempts -----
-        # 1) exact category
-        cat = Category.objects.filter(full_slug=catpath).first()
-        if cat:
-            obj = self.get_queryset().filter(category=cat, slug=bizslug).first()
-            if obj:
-                return Response(self.get_serializer(obj).data)
-
-        # 2) case-insensitive
-        cat = Category.objects.filter(full_slug__iexact=catpath).first()
-        if cat:
-            obj = self.get_queryset().filter(category=cat, slug=bizslug).first()
-            if obj:
-                return Response(self.get_serializer(obj).data)
-
-        # 3) ancestor prefix
-        obj = self.get_queryset().filter(
-            slug=bizslug,
-            category__full_slug__istartswith=catpath
-        ).first()
-        if obj:
-            return Response(self.get_serializer(obj).data)
-
-        # 4) last segment fallback
-        last_seg = catpath.split("/")[-1]
-        cat2 = Category.objects.filter(slug=last_seg).first()
-        if cat2:
-            obj = self.get_queryset().filter(category=cat2, slug=bizslug).first()
-            if obj:
-                return Response(self.get_serializer(obj).data)
-
-        # ----- Doctor fallback (same tolerance) -----
-        dqs = (
-            Doctor.objects.only(
-                "id", "provider_name", "specialty", "slug", "status",
-                "description", "insurances", "popular_visit_reasons",
-                "street_address", "city", "state", "zip",
-                "practice_names", "educations",
-                "languages", "gender", "npi_number",
-                "website", "phone", "image_url",
-                "email", "works_for",
-                "category_id", "claimed_by_id", "pending_claim_by_id",
-                "claimed_at", "pending_claim_notes", "pending_claim_requested_at",
-                "is_premium", "premium_expires", "average_rating", "total_reviews",
-                "created_at", "updated_at",
-            )
-            .select_related("category")
-        )
+        """
+        Resolve /<catpath>/<slug> to a Business or Doctor. The slug is one
+        ListingSlug registry hit; catpath may be the exact full_slug, a
+        case-insensitive match, an ancestor prefix or just the last segment,
+        checked against the in-memory category trie.
 
-        # D1 exact category
-        cat = Category.objects.filter(full_slug=catpath).first()
-        if cat:
-            d = dqs.filter(category=cat, slug=bizslug).first()
-            if d:
-                return Response(DoctorSerializer(d).data)
+        Old slugs, and current slugs under a path that no longer matches
+        (listing moved), answer 301 to the listing's current path.
+        """
+        catpath = (catpath or "").strip("/")
+        entry = lookup_slug(bizslug)
+        if entry is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # D2 case-insensitive
-        cat = Category.objects.filter(full_slug__iexact=catpath).first()
-        if cat:
-            d = dqs.filter(category=cat, slug=bizslug).first()
-            if d:
-                return Response(DoctorSerializer(d).data)
+        cur = current_entry(entry)
+        if cur is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # D3 ancestor prefix
-        d = dqs.filter(slug=bizslug, category__full_slug__istartswith=catpath).first()
-        if d:
-            return Response(DoctorSerializer(d).data)
+        allowed = category_tree().candidates(catpath)
+        if cur is entry and entry.listing.category_id in allowed:
+            self.edge_keys = listing_keys(entry.kind, entry.listing.pk, entry.listing.category_id)
+            if entry.kind == "lawyer":
+                return self.conditional_object(
+                    request, entry.business, lambda: Response(self.get_serializer(entry.business).data)
+                )
+            return self.conditional_object(
+                request, entry.doctor, lambda: Response(DoctorSerializer(entry.doctor).data)
+            )
 
-        # D4 last segment
-        cat2 = Category.objects.filter(slug=last_seg).first()
-        if cat2:
-            d = dqs.filter(category=cat2, slug=bizslug).first()
+        # A Doctor may share a Business's slug (registered to the Business)
+        if entry.kind == "lawyer" and allowed:
+            d = (
+                Doctor.objects.select_related("category")
+                .filter(slug=bizslug, category_id__in=allowed)
+                .first()
+            )
             if d:
-                return Response(DoctorSerializer(d).data)
+                self.edge_keys = listing_keys("doctor", d.pk, d.category_id)
+                return self.conditional_object(request, d, lambda: Response(DoctorSerializer(d).data))
 
-        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        # a Doctor created later under this path would answer instead of the 301
+        self.edge_keys = (*listing_keys(cur.kind, cur.business_id or cur.doctor_id), NOT_FOUND_KEY)
+        if cur.category_full_slug:
+            return _slug_moved(request, cur, "business-by-path",
+                               catpath=cur.category_full_slug, bizslug=cur.slug)
+        return _slug_moved(request, cur, "business-by-slug", slug=cur.slug)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAdminUser])
     def set_owner(self, request, pk=None):
@@ -588,157 +965,9 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
         Rules:
           - All selected businesses must belong to the same MAIN category (root of full_slug).
           - Destination must be a SUBCATEGORY under that same main (no main→main).
+        Large moves are queued for the import worker (see _bulk_set_category).
         """
-        data = request.data or {}
-
-        ids = data.get("ids")
-        from_category_id = data.get("from_category_id")
-        to_category_id = data.get("to_category_id")
-        dry_run = str(data.get("dry_run", "0")).strip().lower() in ("1", "true", "yes", "on")
-        refresh_seo = str(data.get("refresh_seo", "0")).strip().lower() in ("1", "true", "yes", "on")
-
-        if not to_category_id:
-            return Response({"detail": "to_category_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate destination category
-        try:
-            to_cat = Category.objects.only("id", "full_slug").get(pk=int(to_category_id))
-        except Exception:
-            return Response({"detail": "Invalid to_category_id."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Destination must be a subcategory (not main)
-        if "/" not in (to_cat.full_slug or ""):
-            return Response(
-                {"detail": "Destination must be a subcategory (no main→main allowed)."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Build queryset of candidates
-        qs = Business.objects.all()
-
-        # Scope by ids OR from_category_id (both can narrow)
-        if ids:
-            try:
-                ids = [int(x) for x in ids]
-            except Exception:
-                return Response({"detail": "ids must be a list of integers."}, status=status.HTTP_400_BAD_REQUEST)
-            qs = qs.filter(id__in=ids)
-
-        if from_category_id:
-            try:
-                from_category_id = int(from_category_id)
-            except Exception:
-                return Response({"detail": "from_category_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
-            qs = qs.filter(category_id=from_category_id)
-
-        # Optional filters
-        opt_filters = data.get("filters") or {}
-        if isinstance(opt_filters, dict):
-            if "status" in opt_filters and str(opt_filters["status"]).strip():
-                qs = qs.filter(status=str(opt_filters["status"]).strip())
-            if "city" in opt_filters and str(opt_filters["city"]).strip():
-                qs = qs.filter(city__iexact=str(opt_filters["city"]).strip())
-            if "state" in opt_filters and str(opt_filters["state"]).strip():
-                qs = qs.filter(state__iexact=str(opt_filters["state"]).strip())
-
-        total = qs.count()
-
-        if total == 0:
-            if dry_run:
-                return Response({
-                    "dry_run": True,
-                    "count": 0,
-                    "to_category_id": to_cat.id,
-                    "from_category_id": from_category_id,
-                })
-            return Response({"moved": 0, "to_category_id": to_cat.id, "from_category_id": from_category_id})
-
-        # Validate SAME MAIN constraint
-        src_cat_ids = list(qs.values_list("category_id", flat=True).distinct())
-        src_cats = {c.id: c for c in Category.objects.filter(id__in=src_cat_ids).only("id", "full_slug")}
-        def root_of(cat_full_slug: str) -> str:
-            fs = (cat_full_slug or "").strip()
-            return fs.split("/")[0] if fs else ""
-        src_roots = {root_of(src_cats.get(cid).full_slug) for cid in src_cat_ids if cid in src_cats}
-        if len(src_roots) == 0:
-            return Response(
-                {"detail": "Selected listings have no valid category; cannot determine main category."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        if len(src_roots) > 1:
-            return Response(
-                {"detail": "Selected listings span multiple main categories. Split your selection and retry."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        src_root = next(iter(src_roots))
-        dest_root = root_of(to_cat.full_slug)
-
-        if src_root != dest_root:
-            return Response(
-                {"detail": "Destination subcategory is under a different main category. This move is not allowed."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        if dry_run:
-            return Response({
-                "dry_run": True,
-                "count": total,
-                "to_category_id": to_cat.id,
-                "from_category_id": from_category_id,
-                "main_category": src_root,
-            })
-
-        # Pre-capture ids for optional SEO refresh
-        id_list = list(qs.values_list("id", flat=True))
-
-        # Compute affected categories for recounts (old + new)
-        affected_before = set(src_cat_ids)
-        affected_before.add(to_cat.id)
-
-        # Move in chunks; keep memory low and update updated_at
-        CHUNK = 5000
-        moved = 0
-        now_ts = timezone.now()
-
-        with transaction.atomic():
-            if ids and len(ids) > CHUNK:
-                for i in range(0, len(ids), CHUNK):
-                    batch_ids = ids[i:i + CHUNK]
-                    count = Business.objects.filter(id__in=batch_ids).update(
-                        category_id=to_cat.id, updated_at=now_ts
-                    )
-                    moved += count
-            else:
-                moved = qs.update(category_id=to_cat.id, updated_at=now_ts)
-
-        # Recalc business_count for affected categories (old + new)
-        try:
-            recalc_category_counts(affected_before)
-        except Exception:
-            pass
-
-        # Optional: refresh SEO
-        if ensure_business_meta and refresh_seo and moved > 0:
-            try:
-                for chunk_start in range(0, len(id_list), CHUNK):
-                    chunk_ids = id_list[chunk_start:chunk_start + CHUNK]
-                    for b in Business.objects.filter(id__in=chunk_ids).only(
-                        "id", "name", "city", "state", "category_id", "slug"
-                    ):
-                        try:
-                            ensure_business_meta(b, refresh=True)
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-
-        return Response({
-            "moved": moved,
-            "to_category_id": to_cat.id,
-            "from_category_id": from_category_id,
-            "main_category": src_root,
-        }, status=status.HTTP_200_OK)
+        return _bulk_set_category(request, "lawyer")
 
     # ---------- BULK CREATE ----------
     @action(detail=False, methods=["post"], permission_classes=[AllowAny])
@@ -749,22 +978,29 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
         if not items:
             return Response({"created": 0}, status=status.HTTP_201_CREATED)
 
-        got_lock = False
-        LOCK_KEY = 812345
-        if connection.vendor == "postgresql":
-            try:
-                with connection.cursor() as cur:
-                    cur.execute("SELECT pg_try_advisory_lock(%s)", [LOCK_KEY])
-                    got_lock = bool(cur.fetchone()[0])
-                if not got_lock:
-                    return Response(
-                        {"detail": "Another bulk import is currently running. Try again later."},
-                        status=status.HTTP_409_CONFLICT,
-                    )
-            except Exception:
-                got_lock = False
+        recalc_param = str(request.query_params.get("recalc", "0")).strip().lower()
+        do_recalc = recalc_param in ("1", "true", "yes", "on")
+        mode = _import_mode(request, "lawyer")
+        if isinstance(mode, Response):
+            return mode
+        mode, key = mode
+        cat_ids = sorted({i.get("category_id") for i in items if isinstance(i, dict) and i.get("category_id")})
+
+        # Another import running: queue this batch for the import worker
+        owner = f"request:{uuid.uuid4().hex}"
+        if not acquire_lock(IMPORT_LOCK, owner):
+            options = {"mode": mode, "key": key}
+            if do_recalc:
+                options["recalc_categories"] = cat_ids
+            return _job_queued(enqueue_items("lawyer", items, user=request.user, options=options))
 
         try:
+            if mode == "upsert":
+                response = _bulk_upsert(self, "lawyer", items, key, owner)
+                if do_recalc and cat_ids:
+                    recalc_category_counts(cat_ids)
+                return response
+
             t_validate_start = time.perf_counter()
             serializer = self.get_serializer(data=items, many=True)
             serializer.is_valid(raise_exception=True)
@@ -772,52 +1008,53 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
 
             now_ts = timezone.now()
             objs = []
-            slugs = []
             for validated in serializer.validated_data:
-                name = validated.get("name") or "business"
-                base = slugify(name) or "business"
-                slug = f"{base}-{uuid.uuid4().hex[:8]}"
-                slugs.append(slug)
-                objs.append(Business(
+                obj = Business(
                     **validated,
-                    slug=slug,
                     created_at=now_ts,
                     updated_at=now_ts,
-                ))
+                )
+                obj.rank_score = rank_score(obj)  # bulk_create skips save()
+                apply_geo(obj)
+                objs.append(obj)
+
+            t_insert_start = time.perf_counter()
+            check_lease(owner)  # validation of a large batch may outlast the lease
+            with transaction.atomic():
+                created = insert_with_slugs(
+                    Business, objs, [o.name for o in objs], "business"
+                )
+                slugs = [slug for _, slug in created]
+                register_listing_slugs(Business, slugs)
+                sync_inserted_tags("lawyer", objs, created)
+                check_lease(owner)  # lost meanwhile: roll the batch back
+            t_insert = time.perf_counter() - t_insert_start
 
             # Only count 'active' into category business_count
+            inserted = set(slugs)
             deltas: dict[int, int] = {}
             for o in objs:
-                if getattr(o, "status", None) == "active" and getattr(o, "category_id", None):
+                if o.slug in inserted and o.status == "active" and o.category_id:
                     deltas[o.category_id] = deltas.get(o.category_id, 0) + 1
 
-            t_insert_start = time.perf_counter()
-            Business.objects.bulk_create(objs, ignore_conflicts=True, batch_size=5000)
-            t_insert = time.perf_counter() - t_insert_start
-
             for cid, inc in deltas.items():
                 Category.objects.filter(id=cid).update(
                     business_count=F("business_count") + inc
                 )
+            bump_featured("lawyer", deltas)
+            bump_versions(Business)
+            refresh_facets("lawyer", {o.category_id for o in objs if o.slug in inserted})
+            purge_keys(featured_key("lawyer"), CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY)
 
-            # Auto-create SEO for newly inserted businesses (optional)
-            if ensure_business_meta and slugs:
+            # Auto-create SEO for newly inserted businesses
+            if slugs:
                 CHUNK = 5000
                 try:
                     for i in range(0, len(slugs), CHUNK):
-                        chunk = slugs[i:i + CHUNK]
-                        for b in Business.objects.filter(slug__in=chunk).only(
-                            "id", "name", "city", "state", "category_id", "slug"
-                        ):
-                            try:
-                                ensure_business_meta(b, refresh=True)
-                            except Exception:
-                                pass
+                        refresh_meta("lawyer", slug__in=slugs[i:i + CHUNK])
                 except Exception:
-                    pass
+                    log.exception("bulk_create: SEO refresh failed")
 
-            recalc_param = str(request.query_params.get("recalc", "0")).strip().lower()
-            do_recalc = recalc_param in ("1", "true", "yes", "on")
             if do_recalc:
                 cat_ids = {getattr(o, "category_id", None) for o in objs if getattr(o, "category_id", None)}
                 if cat_ids:
@@ -831,8 +1068,10 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
             except Exception:
                 pass
 
-            return Response({"created": len(objs)}, status=status.HTTP_201_CREATED)
+            return Response({"created": len(created)}, status=status.HTTP_201_CREATED)
 
+        except ImportInterrupted:
+            return Response({"detail": "Import lock lost; please retry later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except DatabaseError as e:
             msg = str(e)
             lowered = msg.lower()
@@ -845,16 +1084,18 @@ class BusinessViewSet(_ClaimMixin, viewsets.ModelViewSet):
             traceback.print_exc()
             return Response({"detail": "Database is busy; please retry later.", "error": msg}, status=code)
         finally:
-            if connection.vendor == "postgresql" and got_lock:
-                try:
-                    with connection.cursor() as cur:
-                        cur.execute("SELECT pg_advisory_unlock(%s)", [LOCK_KEY])
-                except Exception:
-                    pass
+            release_lock(IMPORT_LOCK, owner)
+
+
+    # ---------- STREAMING IMPORT (admin) ----------
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_file(self, request):
+        return _stream_import(self, request, "lawyer")
 
 
 # -------------------- Doctor (Providers) --------------------
-class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
+class DoctorViewSet(_ClaimMixin, SparseFieldsetViewMixin, ConditionalGetMixin, EdgeCacheMixin,
+                    viewsets.ModelViewSet):
     queryset = (
         Doctor.objects.only(
             "id", "provider_name", "specialty", "slug", "status",
@@ -862,22 +1103,32 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
             "email",
             "works_for",  # CHANGED: simple URL
             "description", "insurances", "popular_visit_reasons",
-            "street_address", "city", "state", "zip",
+            "street_address", "city", "state", "zip", "latitude", "longitude",
             "practice_names", "educations",
             "languages", "gender", "npi_number",
             "website", "phone", "image_url",
             "category_id", "claimed_by_id", "pending_claim_by_id",
             "claimed_at", "pending_claim_notes", "pending_claim_requested_at",
-            "is_premium", "premium_expires", "average_rating", "total_reviews",
+            "is_premium", "premium_expires", "average_rating", "total_reviews", "rank_score",
             "created_at", "updated_at",
         )
         .select_related("category")
         .order_by("-updated_at")
     )
     serializer_class = DoctorSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    conditional_related = ("category",)  # category_name / category_full_slug
+    # public reads the CDN may hold (utils/edge.py); by_slug / by_path add the listing's keys
+    edge_actions = {
+        "by_slug": (), "by_path": (),
+        "featured": (featured_key("doctor"), vertical_key("doctor")),
+    }
+    filter_backends = [DjangoFilterBackend, ListingOrderingFilter, filters.SearchFilter]
+    pagination_class = ListingPagination  # ?cursor= opts into keyset pages
     filterset_class = DoctorFilter
-    ordering_fields = ["updated_at", "created_at", "average_rating", "total_reviews", "is_premium"]
+    ordering_fields = [
+        "updated_at", "created_at", "average_rating", "total_reviews", "is_premium", "rank_score",
+        "distance_km",  # with ?near=
+    ]
     search_fields = [
         "provider_name", "specialty",
         "description", "insurances", "popular_visit_reasons",
@@ -902,7 +1153,7 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action == "bulk_create":
             return [AllowAny()]  # switch to IsAdminUser() if you want to restrict
-        if self.action in ["bulk_set_category"]:
+        if self.action in ["bulk_set_category", "import_file"]:
             return [IsAdminUser()]
         if self.action in ["create"]:
             return [IsAuthenticated()]
@@ -913,32 +1164,96 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    def get_queryset(self):
+        """
+        Same ?q= / ?fuzzy=1 handling as BusinessViewSet (weighted
+        provider_name > specialty > description > location; fuzzy matches
+        provider_name and specialty by trigram similarity), and the same
+        -rank_score, -updated_at default order.
+        """
+        qs = super().get_queryset()
+
+        params = getattr(self.request, "query_params", {})
+        raw_q = (params.get("q") or "").strip()
+
+        default_order = ["-rank_score", "-updated_at"]
+        if raw_q:
+            search = fuzzy_search if self._truthy(params.get("fuzzy")) else fulltext_search
+            qs = search(qs, raw_q).order_by("-rank", *default_order)
+        else:
+            qs = qs.order_by(*default_order)
+
+        return qs
+
+    @cache_response(Doctor, Category)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
     def featured(self, request):
-        qs = (
-            self.filter_queryset(self.get_queryset())
-            .filter(status="active")
-            .order_by("-average_rating")[:8]
-        )
-        return Response(self.get_serializer(qs, many=True).data)
+        def compute():
+            qs = (
+                self.filter_queryset(self.get_queryset())
+                .filter(status="active")
+                .order_by("-rank_score", "-updated_at")[:FEATURED_LIMIT]
+            )
+            return list(self.get_serializer(qs, many=True).data)
+        return Response(cached_featured("doctor", request.query_params, compute))
+
+    def _doctor_response(self, request, obj):
+        self.edge_keys = listing_keys("doctor", obj.pk, obj.category_id)
+        return self.conditional_object(request, obj, lambda: Response(self.get_serializer(obj).data))
 
     @action(detail=False, url_path=r"by-slug/(?P<slug>[^/]+)", methods=["get"])
     def by_slug(self, request, slug=None):
-        try:
-            obj = self.get_queryset().get(slug=slug)
-        except Doctor.DoesNotExist:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(self.get_serializer(obj).data)
+        """
+        Registry lookup (see BusinessViewSet.by_slug); old slugs of renamed
+        doctors answer 301 to the current one.
+        """
+        entry = lookup_slug(slug, kind="doctor")
+        if entry is None:
+            # a Doctor sharing a Business's slug is not in the registry
+            obj = Doctor.objects.select_related("category").filter(slug=slug).first()
+            if obj is None:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            return self._doctor_response(request, obj)
+        if not entry.is_current:
+            cur = current_entry(entry)
+            if cur is None:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            self.edge_keys = listing_keys("doctor", cur.doctor_id)
+            return _slug_moved(request, cur, "doctor-by-slug", slug=cur.slug)
+        return self._doctor_response(request, entry.doctor)
 
     @action(detail=False, url_path=r"by-path/(?P<catpath>.+)/(?P<docslug>[^/]+)", methods=["get"])
     def by_path(self, request, catpath=None, docslug=None):
+        """
+        Registry lookup + category trie (see BusinessViewSet.by_path); old
+        slugs and moved doctors answer 301 to the current path.
+        """
         catpath = (catpath or "").strip("/")
-        try:
-            cat = Category.objects.get(full_slug=catpath)
-            obj = self.get_queryset().get(category=cat, slug=docslug)
-        except (Category.DoesNotExist, Doctor.DoesNotExist):
+        allowed = category_tree().candidates(catpath)
+        entry = lookup_slug(docslug, kind="doctor")
+        if entry is None:
+            obj = (
+                Doctor.objects.select_related("category")
+                .filter(slug=docslug, category_id__in=allowed)
+                .first()
+            ) if allowed else None
+            if obj is None:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            return self._doctor_response(request, obj)
+
+        cur = current_entry(entry)
+        if cur is None:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(self.get_serializer(obj).data)
+        if cur is entry and entry.doctor.category_id in allowed:
+            return self._doctor_response(request, entry.doctor)
+
+        self.edge_keys = listing_keys("doctor", cur.doctor_id)
+        if cur.category_full_slug:
+            return _slug_moved(request, cur, "doctor-by-path", catpath=cur.category_full_slug, docslug=cur.slug)
+        return _slug_moved(request, cur, "doctor-by-slug", slug=cur.slug)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAdminUser])
     def set_owner(self, request, pk=None):
@@ -969,7 +1284,9 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
         Accepts either:
           - {"items": [ {doctor fields...}, ... ]}
           - [ {doctor fields...}, ... ]
-        Returns: {"created": N}
+        Returns: {"created": N}, or 202 with the queued ImportJob while another
+        import holds the lock. ?mode=upsert&key=npi_number|address updates
+        doctors matched by natural key instead (created/updated/skipped counts).
         """
         payload = request.data
         items = payload.get("items") if isinstance(payload, dict) else payload
@@ -978,28 +1295,61 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
         if not items:
             return Response({"created": 0}, status=status.HTTP_201_CREATED)
 
+        mode = _import_mode(request, "doctor")
+        if isinstance(mode, Response):
+            return mode
+        mode, key = mode
+
+        # Same import lock as businesses; queue the batch while it is held
+        owner = f"request:{uuid.uuid4().hex}"
+        if not acquire_lock(IMPORT_LOCK, owner):
+            return _job_queued(enqueue_items("doctor", items, user=request.user,
+                                             options={"mode": mode, "key": key}))
+
         try:
+            if mode == "upsert":
+                return _bulk_upsert(self, "doctor", items, key, owner)
+
             serializer = self.get_serializer(data=items, many=True)
             serializer.is_valid(raise_exception=True)
 
             now_ts = timezone.now()
             objs = []
             for vd in serializer.validated_data:
-                base_name = vd.get("provider_name") or "provider"
-                base = slugify(base_name) or "provider"
-                slug = f"{base}-{uuid.uuid4().hex[:8]}"
-                objs.append(
-                    Doctor(
-                        **vd,
-                        slug=slug,
-                        created_at=now_ts,
-                        updated_at=now_ts,
-                    )
+                obj = Doctor(
+                    **vd,
+                    created_at=now_ts,
+                    updated_at=now_ts,
                 )
+                obj.rank_score = rank_score(obj)  # bulk_create skips save()
+                apply_geo(obj)
+                objs.append(obj)
+
+            check_lease(owner)  # validation of a large batch may outlast the lease
+            with transaction.atomic():
+                created = insert_with_slugs(
+                    Doctor, objs, [o.provider_name for o in objs], "provider"
+                )
+                slugs = [slug for _, slug in created]
+                register_listing_slugs(Doctor, slugs)
+                sync_inserted_tags("doctor", objs, created)
+                check_lease(owner)  # lost meanwhile: roll the batch back
 
-            Doctor.objects.bulk_create(objs, ignore_conflicts=True, batch_size=5000)
-            return Response({"created": len(objs)}, status=status.HTTP_201_CREATED)
-
+            inserted = set(slugs)
+            deltas: dict[int, int] = {}
+            for o in objs:
+                if o.slug in inserted and o.status == "active" and o.category_id:
+                    deltas[o.category_id] = deltas.get(o.category_id, 0) + 1
+            for cid, inc in deltas.items():
+                Category.objects.filter(id=cid).update(doctor_count=F("doctor_count") + inc)
+            bump_featured("doctor", deltas)
+            bump_versions(Doctor)
+            refresh_facets("doctor", {o.category_id for o in objs if o.slug in inserted})
+            purge_keys(featured_key("doctor"), CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY)
+            return Response({"created": len(created)}, status=status.HTTP_201_CREATED)
+
+        except ImportInterrupted:
+            return Response({"detail": "Import lock lost; please retry later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except DatabaseError as e:
             msg = str(e)
             lowered = msg.lower()
@@ -1008,6 +1358,13 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
                           "lock timeout" in lowered)
             code = status.HTTP_503_SERVICE_UNAVAILABLE if is_timeout else status.HTTP_500_INTERNAL_SERVER_ERROR
             return Response({"detail": "Database is busy; please retry later.", "error": msg}, status=code)
+        finally:
+            release_lock(IMPORT_LOCK, owner)
+
+    # ---------- STREAMING IMPORT (admin) ----------
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_file(self, request):
+        return _stream_import(self, request, "doctor")
 
     # ---------- BULK SET CATEGORY (admin) ----------
     @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
@@ -1018,150 +1375,26 @@ class DoctorViewSet(_ClaimMixin, viewsets.ModelViewSet):
           - All selected doctors must share the same MAIN category (root of full_slug).
           - Destination must be a SUBCATEGORY under that same main (no main→main).
         """
-        data = request.data or {}
-
-        ids = data.get("ids")
-        from_category_id = data.get("from_category_id")
-        to_category_id = data.get("to_category_id")
-        dry_run = str(data.get("dry_run", "0")).strip().lower() in ("1", "true", "yes", "on")
-
-        if not to_category_id:
-            return Response({"detail": "to_category_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            to_cat = Category.objects.only("id", "full_slug").get(pk=int(to_category_id))
-        except Exception:
-            return Response({"detail": "Invalid to_category_id."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if "/" not in (to_cat.full_slug or ""):
-            return Response(
-                {"detail": "Destination must be a subcategory (no main→main allowed)."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        qs = Doctor.objects.all()
-
-        if ids:
-            try:
-                ids = [int(x) for x in ids]
-            except Exception:
-                return Response({"detail": "ids must be a list of integers."}, status=status.HTTP_400_BAD_REQUEST)
-            qs = qs.filter(id__in=ids)
-
-        if from_category_id:
-            try:
-                from_category_id = int(from_category_id)
-            except Exception:
-                return Response({"detail": "from_category_id must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
-            qs = qs.filter(category_id=from_category_id)
-
-        opt_filters = data.get("filters") or {}
-        if isinstance(opt_filters, dict):
-            if "status" in opt_filters and str(opt_filters["status"]).strip():
-                qs = qs.filter(status=str(opt_filters["status"]).strip())
-            if "city" in opt_filters and str(opt_filters["city"]).strip():
-                qs = qs.filter(city__iexact=str(opt_filters["city"]).strip())
-            if "state" in opt_filters and str(opt_filters["state"]).strip():
-                qs = qs.filter(state__iexact=str(opt_filters["state"]).strip())
-
-        total = qs.count()
-        if total == 0:
-            if dry_run:
-                return Response({
-                    "dry_run": True,
-                    "count": 0,
-                    "to_category_id": to_cat.id,
-                    "from_category_id": from_category_id,
-                })
-            return Response({"moved": 0, "to_category_id": to_cat.id, "from_category_id": from_category_id})
-
-        src_cat_ids = list(qs.values_list("category_id", flat=True).distinct())
-        src_cats = {c.id: c for c in Category.objects.filter(id__in=src_cat_ids).only("id", "full_slug")}
-
-        def root_of(cat_full_slug: str) -> str:
-            fs = (cat_full_slug or "").strip()
-            return fs.split("/")[0] if fs else ""
-
-        src_roots = {root_of(src_cats.get(cid).full_slug) for cid in src_cat_ids if cid in src_cats}
-        if len(src_roots) == 0:
-            return Response(
-                {"detail": "Selected listings have no valid category; cannot determine main category."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        if len(src_roots) > 1:
-            return Response(
-                {"detail": "Selected listings span multiple main categories. Split your selection and retry."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        src_root = next(iter(src_roots))
-        dest_root = root_of(to_cat.full_slug)
-        if src_root != dest_root:
-            return Response(
-                {"detail": "Destination subcategory is under a different main category. This move is not allowed."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        if dry_run:
-            return Response({
-                "dry_run": True,
-                "count": total,
-                "to_category_id": to_cat.id,
-                "from_category_id": from_category_id,
-                "main_category": src_root,
-            })
-
-        CHUNK = 5000
-        moved = 0
-        now_ts = timezone.now()
-        if ids and len(ids) > CHUNK:
-            for i in range(0, len(ids), CHUNK):
-                batch_ids = ids[i:i + CHUNK]
-                moved += Doctor.objects.filter(id__in=batch_ids).update(
-                    category_id=to_cat.id, updated_at=now_ts
-                )
-        else:
-            moved = qs.update(category_id=to_cat.id, updated_at=now_ts)
-
-        return Response({
-            "moved": moved,
-            "to_category_id": to_cat.id,
-            "from_category_id": from_category_id,
-            "main_category": src_root,
-        }, status=status.HTTP_200_OK)
+        return _bulk_set_category(request, "doctor")
 
 
 # -------------------- Unified Directory Search --------------------
-@api_view(["GET"])
-@permission_classes([AllowAny])
-def unified_search(request):
+def _listing_querysets(params):
     """
-    Mixed directory search across Business (lawyers) + Doctor (providers).
-
-    Accepts:
-      q                : optional query string (if blank, returns filtered lists)
-      category_id      : optional int (filters both models)
-      category_path    : optional path prefix, matches Category.full_slug startswith
-      status           : optional status filter (e.g., 'active')
-      city             : optional city substring (case-insensitive)
-      state            : optional 2-letter code (case-insensitive exact)
-      is_premium       : optional truthy flag ('1', 'true', 'True') to require premium
-      limit, offset    : pagination (combined across both models)
-
-    Returns:
-      { "items": [ {type: "lawyer"|"doctor", rank: int, data: <serializer> }, ... ] }
+    Shared filtering for unified_search and directory_search: returns
+    (q, business_qs, doctor_qs), both filtered, ranked when q is present
+    (full-text, or trigram with fuzzy=1) and in default order.
     """
-    q = (request.query_params.get("q") or "").strip()
-    limit = int(request.query_params.get("limit", 20))
-    offset = int(request.query_params.get("offset", 0))
-    status_filter = (request.query_params.get("status") or "").strip()
-    category_id = request.query_params.get("category_id")
-    category_path = (request.query_params.get("category_path") or "").strip()
-
-    city = (request.query_params.get("city") or "").strip()
-    state = (request.query_params.get("state") or "").strip()
-    is_premium_param = (request.query_params.get("is_premium") or "").strip().lower()
+    q = (params.get("q") or "").strip()
+    status_filter = (params.get("status") or "").strip()
+    category_id = params.get("category_id")
+    category_path = (params.get("category_path") or "").strip()
+
+    city = (params.get("city") or "").strip()
+    state = (params.get("state") or "").strip()
+    is_premium_param = (params.get("is_premium") or "").strip().lower()
     want_premium = is_premium_param in {"1", "true", "yes", "on"}
+    want_fuzzy = (params.get("fuzzy") or "").strip().lower() in {"1", "true", "yes", "on"}
 
     # Common filters for both querysets
     b_filters = {}
@@ -1200,85 +1433,385 @@ def unified_search(request):
     bqs = Business.objects.filter(**b_filters).select_related("category")
     dqs = Doctor.objects.filter(**d_filters).select_related("category")
 
-    # Default premium/quality recency ordering
-    default_order = ["-is_premium", "-average_rating", "-updated_at"]
+    # Default ordering: persisted premium/rating/completeness score, then recency
+    default_order = ["-rank_score", "-updated_at"]
+
+    # ?near=lat,lng&radius_km=: indexed radius filter, nearest first
+    try:
+        near = parse_near(params)
+    except ValueError as e:
+        raise ValidationError({"near": [str(e)]})
+    if near:
+        bqs = within_radius(bqs, *near)
+        dqs = within_radius(dqs, *near)
+        default_order = ["distance_km", *default_order]
 
     if q:
-        # Lawyers: text match + rank
-        bqs = bqs.filter(
-            Q(name__icontains=q) |
-            Q(description__icontains=q) |
-            Q(practice_areas__icontains=q) |
-            Q(city__icontains=q) | Q(state__icontains=q) | Q(zip__icontains=q) |
-            Q(category__name__icontains=q) | Q(category__full_slug__icontains=q)
-        ).annotate(
-            rank=(
-                Case(When(name__iexact=q, then=Value(100)), default=Value(0), output_field=IntegerField()) +
-                Case(When(name__istartswith=q, then=Value(60)), default=Value(0), output_field=IntegerField()) +
-                Case(When(name__icontains=q, then=Value(40)), default=Value(0), output_field=IntegerField()) +
-                Case(When(practice_areas__icontains=q, then=Value(20)), default=Value(0), output_field=IntegerField()) +
-                Case(When(description__icontains=q, then=Value(10)), default=Value(0), output_field=IntegerField())
-            )
-        ).order_by("-rank", *default_order)
-
-        # Doctors: text match + rank
-        dqs = dqs.filter(
-            Q(provider_name__icontains=q) |
-            Q(specialty__icontains=q) |
-            Q(description__icontains=q) |
-            Q(city__icontains=q) | Q(state__icontains=q) | Q(zip__icontains=q) |
-            Q(npi_number__icontains=q) |
-            Q(category__name__icontains=q) | Q(category__full_slug__icontains=q)
-        ).annotate(
-            rank=(
-                Case(When(provider_name__iexact=q, then=Value(100)), default=Value(0), output_field=IntegerField()) +
-                Case(When(provider_name__istartswith=q, then=Value(60)), default=Value(0), output_field=IntegerField()) +
-                Case(When(provider_name__icontains=q, then=Value(40)), default=Value(0), output_field=IntegerField()) +
-                Case(When(specialty__icontains=q, then=Value(20)), default=Value(0), output_field=IntegerField()) +
-                Case(When(description__icontains=q, then=Value(10)), default=Value(0), output_field=IntegerField())
-            )
-        ).order_by("-rank", *default_order)
+        # Text match + field-weighted rank from the full-text index
+        search = fuzzy_search if want_fuzzy else fulltext_search
+        bqs = search(bqs, q).order_by("-rank", *default_order)
+        dqs = search(dqs, q).order_by("-rank", *default_order)
     else:
         # No query: just apply default order; synthesize rank=0 in Python
         bqs = bqs.order_by(*default_order)
         dqs = dqs.order_by(*default_order)
 
+    return q, bqs, dqs
+
+
+UNIFIED_MAX_LIMIT = 100
+UNIFIED_MAX_OFFSET = 1000  # deeper pages: ?cursor=
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def unified_search(request):
+    """
+    Mixed directory search across Business (lawyers) + Doctor (providers).
+
+    Accepts:
+      q                : optional query string (if blank, returns filtered lists)
+      category_id      : optional int (filters both models)
+      category_path    : optional path prefix, matches Category.full_slug startswith
+      status           : optional status filter (e.g., 'active')
+      city             : optional city substring (case-insensitive)
+      state            : optional 2-letter code (case-insensitive exact)
+      is_premium       : optional truthy flag ('1', 'true', 'True') to require premium
+      fuzzy            : optional truthy flag; also match names by trigram similarity
+      near             : optional "lat,lng" or ZIP; only listings within radius_km
+                         (default 25) / radius_mi, nearest first after rank, each
+                         with distance_km (cursor mode keeps its rank order)
+      limit, offset    : pagination (combined across both models); limit is capped
+                         at UNIFIED_MAX_LIMIT, offset at UNIFIED_MAX_OFFSET
+      cursor           : keyset mode instead of limit/offset (empty = first page);
+                         see _unified_search_keyset
+      full             : optional truthy flag; full Business/DoctorSerializer payloads
+                         instead of the compact UnifiedSearchItemSerializer rows
+
+    Returns:
+      { "items": [ {type: "lawyer"|"doctor", rank: number, data: <serializer> }, ... ] }
+    """
+    try:
+        limit = int(request.query_params.get("limit") or 20)
+        offset = int(request.query_params.get("offset") or 0)
+    except (TypeError, ValueError):
+        return Response({"detail": "Invalid paging parameters."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, UNIFIED_MAX_LIMIT))
+    offset = max(0, offset)
+    if offset > UNIFIED_MAX_OFFSET:
+        return Response(
+            {"detail": f"offset may not exceed {UNIFIED_MAX_OFFSET}; use cursor= for deeper pages."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    q, bqs, dqs = _listing_querysets(request.query_params)
+    want_full = (request.query_params.get("full") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    if want_full:
+        sources = [
+            ("lawyer", bqs, lambda obj: BusinessSerializer(obj).data),
+            ("doctor", dqs, lambda obj: DoctorSerializer(obj).data),
+        ]
+    else:
+        sources = [
+            ("lawyer", _compact_rows(bqs, "name", bool(q)), _compact_renderer("lawyer")),
+            ("doctor", _compact_rows(dqs, "provider_name", bool(q)), _compact_renderer("doctor")),
+        ]
+
+    if "cursor" in request.query_params:
+        return _unified_search_keyset(request, sources, limit, ranked=bool(q))
+
     # To paginate mixed results, grab enough from each set, then merge/sort.
     need = max(0, limit + offset)
-    b_list = list(bqs[:need])
-    d_list = list(dqs[:need])
+    rows = []
+    for kind, qs, _ in sources:
+        rows.extend((row_key(kind, obj, bool(q)), kind, obj) for obj in qs[:need])
+
+    # Combined sort: rank desc (when q), distance (with near), rank_score, updated_at
+    if "distance_km" in bqs.query.annotations:
+        def merge_key(r):
+            rank, *rest = sort_key(r[0])
+            row = r[2]
+            return (rank, row["distance_km"] if isinstance(row, dict) else row.distance_km, *rest)
+        rows.sort(key=merge_key)
+    else:
+        rows.sort(key=lambda r: sort_key(r[0]))
 
-    items = []
+    # Final slice; serialize only what is returned
+    render_by_kind = {kind: render for kind, _, render in sources}
+    items_page = [
+        {"type": kind, "rank": key[0], "data": render_by_kind[kind](row)}
+        for key, kind, row in rows[offset:offset + limit]
+    ]
 
-    # Lawyers
-    for b in b_list:
-        items.append({
-            "type": "lawyer",
-            "rank": getattr(b, "rank", 0),
-            "data": BusinessSerializer(b).data,
-        })
+    return Response({"items": items_page})
+
+
+# Columns behind UnifiedSearchItemSerializer (compact unified_search rows)
+_COMPACT_COLUMNS = (
+    "id", "slug", "city", "state", "image_url", "category_id",
+    "average_rating", "total_reviews", "is_premium", "rank_score", "updated_at",
+)
 
-    # Doctors
-    for d in d_list:
-        items.append({
-            "type": "doctor",
-            "rank": getattr(d, "rank", 0),
-            "data": DoctorSerializer(d).data,
-        })
 
-    # Combined sort: rank desc (when q), premium, rating, updated_at
-    def sort_key(x):
-        d = x["data"]
-        return (
-            x.get("rank", 0),
-            1 if d.get("is_premium") else 0,
-            float(d.get("average_rating") or 0.0),
-            d.get("updated_at") or "",
+def _compact_rows(qs, name_field, ranked):
+    """
+    Project a listing queryset to plain dicts with just the search-card
+    columns (no model instantiation, no long profile TextFields).
+    """
+    extra = {"category_full_slug": F("category__full_slug")}
+    cols = list(_COMPACT_COLUMNS) + (["rank"] if ranked else [])
+    if "distance_km" in qs.query.annotations:
+        cols.append("distance_km")
+    if name_field == "name":
+        cols.append("name")
+    else:
+        extra["name"] = F(name_field)
+    return qs.values(*cols, **extra)
+
+
+def _compact_renderer(kind):
+    def render(row):
+        return UnifiedSearchItemSerializer({**row, "type": kind}).data
+    return render
+
+
+def _unified_search_keyset(request, sources, limit, ranked):
+    """
+    Cursor mode for unified_search (?cursor=, empty for the first page).
+
+    Each vertical contributes at most limit+1 rows strictly after the cursor
+    (an index-friendly keyset predicate, no OFFSET), the sorted streams are
+    k-way merged with a heap and only the returned page is serialized, so
+    page 50 costs the same as page 1.
+
+    Returns:
+      { "items": [...], "next_cursor": "<opaque>" | null }
+    """
+    token = (request.query_params.get("cursor") or "").strip()
+    cursor = None
+    if token:
+        try:
+            cursor = decode_cursor(token)
+        except ValueError:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+    if cursor and not ranked:
+        cursor[0] = 0.0
+
+    limit = max(1, min(limit, UNIFIED_MAX_LIMIT))
+    streams = []
+    render_by_kind = {}
+    for kind, qs, render in sources:
+        render_by_kind[kind] = render
+        qs = qs.order_by(*(["-rank"] if ranked else []), "-rank_score", "-updated_at", "id")
+        if cursor:
+            qs = qs.filter(keyset_after(kind, cursor, ranked))
+        streams.append([(row_key(kind, obj, ranked), kind, obj) for obj in qs[:limit + 1]])
+
+    merged = list(heapq.merge(*streams, key=lambda r: sort_key(r[0])))
+    page = merged[:limit]
+    next_cursor = encode_cursor(page[-1][0]) if len(merged) > limit else None
+
+    items = [
+        {"type": kind, "rank": key[0], "data": render_by_kind[kind](row)}
+        for key, kind, row in page
+    ]
+    return Response({"items": items, "next_cursor": next_cursor})
+
+
+# -------------------- Directory search (single UNION ALL query) --------------------
+# Public ordering names -> columns of the normalized UNION ALL row
+DIRECTORY_ORDERING = {
+    "rank": "rank",
+    "is_premium": "is_premium",
+    "average_rating": "average_rating",
+    "rank_score": "rank_score",
+    "total_reviews": "total_reviews",
+    "updated_at": "updated_at",
+    "name": "listing_name",
+    "distance_km": "distance_km",  # with ?near=
+}
+DIRECTORY_MAX_PAGE_SIZE = 100
+
+
+def _directory_rows(qs, kind, name_field, ranked):
+    """
+    Normalize one vertical to the shared UNION ALL column list. Model fields
+    come first (same names on both models), then annotations in a fixed
+    order, so both SELECTs line up column-for-column.
+    """
+    near = ["distance_km"] if "distance_km" in qs.query.annotations else []
+    return (
+        qs.order_by()
+        .annotate(
+            kind=Value(kind, output_field=CharField()),
+            listing_name=F(name_field),
+            category_full_slug=F("category__full_slug"),
+            **({} if ranked else {"rank": Value(0.0, output_field=FloatField())}),
+        )
+        .values(
+            "id", "slug", "city", "state", "image_url", "category_id",
+            "average_rating", "total_reviews", "is_premium", "rank_score", "updated_at",
+            "kind", "listing_name", "category_full_slug", "rank", *near,
         )
+    )
 
-    items.sort(key=sort_key, reverse=True)
 
-    # Final slice
-    items_page = items[offset:offset + limit]
+def _directory_order_sql(param, ranked, near=False):
+    order = []
+    for raw in (param or "").split(","):
+        raw = raw.strip()
+        col = DIRECTORY_ORDERING.get(raw.lstrip("-"))
+        if col == "distance_km" and not near:
+            continue
+        if col:
+            order.append(f"u.{col} {'DESC' if raw.startswith('-') else 'ASC'}")
+    if not order:
+        order = (["u.rank DESC"] if ranked else []) + (["u.distance_km ASC"] if near else []) + [
+            "u.rank_score DESC", "u.updated_at DESC",
+        ]
+    return ", ".join(order + ["u.kind ASC", "u.id ASC"])
 
-    return Response({"items": items_page})
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def directory_search(request):
+    """
+    GET /api/directory/search/ — the endpoint frontend/src/api/search.js calls.
+
+    Same filters as unified_search (q, fuzzy, status, category_id,
+    category_path, city, state, is_premium, near/radius_km) plus:
+      type             : 'lawyer' | 'doctor' to search one vertical only
+      ordering         : comma list of rank, rank_score, is_premium, average_rating,
+                         total_reviews, updated_at, name, distance_km (with near)
+                         (prefix '-' for DESC)
+      page, page_size  : page-number paging, or
+      limit, offset    : limit/offset paging
+
+    Both verticals are normalized to one column list and combined with
+    UNION ALL; sorting and LIMIT/OFFSET happen in that single query, which
+    fetches one extra row to tell whether there is a next page. The total
+    comes from utils.pagination.estimated_count (bounded COUNT, planner
+    estimate or cached count), as on the list endpoints.
+
+    Returns DRF-style { count, count_approximate, next, previous,
+    results: [UnifiedSearchItem + rank] }.
+    """
+    params = request.query_params
+    q, bqs, dqs = _listing_querysets(params)
+    ranked = bool(q)
+    near = "distance_km" in bqs.query.annotations
+
+    kind = (params.get("type") or "").strip().lower()
+    parts = []
+    if kind in ("", "lawyer"):
+        parts.append(_directory_rows(bqs, "lawyer", "name", ranked))
+    if kind in ("", "doctor"):
+        parts.append(_directory_rows(dqs, "doctor", "provider_name", ranked))
+    if not parts:
+        return Response({"detail": "type must be 'lawyer' or 'doctor'."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page_size = int(params.get("page_size") or params.get("limit") or 24)
+        page = int(params["page"]) if params.get("page") else None
+        offset = (page - 1) * page_size if page else int(params.get("offset") or 0)
+    except (TypeError, ValueError):
+        return Response({"detail": "Invalid paging parameters."}, status=status.HTTP_400_BAD_REQUEST)
+    page_size = max(1, min(page_size, DIRECTORY_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    combined = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+    inner_sql, inner_params = combined.query.sql_with_params()
+    sql = (
+        f"SELECT u.* FROM ({inner_sql}) u "
+        f"ORDER BY {_directory_order_sql(params.get('ordering'), ranked, near)} "
+        f"LIMIT %s OFFSET %s"
+    )
+    with connection.cursor() as cur:
+        cur.execute(sql, [*inner_params, page_size + 1, offset])
+        cols = [c[0] for c in cur.description]
+        rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    count, approximate = estimated_count(combined, offset, len(rows), has_more)
+
+    results = []
+    for row in rows:
+        item = UnifiedSearchItemSerializer({
+            **row, "type": row["kind"], "name": row["listing_name"],
+            "is_premium": bool(row["is_premium"]),
+        }).data
+        item["rank"] = float(row["rank"] or 0)
+        results.append(item)
+
+    url = request.build_absolute_uri()
+    if page:
+        next_url = replace_query_param(url, "page", page + 1) if has_more else None
+        prev_url = None
+        if page > 1:
+            prev_url = replace_query_param(url, "page", page - 1) if page > 2 else remove_query_param(url, "page")
+    else:
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(replace_query_param(url, "limit", page_size), "offset", offset + page_size)
+        prev_url = None
+        if offset > 0:
+            prev_url = replace_query_param(replace_query_param(url, "limit", page_size), "offset", max(0, offset - page_size))
+
+    return Response({
+        "count": count, "count_approximate": approximate,
+        "next": next_url, "previous": prev_url, "results": results,
+    })
+
+
+# -------------------- Facet counts --------------------
+# Filters the rollup tables can answer; anything else runs the grouped query
+_ROLLUP_PARAMS = {"type", "category_id", "category_path", "status", "facet_limit"}
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def facets(request):
+    """
+    GET /api/facets/ — counts by state, city, practice area, specialty,
+    premium flag and rating bucket (whole stars) for the current search,
+    in one call.
+
+    Same filters as directory_search (q, fuzzy, status, category_id,
+    category_path, city, state, is_premium, near/radius_km, type) plus:
+      facet_limit      : max values per state/city/topic facet (default 20)
+
+    Requests filtered only by type, category and status are served from
+    the FacetRollup / TopicRollup tables ("source": "rollup"); any other
+    filter runs one grouped query per vertical ("source": "query"). See
+    businesses/facets.py.
+
+    Returns { source, total, facets: { state: [{value, count}],
+    city: [{value, state, count}], practice_area, specialty, is_premium, rating } }.
+    """
+    params = request.query_params
+    kind = (params.get("type") or "").strip().lower()
+    kinds = [k for k in ("lawyer", "doctor") if kind in ("", k)]
+    if not kinds:
+        return Response({"detail": "type must be 'lawyer' or 'doctor'."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(params.get("facet_limit") or DEFAULT_FACET_LIMIT)
+    except (TypeError, ValueError):
+        return Response({"detail": "facet_limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, MAX_FACET_LIMIT))
+
+    if not {k for k, v in params.items() if v.strip()} - _ROLLUP_PARAMS:
+        scope, scoped = Category.objects.all(), False
+        try:
+            if params.get("category_id", "").strip():
+                scope, scoped = scope.filter(id=int(params["category_id"])), True
+        except (TypeError, ValueError):
+            pass  # ignored, as in _listing_querysets
+        if params.get("category_path", "").strip():
+            scope, scoped = scope.filter(full_slug__startswith=params["category_path"].strip()), True
+        category_ids = list(scope.values_list("id", flat=True)) if scoped else None
+        data = rollup_counts(kinds, category_ids, (params.get("status") or "").strip(), limit)
+        return Response(data)
+
+    _, bqs, dqs = _listing_querysets(params)
+    querysets = {"lawyer": bqs, "doctor": dqs}
+    return Response(facet_counts({k: querysets[k] for k in kinds}, limit))
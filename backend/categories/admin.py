@@ -3,6 +3,6 @@ from .models import Category
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'business_count')
+    list_display = ('name', 'business_count', 'doctor_count')
     search_fields = ('name',)
     list_filter = ('color',)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:03
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_doctor_count(apps, schema_editor):
+    Category = apps.get_model('categories', 'Category')
+    Doctor = apps.get_model('businesses', 'Doctor')
+    counts = (
+        Doctor.objects.filter(status='active', category__isnull=False)
+        .values('category_id').annotate(c=Count('id'))
+    )
+    for row in counts:
+        Category.objects.filter(pk=row['category_id']).update(doctor_count=row['c'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0003_category_updated_at'),
+        ('businesses', '0015_importjob_operation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='doctor_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_doctor_count, migrations.RunPython.noop),
+    ]
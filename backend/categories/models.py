@@ -1,8 +1,12 @@
 from django.db import models, transaction
 from django.db.models import Q, F
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 import re
 
+from .tree import bump_tree_version
+from utils.edge import CATEGORIES_KEY, NOT_FOUND_KEY, SITEMAP_KEY, category_key, purge_keys
+
 
 def make_category_slug(name: str) -> str:
     """
@@ -25,6 +29,7 @@ class Category(models.Model):
     icon = models.CharField(max_length=100, blank=True, null=True)
     color = models.CharField(max_length=50, blank=True, null=True)
     business_count = models.IntegerField(default=0)
+    doctor_count = models.IntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
     # Tree
     parent = models.ForeignKey(
@@ -121,6 +126,23 @@ class Category(models.Model):
         if old_full and old_full != self.full_slug:
             self._update_descendant_paths(old_full_prefix=old_full)
 
+            from businesses.slugs import rebase_category_paths
+            rebase_category_paths(old_full, self.full_slug)
+
+        # Edge cache: pages rendered under this category; new paths and sitemap on a move
+        moved = old_full != self.full_slug
+        purge_keys(category_key(self.pk), CATEGORIES_KEY, *((NOT_FOUND_KEY, SITEMAP_KEY) if moved else ()))
+
+        # Invalidate per-process path tries (categories/tree.py) once committed
+        transaction.on_commit(bump_tree_version)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        purge_keys(category_key(pk), CATEGORIES_KEY, SITEMAP_KEY)
+        transaction.on_commit(bump_tree_version)
+        return result
+
     def _update_descendant_paths(self, old_full_prefix: str):
         """
         When this node's full_slug changes (rename or reparent), cascade the change
@@ -131,11 +153,14 @@ class Category(models.Model):
 
         descendants = Category.objects.filter(full_slug__startswith=old_prefix).only("id", "full_slug")
         to_update = []
+        now = timezone.now()
         for c in descendants:
             remainder = c.full_slug[len(old_prefix):]
             new_full = f"{new_prefix}{remainder}"
             if c.full_slug != new_full:
                 c.full_slug = new_full
+                c.updated_at = now  # bulk_update skips auto_now; ETags version by it
                 to_update.append(c)
         if to_update:
-            Category.objects.bulk_update(to_update, ["full_slug"])
+            Category.objects.bulk_update(to_update, ["full_slug", "updated_at"])
+            purge_keys(*(category_key(c.pk) for c in to_update))
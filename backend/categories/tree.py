@@ -0,0 +1,126 @@
+# categories/tree.py
+"""
+Process-local category path trie used by the by-path endpoints.
+
+The whole tree (id, slug, full_slug) is loaded in one query and kept per
+process. Category.save()/delete() bump a version token in the Django cache;
+a process rebuilds its trie when the token it was built against changes,
+or after MAX_AGE seconds so a process-local cache backend cannot serve a
+stale tree forever.
+"""
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+VERSION_KEY = "categories:tree_version"
+MAX_AGE = 300  # seconds
+
+
+def bump_tree_version() -> None:
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _tree_version() -> str:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.ids: list[int] = []
+
+    def subtree_ids(self) -> set[int]:
+        out, stack = set(), [self]
+        while stack:
+            node = stack.pop()
+            out.update(node.ids)
+            stack.extend(node.children.values())
+        return out
+
+
+class CategoryTrie:
+    """
+    Case-insensitive segment trie over full_slug, plus the lookup maps for
+    the by-path tolerance rules (rows are expected in full_slug order, so
+    "first match" agrees with Category.Meta.ordering).
+    """
+
+    def __init__(self, rows):
+        self.root = _Node()
+        self.exact: dict[str, int] = {}
+        self.iexact: dict[str, int] = {}
+        self.by_slug: dict[str, int] = {}
+        self.paths: dict[int, str] = {}
+        for pk, slug, full_slug in rows:
+            self.exact[full_slug] = pk
+            self.paths[pk] = full_slug
+            self.iexact.setdefault(full_slug.lower(), pk)
+            if slug:
+                self.by_slug.setdefault(slug, pk)
+            node = self.root
+            for seg in full_slug.lower().split("/"):
+                node = node.children.setdefault(seg, _Node())
+            node.ids.append(pk)
+
+    def lookup(self, path: str) -> int | None:
+        """Exact full_slug, then case-insensitive."""
+        pk = self.exact.get(path)
+        return pk if pk is not None else self.iexact.get(path.lower())
+
+    def prefixed(self, path: str) -> set[int]:
+        """Ids whose full_slug case-insensitively starts with `path`."""
+        *head, last = path.lower().split("/")
+        node = self.root
+        for seg in head:
+            node = node.children.get(seg)
+            if node is None:
+                return set()
+        out = set()
+        for seg, child in node.children.items():
+            if seg.startswith(last):
+                out |= child.subtree_ids()
+        return out
+
+    def candidates(self, path: str) -> set[int]:
+        """
+        Every category a listing may sit in for `path` to resolve to it:
+        exact, case-insensitive, ancestor prefix, or last-segment slug.
+        """
+        ids = self.prefixed(path)
+        pk = self.lookup(path)
+        if pk is not None:
+            ids.add(pk)
+        pk = self.by_slug.get(path.split("/")[-1])
+        if pk is not None:
+            ids.add(pk)
+        return ids
+
+
+_lock = threading.Lock()
+_cached: tuple[str, float, CategoryTrie] | None = None
+
+
+def category_tree() -> CategoryTrie:
+    global _cached
+    version = _tree_version()
+    cached = _cached
+    if cached and cached[0] == version and time.monotonic() - cached[1] < MAX_AGE:
+        return cached[2]
+    with _lock:
+        cached = _cached
+        if cached and cached[0] == version and time.monotonic() - cached[1] < MAX_AGE:
+            return cached[2]
+        from .models import Category
+        rows = Category.objects.order_by("full_slug").values_list("id", "slug", "full_slug")
+        trie = CategoryTrie(rows.iterator())
+        _cached = (version, time.monotonic(), trie)
+        return trie
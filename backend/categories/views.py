@@ -1,4 +1,4 @@
-from django.db.models import OuterRef, Subquery, Count, IntegerField, F, Value
+from django.db.models import OuterRef, Subquery, Count, IntegerField, F, Max, Value
 from django.db.models.functions import Coalesce
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
@@ -6,17 +6,22 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from businesses.models import Business, Doctor
+from businesses.utils import CATEGORY_COUNTS
 from .models import Category
+from .tree import category_tree
 from .serializers import CategorySerializer
 from django_filters.rest_framework import DjangoFilterBackend
+from utils.cache import cache_response
+from utils.conditional import ConditionalGetMixin, latest
+from utils.edge import CATEGORIES_KEY, EdgeCacheMixin
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, EdgeCacheMixin, viewsets.ModelViewSet):
     # Keep list queries light; include parent_id for breadcrumb building
     queryset = (
         Category.objects.only(
             "id", "name", "slug", "description", "icon", "color",
-            "business_count", "full_slug", "parent_id"
+            "business_count", "full_slug", "parent_id", "updated_at",
         )
         .order_by("full_slug")
     )
@@ -28,6 +33,26 @@ class CategoryViewSet(viewsets.ModelViewSet):
     # NOTE: 'business_count' here is the DB column; the API returns combined count via serializer.
     ordering_fields = ["business_count", "name", "full_slug"]
     search_fields = ["name", "description", "full_slug"]
+    edge_actions = {"top": (CATEGORIES_KEY,)}  # CDN-cacheable (utils/edge.py)
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if getattr(self, "action", None) == "retrieve":
+            # one query for the counts, and they feed the ETag (object_version)
+            qs = self._with_combined_count(qs)
+        return qs
+
+    def object_version(self, obj):
+        """
+        Detail payloads also carry the combined count and the breadcrumb
+        (ancestor names): version by both, the ancestors being one probe
+        over the full_slug prefixes.
+        """
+        segments = (obj.full_slug or "").split("/")
+        prefixes = ["/".join(segments[:i]) for i in range(1, len(segments) + 1)]
+        chain = Category.objects.filter(full_slug__in=prefixes).aggregate(m=Max("updated_at"))["m"]
+        version, last_modified = super().object_version(obj)
+        return (*version, getattr(obj, "combined_count", None), chain), latest(last_modified, chain)
 
     def _with_combined_count(self, qs):
         """
@@ -54,7 +79,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
             combined_count=F("_biz_active") + F("_doc_active"),
         )
 
+    # combined counts come from the listings: cached until a category or its counts change
+    # (recalc_category_counts bumps CATEGORY_COUNTS), not on every listing edit
+    @cache_response(Category, CATEGORY_COUNTS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @cache_response(Category, CATEGORY_COUNTS)
     def top(self, request):
         # Return the top 6 by combined (Business + Doctor) active listings
         qs = self._with_combined_count(self.filter_queryset(self.get_queryset()))
@@ -68,14 +100,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
         obj = qs.filter(slug=slug).first()
         if not obj:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(self.get_serializer(obj).data)
+        return self.conditional_object(request, obj, lambda: Response(self.get_serializer(obj).data))
 
     @action(detail=False, url_path=r"by-path/(?P<path>.+)", methods=["get"])
     def by_path(self, request, path=None):
         clean = (path or "").strip("/")
-        qs = self._with_combined_count(self.get_queryset())
-        # exact first; then case-insensitive fallback
-        obj = qs.filter(full_slug=clean).first() or qs.filter(full_slug__iexact=clean).first()
+        # exact first; then case-insensitive fallback (resolved in memory)
+        pk = category_tree().lookup(clean)
+        obj = self._with_combined_count(self.get_queryset()).filter(pk=pk).first() if pk else None
         if not obj:
             return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(self.get_serializer(obj).data)
+        return self.conditional_object(request, obj, lambda: Response(self.get_serializer(obj).data))
@@ -19,6 +19,17 @@ module.exports = {
       env: {
         DJANGO_SETTINGS_MODULE: "Rankify.settings"
       }
+    },
+    {
+      // background bulk imports (ImportJob); polls the DB, no broker
+      name: "rankify-import-worker",
+      script: "venv/bin/python",
+      interpreter: "none",
+      args: "manage.py run_import_worker",
+      cwd: "/var/www/mightyrankings/backend",
+      env: {
+        DJANGO_SETTINGS_MODULE: "Rankify.settings"
+      }
     }
   ]
 }
@@ -58,6 +58,14 @@ class Review(models.Model):
     def __str__(self):
         return f"{self.title} - {self.rating}★"
 
+    def save(self, *args, **kwargs):
+        # updated_at versions the review's ETag: bump it on every save, partial ones included
+        self.updated_at = now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        super().save(*args, **kwargs)
+
     # Convenience for responses
     @property
     def target_kind(self):
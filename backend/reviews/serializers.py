@@ -68,8 +68,8 @@ class ReviewSerializer(serializers.ModelSerializer):
     flag_count = serializers.SerializerMethodField()
 
     # READ: expose polymorphic target for UI if needed
-    target_kind = serializers.CharField(source='target_kind', read_only=True)
-    target_id = serializers.IntegerField(source='target_id', read_only=True)
+    target_kind = serializers.CharField(read_only=True)
+    target_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Review
@@ -1,9 +1,15 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.db.models import Avg, Count
+from django.utils import timezone
 
 from .models import Review
 from businesses.models import Business
+from businesses.facets import rating_bucket, refresh_facets
+from businesses.featured import bump_featured
+from businesses.ranking import refresh_rank_scores
+from utils.cache import bump_versions
+from utils.edge import featured_key, listing_key, purge_keys
 
 
 def _update_business_review_stats(business_id: int | None):
@@ -16,11 +22,23 @@ def _update_business_review_stats(business_id: int | None):
     )
     avg = agg['avg'] or 0.0
     cnt = agg['cnt'] or 0
+    old = Business.objects.filter(id=business_id).values("average_rating", "category_id").first()
     # Store a simple float; the UI can format (e.g., to 1 decimal).
     Business.objects.filter(id=business_id).update(
         average_rating=float(avg),
         total_reviews=int(cnt),
+        updated_at=timezone.now(),  # listing ETags version by it
     )
+    refresh_rank_scores(Business.objects.filter(id=business_id))
+    bump_versions(Business)
+    # facet rollups bucket by whole stars
+    if old and rating_bucket(old["average_rating"]) != rating_bucket(avg):
+        refresh_facets("lawyer", [old["category_id"]])
+    biz = Business.objects.filter(id=business_id, status="active").values("category_id").first()
+    if biz:
+        bump_featured("lawyer", [biz["category_id"]])
+    # rating / review count are on the listing page (and featured order)
+    purge_keys(listing_key("lawyer", business_id), featured_key("lawyer") if biz else None)
 
 
 @receiver(pre_save, sender=Review)
@@ -13,6 +13,9 @@ from businesses.models import Business, Doctor
 from .models import Review, ReviewFlag
 from .serializers import ReviewSerializer, ReviewFlagSerializer
 from utils.email_utils import email_review_approved, email_owner_new_review
+from utils.cache import bump_versions, cache_response
+from utils.conditional import ConditionalGetMixin
+from utils.pagination import EstimatedCountPagination
 
 
 def _is_admin(user) -> bool:
@@ -52,7 +55,7 @@ class SafeOrderingFilter(filters.OrderingFilter):
             return queryset  # fall back to default ordering
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = (
         Review.objects
         .select_related('user', 'business')
@@ -62,6 +65,13 @@ class ReviewViewSet(viewsets.ModelViewSet):
     )
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthorOrAdminOrReadOnly]
+    pagination_class = EstimatedCountPagination
+    # list/retrieve answer If-None-Match; business_name comes from the business row.
+    # The list is versioned by cache tokens: a count/max probe would bring back
+    # the unbounded COUNT(*) EstimatedCountPagination avoids.
+    conditional_list = True
+    conditional_related = ('business',)
+    conditional_models = (Review, Business)
     filter_backends = [DjangoFilterBackend, SafeOrderingFilter]
 
     # keep default field filters for status/user;
@@ -105,6 +115,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['get'])
+    @cache_response(Review, Business)
     def recent(self, request):
         qs = self.filter_queryset(self.get_queryset()).filter(status='active').order_by('-created_at')[:6]
         return Response(self.get_serializer(qs, many=True).data)
@@ -204,6 +215,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
             helpful_count=F('helpful_count') + 1,
             updated_at=timezone.now(),
         )
+        bump_versions(Review)
         review.refresh_from_db()
         return Response(self.get_serializer(review).data, status=status.HTTP_200_OK)
 
@@ -222,9 +234,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
             note=note,
         )
 
-        if review.status != 'flagged':
-            review.status = 'flagged'
-            review.save(update_fields=['status'])
+        # saved even when already flagged: bumps updated_at, since flag_count changed
+        review.status = 'flagged'
+        review.save(update_fields=['status'])
 
         # return the updated review payload (includes flag_count)
         return Response(self.get_serializer(review).data, status=status.HTTP_200_OK)
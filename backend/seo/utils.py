@@ -1,10 +1,14 @@
 # seo/utils.py
+from decimal import Decimal
+
 from django.db import IntegrityError, transaction
 from django.utils.timezone import now
 
+from utils.cache import bump_versions
 from .models import PageMeta
 
 BUSINESS_PAGE_NAME = "business"
+DOCTOR_PAGE_NAME = "doctor"
 
 def _seo_title_for_business(biz):
     """
@@ -228,3 +232,116 @@ def ensure_business_meta(biz, refresh=False):
                     "priority","changefreq","is_active","updated_at"
                 ])
         return pm
+
+
+def _location(obj):
+    city = (obj.city or "").strip()
+    state = (obj.state or "").strip()
+    return ", ".join(p for p in (city, state) if p)
+
+def _seo_title_for_doctor(doc):
+    """
+    "<Name>, <specialty> in <City, State>" (mirrors the lawyer title;
+    "a doctor" when the specialty is blank).
+    """
+    name = (doc.provider_name or "").strip() or "Doctor"
+    what = (doc.specialty or "").strip() or "a doctor"
+    loc = _location(doc)
+    return f"{name}, {what} in {loc}" if loc else f"{name}, {what}"
+
+def _seo_keywords_for_doctor(doc):
+    name = (doc.provider_name or "").strip() or "doctor"
+    what = ((doc.specialty or "").strip() or "doctor").lower()
+    loc = _location(doc).lower()
+    if loc:
+        return f"{name}, {what} in {loc}, doctor reviews in {loc}"
+    return f"{name}, {what}, doctor reviews"
+
+def _seo_description_for_doctor(doc):
+    name = (doc.provider_name or "").strip() or "This doctor"
+    what = (doc.specialty or "").strip() or "a doctor"
+    loc = _location(doc)
+    if loc:
+        return f"Learn about {name}, {what} in {loc}. Reviews, details and contact info."
+    return f"Learn about {name}. Reviews, details and contact info."
+
+
+# ---- Bulk upkeep (bulk moves / imports) ----
+
+# meta_type -> (page_name, title, description, keywords)
+_LISTING_META = {
+    "business": (BUSINESS_PAGE_NAME, _seo_title_for_business,
+                 _seo_description_for_business, _seo_keywords_for_business),
+    "doctor": (DOCTOR_PAGE_NAME, _seo_title_for_doctor,
+               _seo_description_for_doctor, _seo_keywords_for_doctor),
+}
+_CONTENT_FIELDS = [
+    "title", "description", "keywords", "og_title", "og_description",
+    "robots", "priority", "changefreq",
+]
+
+def _listing_defaults(meta_type, obj):
+    _, title, description, keywords = _LISTING_META[meta_type]
+    t, d = title(obj), description(obj)
+    return {
+        "title": t,
+        "description": d,
+        "keywords": keywords(obj),
+        "og_title": t,
+        "og_description": d,
+        "robots": "index, follow",
+        "priority": Decimal("0.80"),
+        "changefreq": "weekly",
+    }
+
+def bulk_ensure_meta(meta_type, listings, refresh=False):
+    """
+    ensure_business_meta for many listings at once: one SELECT for the
+    existing rows, then bulk_create for the missing ones and bulk_update
+    for the auto_managed ones that changed. meta_type is "business" or
+    "doctor"; refresh has the same meaning as in ensure_business_meta.
+    Returns the number of rows written.
+    """
+    listings = [obj for obj in listings if getattr(obj, "id", None)]
+    if not listings:
+        return 0
+    page_name = _LISTING_META[meta_type][0]
+    fk = f"{meta_type}_id"
+    existing = {
+        getattr(pm, fk): pm
+        for pm in PageMeta.objects.filter(
+            page_name=page_name, meta_type=meta_type,
+            **{f"{fk}__in": [obj.id for obj in listings]},
+        )
+    }
+
+    ts = now()
+    to_create, to_update = [], []
+    for obj in listings:
+        defaults = _listing_defaults(meta_type, obj)
+        pm = existing.get(obj.id)
+        if pm is None:
+            to_create.append(PageMeta(
+                page_name=page_name, meta_type=meta_type, **{fk: obj.id}, **defaults,
+                is_active=True, auto_managed=True, created_at=ts, updated_at=ts,
+            ))
+            continue
+        if not pm.auto_managed:
+            continue  # admin has frozen this one
+        changed = False
+        for field, value in defaults.items():
+            current = getattr(pm, field)
+            blank = current is None or not str(current).strip()
+            if (refresh and current != value) or blank:
+                setattr(pm, field, value)
+                changed = True
+        if changed:
+            pm.updated_at = ts
+            to_update.append(pm)
+
+    # ignore_conflicts: a concurrent ensure_business_meta may have created one meanwhile
+    PageMeta.objects.bulk_create(to_create, ignore_conflicts=True, batch_size=1000)
+    PageMeta.objects.bulk_update(to_update, _CONTENT_FIELDS + ["updated_at"], batch_size=1000)
+    if to_create or to_update:
+        bump_versions(PageMeta)
+    return len(to_create) + len(to_update)
@@ -8,12 +8,16 @@ from django.utils.timezone import now
 from django.db.models import Q, Count, Max
 from urllib.parse import quote
 
+from utils.cache import cache_response
+from utils.edge import CATEGORIES_KEY, SITEMAP_KEY, edge_cached, vertical_key
+from utils.pagination import EstimatedCountPagination
+
 from .models import PageMeta
 from .serializers import PageMetaSerializer
 
 # For sitemap
 from categories.models import Category
-from businesses.models import Business, Doctor
+from businesses.models import ListingSlug
 
 import html
 import math
@@ -55,12 +59,18 @@ class PageMetaViewSet(viewsets.ModelViewSet):
     )
     serializer_class = PageMetaSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = EstimatedCountPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
     filterset_class = PageMetaFilter
     ordering_fields = ["updated_at", "priority"]
     search_fields = ["title", "description", "og_title", "og_description"]
 
+    @cache_response(PageMeta)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["GET"], url_path="by-ids")
+    @cache_response(PageMeta)
     def by_ids(self, request):
         """
         Bulk fetch:
@@ -125,6 +135,15 @@ def _today():
     return now().date().isoformat()
 
 
+def _sitemap_slugs(fk: str):
+    """
+    Current ListingSlug rows of active listings (fk: 'business' | 'doctor'),
+    so every sitemap URL is one the by-slug/by-path endpoints resolve.
+    """
+    return ListingSlug.objects.filter(is_current=True, **{f"{fk}__status": "active"})
+
+
+@edge_cached(SITEMAP_KEY)
 def sitemap_index(request):
     """
     Sitemap index at /sitemap.xml
@@ -138,8 +157,8 @@ def sitemap_index(request):
     lastmod = _today()
 
     # Policy: index "active" entities. Broaden if needed.
-    biz_count = Business.objects.filter(status="active").count()
-    doc_count = Doctor.objects.filter(status="active").count()
+    biz_count = _sitemap_slugs("business").count()
+    doc_count = _sitemap_slugs("doctor").count()
 
     biz_chunks = math.ceil(biz_count / SITEMAP_MAX_URLS) if biz_count else 0
     doc_chunks = math.ceil(doc_count / SITEMAP_MAX_URLS) if doc_count else 0
@@ -177,6 +196,7 @@ def sitemap_index(request):
     return HttpResponse("\n".join(lines), content_type="application/xml")
 
 
+@edge_cached(SITEMAP_KEY)
 def sitemap_static(request):
     base = request.build_absolute_uri("/").rstrip("/")
     today = _today()
@@ -208,6 +228,7 @@ def sitemap_static(request):
     return HttpResponse("\n".join(lines), content_type="application/xml")
 
 
+@edge_cached(SITEMAP_KEY, CATEGORIES_KEY)
 def sitemap_categories(request):
     """
     /sitemaps/categories.xml
@@ -262,6 +283,7 @@ def sitemap_categories(request):
     return HttpResponse("\n".join(lines), content_type="application/xml")
 
 
+@edge_cached(SITEMAP_KEY, vertical_key("lawyer"))
 def sitemap_businesses_chunk(request, chunk: int):
     """
     /sitemaps/businesses-<chunk>.xml (1-based)
@@ -277,15 +299,15 @@ def sitemap_businesses_chunk(request, chunk: int):
     start = (chunk - 1) * SITEMAP_MAX_URLS
     end = start + SITEMAP_MAX_URLS
 
-    base_qs = Business.objects.filter(status="active")
+    base_qs = _sitemap_slugs("business")
     total = base_qs.count()
     if start >= total and total != 0:
         raise Http404("Chunk out of range")
 
     qs = (
         base_qs
-        .order_by("id")
-        .values("slug", "updated_at", "created_at", "category__full_slug")[start:end]
+        .order_by("business_id")
+        .values("slug", "category_full_slug", "business__updated_at", "business__created_at")[start:end]
     )
 
     lines = []
@@ -294,7 +316,7 @@ def sitemap_businesses_chunk(request, chunk: int):
 
     for b in qs:
         slug = (b.get("slug") or "").strip()
-        cat_full = (b.get("category__full_slug") or "").strip()
+        cat_full = (b.get("category_full_slug") or "").strip()
 
         if cat_full and slug:
             loc = f"{base}/business/{_encode_segments(cat_full)}/{quote(slug)}"
@@ -303,7 +325,7 @@ def sitemap_businesses_chunk(request, chunk: int):
         else:
             continue
 
-        last = b.get("updated_at") or b.get("created_at") or now()
+        last = b.get("business__updated_at") or b.get("business__created_at") or now()
         lastmod = last.date().isoformat()
 
         lines.append("  <url>")
@@ -317,6 +339,7 @@ def sitemap_businesses_chunk(request, chunk: int):
     return HttpResponse("\n".join(lines), content_type="application/xml")
 
 
+@edge_cached(SITEMAP_KEY, vertical_key("doctor"))
 def sitemap_doctors_chunk(request, chunk: int):
     """
     /sitemaps/doctors-<chunk>.xml (1-based)
@@ -332,15 +355,15 @@ def sitemap_doctors_chunk(request, chunk: int):
     start = (chunk - 1) * SITEMAP_MAX_URLS
     end = start + SITEMAP_MAX_URLS
 
-    base_qs = Doctor.objects.filter(status="active")
+    base_qs = _sitemap_slugs("doctor")
     total = base_qs.count()
     if start >= total and total != 0:
         raise Http404("Chunk out of range")
 
     qs = (
         base_qs
-        .order_by("id")
-        .values("slug", "updated_at", "created_at", "category__full_slug")[start:end]
+        .order_by("doctor_id")
+        .values("slug", "category_full_slug", "doctor__updated_at", "doctor__created_at")[start:end]
     )
 
     lines = []
@@ -349,7 +372,7 @@ def sitemap_doctors_chunk(request, chunk: int):
 
     for d in qs:
         slug = (d.get("slug") or "").strip()
-        cat_full = (d.get("category__full_slug") or "").strip()
+        cat_full = (d.get("category_full_slug") or "").strip()
 
         if cat_full and slug:
             loc = f"{base}/doctor/{_encode_segments(cat_full)}/{quote(slug)}"
@@ -358,7 +381,7 @@ def sitemap_doctors_chunk(request, chunk: int):
         else:
             continue
 
-        last = d.get("updated_at") or d.get("created_at") or now()
+        last = d.get("doctor__updated_at") or d.get("doctor__created_at") or now()
         lastmod = last.date().isoformat()
 
         lines.append("  <url>")
@@ -0,0 +1,281 @@
+# utils/cache.py
+"""
+Caching layer shared by every process.
+
+  - TieredCache, the "default" backend: a per-process LRU in front of the
+    cache alias named by LOCATION ("shared": a file cache by default, or
+    whatever CACHE_URL points at). Reads fill the local tier from the
+    shared one; writes and deletes go through to the shared tier. A local
+    copy is served for at most LOCAL_TIMEOUT seconds, which bounds how
+    long another process's write can go unseen.
+
+  - Version tokens per model (Business, Doctor, Category, Review,
+    PageMeta): post_save / post_delete replace the model's token once the
+    transaction commits (track_versions), and the bulk write paths that
+    bypass signals call bump_versions() themselves. Tokens are read from
+    the shared tier only, so every process sees a bump at once.
+
+  - @cache_response(*models): memoizes a viewset action's response data,
+    keyed by the action, scheme, host, path, normalized query params and
+    the current tokens of `models`. A bump makes every key built on the old
+    token unreachable; the entries themselves age out with their timeout.
+"""
+import hashlib
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+DEFAULT_LOCAL_TIMEOUT = 5  # seconds
+RESPONSE_TTL = 300  # seconds
+
+VERSIONED_MODELS = (
+    "businesses.Business", "businesses.Doctor", "categories.Category",
+    "reviews.Review", "seo.PageMeta",
+)
+
+_MISSING = object()
+
+# Local tiers live per process, not per thread (django.core.cache.caches is thread-local)
+_tiers: dict[str, tuple[OrderedDict, threading.Lock]] = {}
+_tiers_lock = threading.Lock()
+
+
+def _tier(name: str) -> tuple[OrderedDict, threading.Lock]:
+    with _tiers_lock:
+        return _tiers.setdefault(name, (OrderedDict(), threading.Lock()))
+
+
+class TieredCache(BaseCache):
+    """
+    CACHES entry:
+
+        "default": {
+            "BACKEND": "utils.cache.TieredCache",
+            "LOCATION": "shared",        # alias of the shared backend
+            "OPTIONS": {"MAX_ENTRIES": 2000, "LOCAL_TIMEOUT": 5},
+        }
+
+    MAX_ENTRIES bounds the local LRU. incr() is delegated to the shared
+    backend (atomic where that backend's is).
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.shared_alias = location or DEFAULT_CACHE_ALIAS
+        self.local_timeout = params.get("OPTIONS", {}).get("LOCAL_TIMEOUT", DEFAULT_LOCAL_TIMEOUT)
+        self._local, self._lock = _tier(f"{self.shared_alias}:{self.key_prefix}")
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    # -------------------- Local tier --------------------
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            expires, pickled = entry
+            if expires <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def _local_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        ttl = self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+        if ttl <= 0:
+            self._local_delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    # -------------------- Cache API --------------------
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._local_get(local_key)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self._local_set(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found, missing = {}, []
+        for key in keys:
+            value = self._local_get(self.make_and_validate_key(key, version=version))
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            fetched = self.shared.get_many(missing, version=version)
+            for key, value in fetched.items():
+                self._local_set(self.make_key(key, version=version), value)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        return self._local_get(local_key) is not _MISSING or self.shared.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.shared.set(key, value, timeout, version=version)
+        self._local_set(local_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version=version)
+            if key in failed:
+                self._local_delete(local_key)
+            else:
+                self._local_set(local_key, value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local_set(local_key, value, timeout)
+        else:
+            self._local_delete(local_key)  # someone else's value: read it from the shared tier
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self._local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._local_delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+# -------------------- Version tokens --------------------
+def _label(model) -> str:
+    return model.lower() if isinstance(model, str) else model._meta.label_lower
+
+
+def _version_key(model) -> str:
+    return f"ver:{_label(model)}"
+
+
+def _version_store() -> BaseCache:
+    return getattr(cache, "shared", cache)
+
+
+def model_versions(*models) -> tuple[str, ...]:
+    """Current version token of each model (class or "app_label.Model") or named token."""
+    store = _version_store()
+    keys = [_version_key(m) for m in models]
+    found = store.get_many(keys)
+    for key in keys:
+        if key not in found:
+            store.add(key, uuid.uuid4().hex, None)
+            found[key] = store.get(key, "")
+    return tuple(found[k] for k in keys)
+
+
+def bump_versions(*models) -> None:
+    """Replace the tokens of `models` once the current transaction (if any) commits."""
+    keys = {_version_key(m) for m in models}
+    if keys:
+        transaction.on_commit(
+            lambda: _version_store().set_many({k: uuid.uuid4().hex for k in keys}, None)
+        )
+
+
+def _bump_sender(sender, **kwargs):
+    bump_versions(sender)
+
+
+def track_versions(models=VERSIONED_MODELS) -> None:
+    """Bump each model's token on post_save / post_delete (called from AppConfig.ready)."""
+    for label in models:
+        for name, signal in (("save", post_save), ("delete", post_delete)):
+            signal.connect(
+                _bump_sender, sender=label, weak=False,
+                dispatch_uid=f"cache-version:{name}:{_label(label)}",
+            )
+
+
+# -------------------- Response cache --------------------
+def normalized_params(params) -> tuple:
+    """Query params as sorted (name, value) pairs, blank values dropped."""
+    return tuple(sorted(
+        (name, value.strip())
+        for name in params for value in params.getlist(name)
+        if value.strip()
+    ))
+
+
+def response_key(request, view_name: str, kwargs, versions) -> str:
+    raw = repr((
+        view_name, request.scheme, request.get_host(), request.path, sorted(kwargs.items()),
+        normalized_params(request.query_params), versions,
+    ))
+    return f"resp:{view_name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def cache_response(*models, timeout: int = RESPONSE_TTL):
+    """
+    Viewset action decorator: GET responses (200 only) are served from the
+    cache while the tokens of `models` (everything the payload is built
+    from) are unchanged. Response data is cached, not rendered bytes, so
+    content negotiation still happens per request.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return method(self, request, *args, **kwargs)
+            key = response_key(
+                request, f"{type(self).__name__}.{method.__name__}", kwargs, model_versions(*models),
+            )
+            data = cache.get(key, _MISSING)
+            if data is not _MISSING:
+                return Response(data)
+            response = method(self, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200 and not response.exception:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
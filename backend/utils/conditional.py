@@ -0,0 +1,132 @@
+# utils/conditional.py
+"""
+Conditional GETs (ETag / Last-Modified) for the read endpoints.
+
+A view derives a version from a cheap probe (the row's id and updated_at,
+or max(updated_at) + count over a filtered queryset) and calls
+conditional_response() with a callable that builds the real response:
+
+  - If-None-Match matches (or, without one, If-Modified-Since is not older
+    than the version)  -> 304 with the validators, nothing serialized,
+  - otherwise          -> the built response, stamped with ETag and
+                          Last-Modified.
+
+ETags are weak (the same data may go out as different bytes, e.g.
+compressed) and also cover the request path + query string (?fields=,
+filters, pagination) and the negotiated media type, which all change the
+representation.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from utils.cache import model_versions
+
+SAFE = ("GET", "HEAD")
+
+
+def etag_for(request, *parts) -> str:
+    variant = (request.get_full_path(), getattr(request, "accepted_media_type", ""))
+    digest = hashlib.blake2b(repr((variant, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def latest(*stamps):
+    """Newest of the non-null datetimes in `stamps`, or None."""
+    stamps = [s for s in stamps if s is not None]
+    return max(stamps) if stamps else None
+
+
+def not_modified(request, etag: str, last_modified=None):
+    """A 304 response when the request's validators match, else None."""
+    if request.method not in SAFE:
+        return None
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        with_validators(response, etag, last_modified)
+    return response
+
+
+def with_validators(response, etag: str, last_modified=None):
+    if response.status_code in (200, 304):
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(timegm(last_modified.utctimetuple()))
+    return response
+
+
+def conditional_response(request, version: tuple, build, last_modified=None):
+    """304 for a matching conditional request, else build() with validators."""
+    if request.method not in SAFE:
+        return build()
+    etag = etag_for(request, *version)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    return with_validators(build(), etag, last_modified)
+
+
+class ConditionalGetMixin:
+    """
+    ModelViewSet mixin: retrieve() (and list(), when conditional_list is
+    set) answer conditional GETs.
+
+    retrieve versions the loaded object by id + updated_at, plus the
+    updated_at of each `conditional_related` FK it renders (category name,
+    business name, ...) when that row was loaded with it. list probes the
+    filtered queryset with one aggregate: max(updated_at) and count(*)
+    (the count catches deletes), plus max(<related>__updated_at). With
+    `conditional_models` set, list is versioned by those models' cache
+    tokens (utils/cache.py) instead: no query, but any write to them
+    changes every list ETag, and there is no Last-Modified.
+    """
+    conditional_related: tuple[str, ...] = ()
+    conditional_list = False
+    conditional_models: tuple = ()
+
+    def object_version(self, obj) -> tuple[tuple, object]:
+        """((version parts), last_modified) of a loaded object."""
+        stamps = [getattr(obj, "updated_at", None)]
+        for name in self.conditional_related:
+            # not select_related (e.g. a ?fields= without it): not rendered either
+            if obj._meta.get_field(name).is_cached(obj):
+                stamps.append(getattr(getattr(obj, name), "updated_at", None))
+        return (obj._meta.label_lower, obj.pk, *stamps), latest(*stamps)
+
+    def list_version(self, queryset) -> tuple[tuple, object]:
+        if self.conditional_models:
+            return (queryset.model._meta.label_lower, *model_versions(*self.conditional_models)), None
+        aggregates = {"n": Count("pk"), "m": Max("updated_at")}
+        for name in self.conditional_related:
+            aggregates[name] = Max(f"{name}__updated_at")
+        probe = queryset.order_by().aggregate(**aggregates)
+        stamps = [probe["m"], *(probe[name] for name in self.conditional_related)]
+        return (queryset.model._meta.label_lower, probe["n"], *stamps), latest(*stamps)
+
+    def conditional_object(self, request, obj, build):
+        """conditional_response() versioned by a loaded object (custom detail actions)."""
+        version, last_modified = self.object_version(obj)
+        return conditional_response(request, version, build, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_object(request, instance, lambda: Response(self.get_serializer(instance).data))
+
+    def list(self, request, *args, **kwargs):
+        if not self.conditional_list:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        version, last_modified = self.list_version(queryset)
+
+        def build():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        return conditional_response(request, version, build, last_modified)
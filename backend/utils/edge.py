@@ -0,0 +1,191 @@
+# utils/edge.py
+"""
+Edge (CDN) caching for the public read endpoints.
+
+Cacheable responses get a Surrogate-Key header naming what they were
+built from:
+
+    listing:<kind>:<id>   one listing (by_slug / by_path pages and their 301s)
+    category:<id>         listing pages rendered under that category
+    vertical:<kind>       everything of a vertical (lawyer / doctor)
+    featured:<kind>       the featured lists
+    categories            categories/top (combined counts)
+    sitemap               sitemap index and chunks
+    not-found             cached 404s of the slug / path lookups
+
+and a Cache-Control that lets the edge keep them EDGE_S_MAXAGE seconds
+(browsers EDGE_MAX_AGE) and serve a stale copy while it revalidates or
+while the origin is failing, so crawler bursts are absorbed at the edge.
+Writes do not wait for expiry: purge_keys() sends the affected keys to
+the EDGE_PURGE_BACKEND once the transaction commits. The default backend
+appends them to a log file, so the whole flow runs offline.
+
+Requests with credentials (Authorization header or session cookie) get
+"private, no-cache" instead: the edge never stores a per-user response.
+"""
+import json
+import logging
+from functools import lru_cache, wraps
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.module_loading import import_string
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 60  # seconds, browsers
+DEFAULT_S_MAXAGE = 3600  # seconds, edge; bounds staleness should a purge be lost
+STALE_WHILE_REVALIDATE = 60
+STALE_IF_ERROR = 86400
+NOT_FOUND_S_MAXAGE = 300
+
+CACHEABLE_STATUSES = {200, 203, 301, 304, 404}
+
+CATEGORIES_KEY = "categories"
+SITEMAP_KEY = "sitemap"
+NOT_FOUND_KEY = "not-found"
+
+
+def listing_key(kind: str, listing_id) -> str:
+    return f"listing:{kind}:{listing_id}"
+
+
+def category_key(category_id) -> str:
+    return f"category:{category_id}"
+
+
+def vertical_key(kind: str) -> str:
+    return f"vertical:{kind}"
+
+
+def featured_key(kind: str) -> str:
+    return f"featured:{kind}"
+
+
+def listing_keys(kind: str, listing_id, category_id=None) -> tuple[str, ...]:
+    """Keys of a listing page: the listing, its category (if known) and its vertical."""
+    keys = [listing_key(kind, listing_id), vertical_key(kind)]
+    if category_id:
+        keys.append(category_key(category_id))
+    return tuple(keys)
+
+
+# -------------------- Response headers --------------------
+def _has_credentials(request) -> bool:
+    return "HTTP_AUTHORIZATION" in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def edge_headers(request, response, keys=(), s_maxage: int | None = None):
+    """Stamp Cache-Control / Surrogate-Key on a GET response the edge may store."""
+    if request.method not in ("GET", "HEAD") or response.status_code not in CACHEABLE_STATUSES:
+        return response
+    if _has_credentials(request):
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    if response.status_code == 404:
+        keys, s_maxage = (NOT_FOUND_KEY,), NOT_FOUND_S_MAXAGE
+    if s_maxage is None:
+        s_maxage = getattr(settings, "EDGE_S_MAXAGE", DEFAULT_S_MAXAGE)
+    max_age = min(getattr(settings, "EDGE_MAX_AGE", DEFAULT_MAX_AGE), s_maxage)
+    response.headers["Cache-Control"] = (
+        f"public, max-age={max_age}, s-maxage={s_maxage}, "
+        f"stale-while-revalidate={STALE_WHILE_REVALIDATE}, stale-if-error={STALE_IF_ERROR}"
+    )
+    if keys:
+        response.headers["Surrogate-Key"] = " ".join(dict.fromkeys(keys))
+    # JSON and the browsable API share URLs
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+class EdgeCacheMixin:
+    """
+    ViewSet mixin: responses of the actions in `edge_actions` ({action:
+    static keys}) get edge headers. An action adds keys known only once
+    it has resolved its object by setting self.edge_keys.
+    """
+    edge_actions: dict[str, tuple[str, ...]] = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        action = getattr(self, "action", None)
+        if action in self.edge_actions:
+            keys = (*self.edge_actions[action], *getattr(self, "edge_keys", ()))
+            edge_headers(request, response, keys)
+        return response
+
+
+def edge_cached(*keys, s_maxage: int | None = None):
+    """edge_headers() for a plain Django view (the sitemaps)."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return edge_headers(request, view(request, *args, **kwargs), keys, s_maxage)
+        return wrapper
+    return decorator
+
+
+# -------------------- Purging --------------------
+class PurgeBackend:
+    def purge(self, keys: list[str]) -> None:
+        raise NotImplementedError
+
+
+class LogFilePurgeBackend(PurgeBackend):
+    """Offline stand-in: appends one JSON line per purge to EDGE_PURGE_LOG."""
+
+    def __init__(self):
+        self.path = Path(settings.EDGE_PURGE_LOG)
+
+    def purge(self, keys):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"at": timezone.now().isoformat(), "keys": keys})
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+class HTTPPurgeBackend(PurgeBackend):
+    """
+    Batch purge by surrogate key (Fastly's API shape): POST EDGE_PURGE_URL
+    with up to MAX_KEYS space-separated keys in a Surrogate-Key header and
+    EDGE_PURGE_TOKEN in Fastly-Key.
+    """
+    MAX_KEYS = 256
+    TIMEOUT = 5  # seconds
+
+    def __init__(self):
+        self.url = settings.EDGE_PURGE_URL
+        self.token = settings.EDGE_PURGE_TOKEN
+
+    def purge(self, keys):
+        for i in range(0, len(keys), self.MAX_KEYS):
+            response = requests.post(
+                self.url,
+                headers={"Surrogate-Key": " ".join(keys[i:i + self.MAX_KEYS]), "Fastly-Key": self.token},
+                timeout=self.TIMEOUT,
+            )
+            response.raise_for_status()
+
+
+@lru_cache(maxsize=None)
+def purge_backend() -> PurgeBackend:
+    return import_string(settings.EDGE_PURGE_BACKEND)()
+
+
+def _dispatch(keys: list[str]) -> None:
+    try:
+        purge_backend().purge(keys)
+    except Exception:
+        # never fail a write over the CDN; EDGE_S_MAXAGE bounds the staleness
+        log.exception("edge purge failed: %s", " ".join(keys))
+
+
+def purge_keys(*keys) -> None:
+    """Purge these surrogate keys at the edge once the current transaction (if any) commits."""
+    keys = sorted({k for k in keys if k})
+    if keys:
+        transaction.on_commit(lambda: _dispatch(keys))
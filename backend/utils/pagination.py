@@ -0,0 +1,145 @@
+# utils/pagination.py
+"""
+Limit/offset pagination that avoids an exact COUNT(*) over large results.
+
+  - last page reached (fewer than limit+1 rows back): count is known, no query
+  - small result: bounded COUNT over at most EXACT_COUNT_LIMIT + 1 rows
+  - large result on PostgreSQL: planner row estimate from EXPLAIN
+  - large result elsewhere: exact COUNT cached for COUNT_CACHE_TTL seconds,
+    keyed by the filtered query's SQL (i.e. the normalized filter set)
+
+Responses carry "count_approximate": true whenever the count is an
+estimate or a cached value.
+"""
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+log = logging.getLogger(__name__)
+
+EXACT_COUNT_LIMIT = 1000
+COUNT_CACHE_TTL = 60  # seconds
+
+
+def _count_sql(queryset):
+    """(sql, params) of the filtered query with ordering stripped, or None if empty."""
+    try:
+        return queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return None
+
+
+def planner_estimate(queryset):
+    """PostgreSQL planner row estimate for `queryset`, or None when unavailable."""
+    conn = connections[queryset.db]
+    if conn.vendor != "postgresql":
+        return None
+    compiled = _count_sql(queryset)
+    if compiled is None:
+        return 0
+    sql, params = compiled
+    try:
+        with conn.cursor() as cur:
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0]
+    except DatabaseError:
+        log.warning("count estimate failed", exc_info=True)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset, ttl: int = COUNT_CACHE_TTL) -> tuple[int, bool]:
+    """(count, was_cached) with the exact count memoized for `ttl` seconds."""
+    compiled = _count_sql(queryset)
+    if compiled is None:
+        return 0, False
+    sql, params = compiled
+    digest = hashlib.sha1(repr((queryset.db, sql, params)).encode()).hexdigest()
+    key = f"pagination:count:{digest}"
+    hit = cache.get(key)
+    if hit is not None:
+        return hit, True
+    n = queryset.order_by().count()
+    cache.set(key, n, ttl)
+    return n, False
+
+
+def estimated_count(queryset, offset: int, page_len: int, has_more: bool, *,
+                    exact_limit: int = EXACT_COUNT_LIMIT,
+                    ttl: int = COUNT_CACHE_TTL) -> tuple[int, bool]:
+    """
+    (count, approximate) for a page of `page_len` rows at `offset`, where
+    `has_more` says whether a limit+1 fetch returned the extra row.
+    """
+    seen = offset + page_len
+    if not has_more and (page_len or not offset):
+        return seen, False
+    floor = seen + 1 if has_more else 0
+
+    if seen < exact_limit:
+        n = queryset.order_by()[:exact_limit + 1].count()
+        if n <= exact_limit:
+            return n, False
+        floor = max(floor, n)
+
+    estimate = planner_estimate(queryset)
+    if estimate is not None:
+        return max(estimate, floor), True
+
+    n, was_cached = cached_count(queryset, ttl)
+    return max(n, floor), was_cached
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    exact_count_limit = EXACT_COUNT_LIMIT
+    count_cache_ttl = COUNT_CACHE_TTL
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        # one extra row tells us whether there is a next page without a count
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        self.count, self.count_approximate = self.get_count_info(queryset, len(rows))
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return rows
+
+    def get_count_info(self, queryset, page_len: int) -> tuple[int, bool]:
+        return estimated_count(
+            queryset, self.offset, page_len, self.has_more,
+            exact_limit=self.exact_count_limit, ttl=self.count_cache_ttl,
+        )
+
+    def get_next_link(self):
+        if not self.has_more:
+            return None
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "count_approximate": self.count_approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count_approximate"] = {"type": "boolean"}
+        return schema
@@ -0,0 +1,41 @@
+# utils/renderers.py
+"""
+DRF JSON renderer backed by orjson when it is installed.
+
+Output matches rest_framework.renderers.JSONRenderer with the default
+settings (compact, UTF-8, U+2028/U+2029 escaped): values orjson does not
+encode natively (Decimal, lazy strings, querysets, datetimes, which DRF
+trims to milliseconds) go through DRF's own JSONEncoder. Without orjson,
+or for an indented (browsable / ?indent) render, it is the stock renderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.get_indent(accepted_media_type, renderer_context)
+            or self.ensure_ascii
+            or not self.compact
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=_OPTIONS)
+        except TypeError:  # e.g. integers beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        # same escaping as JSONRenderer: valid JSON, invalid JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -1,5 +1,6 @@
 import axios from './axiosClient';
 import { unwrap, getCount } from './_helpers';
+import { waitForImportJob } from './importJobs';
 
 /* ----------------------------- helpers ----------------------------- */
 
@@ -157,6 +158,12 @@ export const bulkCreateDoctors = async (
       { items: items.map(toApiPayload) },
       { params: { recalc }, signal }
     );
+    // 202: another import was running, so the batch went to the job queue
+    if (res.status === 202 && res.data?.job) {
+      const job = await waitForImportJob(res.data.job.id, { signal });
+      if (job.status !== 'done') throw new Error(job.message || `Import job ${job.status}`);
+      return { created: job.created, mode: 'queued', job };
+    }
     const created =
       typeof res.data?.created === 'number' ? res.data.created : items.length;
     return { created, mode: 'bulk' };
@@ -262,7 +269,17 @@ export const setDoctorOwner = async (id, user_id /* or null */) => {
 
 /* ----------------------------- bulk set category (admin) ----------------------------- */
 
-export const bulkSetDoctorCategory = async ({ ids = [], to_category_id }) => {
-  const res = await axios.post('doctors/bulk_set_category/', { ids, to_category_id });
+export const bulkSetDoctorCategory = async ({ ids = [], to_category_id, refresh_seo, signal, onProgress }) => {
+  const res = await axios.post(
+    'doctors/bulk_set_category/',
+    { ids, to_category_id, ...(refresh_seo ? { refresh_seo } : {}) },
+    { signal }
+  );
+  // 202: large (or concurrent) moves run as a background job
+  if (res.status === 202 && res.data?.job) {
+    const job = await waitForImportJob(res.data.job.id, { signal, onProgress });
+    if (job.status !== 'done') throw new Error(job.message || `Move job ${job.status}`);
+    return { moved: job.updated, to_category_id, job };
+  }
   return res.data;
 };
@@ -0,0 +1,54 @@
+import axios from './axiosClient';
+import { unwrap } from './_helpers';
+
+const BASE = 'import-jobs/';
+const FINISHED = new Set(['done', 'failed', 'cancelled']);
+
+/** Queue a background import of a CSV/NDJSON file; kind is "lawyer" or "doctor". */
+export const createImportJob = async (file, kind, { chunkSize } = {}) => {
+  const form = new FormData();
+  form.append('file', file);
+  const res = await axios.post(BASE, form, {
+    params: { kind, ...(chunkSize ? { chunk_size: chunkSize } : {}) },
+  });
+  return res.data;
+};
+
+export const getImportJob = async (id) => {
+  const res = await axios.get(`${BASE}${id}/`);
+  return res.data;
+};
+
+export const listImportJobs = async (params = {}) => {
+  const res = await axios.get(BASE, { params });
+  return unwrap(res);
+};
+
+export const cancelImportJob = async (id) => {
+  const res = await axios.post(`${BASE}${id}/cancel/`);
+  return res.data;
+};
+
+export const retryImportJob = async (id) => {
+  const res = await axios.post(`${BASE}${id}/retry/`);
+  return res.data;
+};
+
+/** Poll a job until it is done/failed/cancelled; onProgress(job) after every poll. */
+export const waitForImportJob = async (
+  id,
+  { interval = 2000, signal, onProgress } = {}
+) => {
+  for (;;) {
+    const job = await getImportJob(id);
+    onProgress?.(job);
+    if (FINISHED.has(job.status)) return job;
+    await new Promise((resolve, reject) => {
+      const t = setTimeout(resolve, interval);
+      signal?.addEventListener('abort', () => {
+        clearTimeout(t);
+        reject(new DOMException('Aborted', 'AbortError'));
+      }, { once: true });
+    });
+  }
+};
@@ -36,7 +36,9 @@ const normalize = (data) => {
  * @param {string} [params.city]
  * @param {string} [params.state]
  * @param {string} [params.category_path]   - hierarchical category prefix (optional)
- * @param {string} [params.ordering]        - e.g. "-is_premium,-average_rating"
+ * @param {string} [params.near]            - "lat,lng" or a ZIP; results carry distance_km
+ * @param {number} [params.radius_km]       - radius for near (default 25; or radius_mi)
+ * @param {string} [params.ordering]        - e.g. "-is_premium,-average_rating" or "distance_km"
  * @param {number} [params.page]            - DRF page number
  * @param {number} [params.page_size]       - DRF page size
  * @param {number} [params.limit]           - DRF limit/offset style
@@ -82,4 +84,17 @@ export const getSuggestions = async (q, extra = {}) => {
     ...extra,
   });
   return items;
-};
\ No newline at end of file
+};
+/**
+ * Facet counts (state, city, practice_area, specialty, is_premium, rating)
+ * for the same filters unifiedSearch takes, in one request.
+ *
+ * @param {Object} params                  - unifiedSearch filters (q, type, category_path, ...)
+ * @param {number} [params.facet_limit]     - max values per state/city/topic facet (default 20)
+ *
+ * @returns {Promise<{source:'rollup'|'query', total:number, facets:Object}>}
+ */
+export const getFacets = async (params = {}) => {
+  const res = await axios.get('facets/', { params });
+  return unwrap(res);
+};